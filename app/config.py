@@ -12,15 +12,75 @@ class Settings(BaseSettings):
     uploads_dir: Path = Path("uploads")
     outputs_dir: Path = Path("outputs")
     models_dir: Path = Path("models")
+    data_dir: Path = Field(default=Path("data"), description="Private state (job DB); never served, unlike outputs_dir")
+    cache_dir: Path = Field(default=Path("data/cache"), description="Result, transcript, TTS and translation caches; never served, unlike outputs_dir")
+
+    # Pipeline execution
+    pipeline_max_workers: int = Field(default=2, description="Max pipeline jobs executed concurrently off the event loop")
+    jobs_db_path: Path = Field(default=Path("data/jobs.sqlite3"), description="SQLite (WAL) file backing the job queue and metrics (keep it outside outputs_dir, which is public)")
+    job_runner: str = Field(default="inline", description="inline|worker (worker: only enqueue; run `python -m app.worker`)")
+    fanout_max_workers: int = Field(default=3, description="Target languages of one job processed in parallel (translate/TTS/mux)")
+    pipeline_streaming: bool = Field(default=False, description="Overlap ASR, translation and TTS per segment instead of running phases back-to-back")
+    pipeline_pcm_pipe: bool = Field(default=True, description="Decode media with ffmpeg to pipe:1 (s16le) and share the PCM array; WAV only written for checkpoints")
+    pipeline_stream_queue_size: int = Field(default=8, description="Bounded queue size between streaming stages")
+    result_cache_enabled: bool = Field(default=True, description="Reuse finished outputs for identical media + job parameters")
+    transcript_cache_enabled: bool = Field(default=True, description="Reuse ASR segments for identical decoded audio + ASR settings")
+    transcript_cache_max_mb: int = Field(default=256, description="Size cap (MB) for data/cache/transcripts (LRU eviction)")
+    result_cache_max_mb: int = Field(default=2048, description="Size cap (MB) for data/cache/results (LRU eviction)")
+    job_checkpoints_enabled: bool = Field(default=True, description="Persist per-phase artifacts in data/jobs/<id> to resume failed/interrupted jobs")
+    job_keep_checkpoints: bool = Field(default=False, description="Keep the checkpoint directory after a job completes")
+    job_events_enabled: bool = Field(default=True, description="Persist per-job log events for the SSE progress stream (/api/job/{id}/events)")
+    job_events_poll_interval: float = Field(default=0.5, description="Seconds between event-table polls of an open SSE stream")
+    job_events_progress_interval: float = Field(default=1.0, description="Min seconds between per-segment progress events of one stage")
+    job_events_retention_s: float = Field(default=86400.0, description="Job events older than this are pruned at startup and by every periodic stale-job check")
+    job_heartbeat_interval: float = Field(default=10.0, description="Seconds between heartbeats of a running job")
+    job_stale_after_s: float = Field(default=120.0, description="Running jobs without heartbeat for this long are requeued")
+    job_max_attempts: int = Field(default=3, description="A stale job that already ran this many times is marked failed instead of requeued (poison jobs)")
+    worker_poll_interval: float = Field(default=1.0, description="Seconds between queue polls when idle (workers, sync waits)")
+    max_pending_jobs: int = Field(default=16, description="Queued + running jobs accepted before new uploads get 429 (0 = unbounded)")
+    admission_retry_after_s: int = Field(default=30, description="Retry-After (seconds) sent with 429 responses")
+    asr_max_concurrency: int = Field(default=2, description="ASR passes running at once per process")
+    tts_max_concurrency: int = Field(default=4, description="TTS syntheses running at once per process")
+    ffmpeg_max_concurrency: int = Field(default=8, description="ffmpeg subprocesses running at once per process")
 
     # ASR
     asr_model: str = Field(default="medium", description="faster-whisper model size or path")
     asr_compute_type: str = Field(default="auto", description="float16/int8/bfloat16/auto")
+    asr_pool_size: int = Field(default=1, description="WhisperModel instances kept loaded for concurrent jobs")
+    asr_cpu_threads: int = Field(default=0, description="Intra-op threads per instance (CTranslate2 cpu_threads, 0 = library default)")
+    asr_num_workers: int = Field(default=1, description="Inter-op workers per instance (concurrent transcriptions one instance serves)")
+    asr_preload: bool = Field(default=True, description="Load the ASR model pool at startup instead of on the first job")
+    asr_tiers: str = Field(default="", description="Model tiers, fastest first: \"fast=tiny,balanced=small,accurate=medium\" (empty = ASR_MODEL only)")
+    asr_tier_long_media_s: float = Field(default=1800.0, description="quality=auto: media longer than this drops one tier (0 disables)")
+    asr_tier_busy_queue: int = Field(default=8, description="quality=auto: drop one tier per this many queued jobs, at most two (0 disables)")
+    asr_vad: str = Field(default="off", description="off|silero|energy: skip non-speech before ASR (silero = faster-whisper built-in VAD; opt-in, changes transcripts)")
+    asr_vad_min_silence_ms: int = Field(default=1000, description="Silence shorter than this stays inside a speech region")
+    asr_vad_energy_threshold_db: float = Field(default=-45.0, description="Frame RMS (dBFS) above which the energy VAD counts speech")
+    asr_langid_enabled: bool = Field(default=True, description="For src_lang=auto, detect the language once from a short speech prefix")
+    asr_langid_seconds: float = Field(default=20.0, description="Seconds of speech (max 30) used for language identification")
+    asr_beam_size: int = Field(default=5, description="Beam size for batched decoding (1 = greedy, fastest)")
+    asr_batching: bool = Field(default=False, description="Decode 30 s windows of all concurrent jobs in shared CTranslate2 batches")
+    asr_batch_size: int = Field(default=8, description="Max windows per batched encoder/decoder call")
+    asr_batch_max_wait_ms: float = Field(default=50.0, description="How long the batcher waits for more windows before running a partial batch")
+    asr_chunk_min_duration_s: float = Field(default=0.0, description="Media longer than this is split at silences and transcribed in parallel (0 = off; opt-in, changes transcripts)")
+    asr_chunk_target_s: float = Field(default=120.0, description="Target chunk length (seconds) for chunked ASR")
+    asr_chunk_processes: int = Field(default=2, description="Worker processes (one model each) for chunked ASR")
+    asr_chunk_cpu_threads: int = Field(default=0, description="CTranslate2 threads per chunk worker (0 = library default)")
 
     # Translation
     translation_backend: str = Field(default="argos", description="argos|marian")
     translation_offline_only: bool = Field(default=False, description="If true, never attempt online Argos index/download")
+    translation_batch_size: int = Field(default=32, description="Sentences per batched CTranslate2 call (also the progress granularity of the translate phase)")
+    translation_memory_enabled: bool = Field(default=True, description="Reuse translations of repeated segments (in-process LRU + data/cache/translation_memory.sqlite3)")
+    translation_memory_lru_entries: int = Field(default=10000, description="Translations kept in the in-process LRU in front of the SQLite store")
     argos_packages_dir: Path = Field(default=Path("models/argos"), description="Directory with pre-downloaded .argosmodel files")
+    marian_models_dir: Path = Field(default=Path("models/marian"), description="CTranslate2-converted OPUS-MT models, one opus-mt-{src}-{dst}/ directory per pair (TRANSLATION_BACKEND=marian)")
+    marian_device: str = Field(default="cpu", description="cpu|cuda|auto for Marian models")
+    marian_compute_type: str = Field(default="int8", description="CTranslate2 compute type for Marian models (int8/int8_float16/float16/float32)")
+    marian_inter_threads: int = Field(default=1, description="Batches one Marian translator runs in parallel")
+    marian_intra_threads: int = Field(default=0, description="Threads per Marian batch (0 = library default)")
+    marian_beam_size: int = Field(default=2, description="Beam size for Marian decoding (1 = greedy, fastest)")
+    marian_source_prefixes: str = Field(default="", description="Target-language token for multilingual models: \"en-pt=>>por<<\"")
 
     # Upload constraints
     max_upload_mb: int = Field(default=200, description="Maximum upload size in MB")
@@ -31,6 +91,11 @@ class Settings(BaseSettings):
 
     # TTS/Voice
     tts_backend: str = Field(default="fallback", description="fallback|openvoice|elevenlabs")
+    tts_batch_size: int = Field(default=64, description="Segments queued per pyttsx3 runAndWait when rendering a whole job (1 = one run per segment)")
+    tts_processes: int = Field(default=0, description="Worker processes (one pyttsx3 engine each) rendering a job's segments concurrently (0 = render in-process)")
+    tts_worker_timeout_s: float = Field(default=60.0, description="A worker batch running longer than this is treated as hung: the pool is recycled and the batch retried")
+    tts_cache_enabled: bool = Field(default=True, description="Reuse synthesized audio of repeated phrases (data/cache/tts, FLAC)")
+    tts_cache_max_mb: int = Field(default=512, description="Size cap (MB) for data/cache/tts (LRU eviction)")
     elevenlabs_api_key: str | None = None
 
     # Voice Cloning (OpenVoice)
@@ -49,3 +114,5 @@ settings = Settings()
 settings.uploads_dir.mkdir(parents=True, exist_ok=True)
 settings.outputs_dir.mkdir(parents=True, exist_ok=True)
 settings.models_dir.mkdir(parents=True, exist_ok=True)
+settings.data_dir.mkdir(parents=True, exist_ok=True)
+settings.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
+import asyncio
 from fastapi.staticfiles import StaticFiles
 import logging
 from .config import settings
@@ -17,7 +18,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to initialize translation service: {e}")
         logger.warning("Translation service will be initialized on first use")
+    if settings.asr_preload and settings.job_runner != "worker":
+        try:
+            from .services.asr import preload_models
+            loaded = await asyncio.to_thread(preload_models)
+            logger.info(f"ASR model pools ready ({loaded} instance(s) loaded)")
+        except Exception as e:
+            logger.warning(f"Failed to preload ASR models: {e}")
+            logger.warning("ASR models will be loaded on first use")
+    try:
+        from .services.pipeline import recover_jobs
+        recover_jobs()
+    except Exception as e:
+        logger.warning(f"Failed to recover pending jobs: {e}")
+    recovery = None
+    if settings.job_runner != "worker":
+        # Workers run their own stale check; inline mode needs one beyond the startup pass
+        from .services.pipeline import recovery_loop
+        recovery = asyncio.create_task(recovery_loop())
     yield
+    if recovery is not None:
+        recovery.cancel()
     # (Optional) teardown logic
 
 
@@ -1,6 +1,23 @@
-from fastapi import APIRouter, File, UploadFile, Response, HTTPException
-from ..services.upload_validation import validate_upload
-from ..services.pipeline import run_pipeline, JOB_STATUS, METRICS
+from pathlib import Path
+import asyncio
+import json
+import time
+
+from fastapi import APIRouter, File, Form, Header, Request, UploadFile, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from ..services.upload_validation import save_upload
+from ..services.admission import admit, queue_stats
+from ..services.pipeline import run_pipeline, submit_job, retry_job
+from ..services.job_store import JOB_STORE
+from ..services.result_cache import RESULT_CACHE
+from ..services.transcript_cache import TRANSCRIPT_CACHE
+from ..services.translation_memory import TRANSLATION_MEMORY
+from ..services.translate import loaded_marian_models
+from ..services.tts import TTS_ENGINE
+from ..services.tts_cache import TTS_CACHE
+from ..services.asr import MODEL_POOL, MODEL_POOLS, tier_model
+from ..services.asr_batching import BATCHED_ASR
+from ..config import settings
 from ..services.status import system_status
 
 
@@ -9,10 +26,8 @@ router = APIRouter()
 
 @router.post("/process")
 async def process_media(file: UploadFile = File(...)):
-    data = await file.read()
-    target_path = validate_upload(file, data)
-    with open(target_path, "wb") as f:
-        f.write(data)
+    admit()
+    target_path = await save_upload(file)
     try:
         job_id, output_file = await run_pipeline(target_path)
     except HTTPException:
@@ -22,22 +37,163 @@ async def process_media(file: UploadFile = File(...)):
         log_event("pipeline_failure", error=str(e))
         raise HTTPException(status_code=500, detail="Processing failed")
     headers = {"X-Job-ID": job_id}
-    return Response(content=output_file.read_bytes(), media_type="application/octet-stream", headers=headers)
+    return FileResponse(output_file, media_type="application/octet-stream", headers=headers)
+
+
+@router.post("/jobs", status_code=202)
+async def submit(
+    file: UploadFile = File(...),
+    src_lang: str = Form("auto"),
+    dst_lang: str = Form("en"),
+    audio_only: bool | None = Form(None),
+    quality: str = Form("auto"),
+):
+    """Asynchronous submission: queue the job and return 202 with its id right away.
+
+    ``dst_lang`` accepts several comma-separated codes ("pt,es,en"): audio extraction and ASR run
+    once and translation/TTS/mux fan out per language (download each with ``?lang=``).
+    ``quality`` pins an ASR tier by name; ``auto`` lets duration and queue depth decide.
+    Returns 429 with ``Retry-After`` when the pending queue is full (``MAX_PENDING_JOBS``).
+    """
+    if quality != "auto" and quality not in MODEL_POOLS:
+        raise HTTPException(status_code=400, detail=f"Unknown quality {quality!r}; use auto or one of {', '.join(MODEL_POOLS)}")
+    admit()
+    target_path = await save_upload(file)
+    # Hashing the upload for the result cache is blocking work
+    job_id = await asyncio.to_thread(submit_job, target_path, src_lang, dst_lang, audio_only=audio_only, quality=quality)
+    body = {
+        "job_id": job_id,
+        # A result-cache hit is completed before the response; anything else was just enqueued
+        "state": "completed" if (JOB_STORE.get(job_id) or {}).get("cache_hit") else "queued",
+        "status_url": f"/api/job/{job_id}",
+        "download_url": f"/api/job/{job_id}/download",
+    }
+    return JSONResponse(status_code=202, content=body, headers={"Location": body["status_url"], "X-Job-ID": job_id})
+
+
+def _hit_rate(metrics: dict, prefix: str) -> dict:
+    hits, misses = metrics.get(f"{prefix}_hit", 0), metrics.get(f"{prefix}_miss", 0)
+    return {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0}
 
 
 @router.get("/status")
-async def status():
+def status():
+    # Plain def: FastAPI runs it in the threadpool, so the SQLite queries never block the event loop
     data = system_status()
     # anexar métricas e últimos jobs (limit 5)
-    jobs = list(JOB_STATUS.items())[-5:]
-    data["metrics"] = METRICS
-    data["recent_jobs"] = [{"job_id": jid, **info} for jid, info in jobs]
+    metrics = JOB_STORE.metrics()
+    data["metrics"] = metrics
+    data["result_cache"] = {**_hit_rate(metrics, "result_cache"), **RESULT_CACHE.stats()}
+    data["transcript_cache"] = {**_hit_rate(metrics, "transcript_cache"), **TRANSCRIPT_CACHE.stats()}
+    data["translation_memory"] = {**_hit_rate(metrics, "translation_memory"), **TRANSLATION_MEMORY.stats()}
+    data["translation"] = {"backend": settings.translation_backend}
+    if settings.translation_backend == "marian":
+        data["translation"]["marian_models"] = loaded_marian_models()
+    data["tts"] = {**TTS_ENGINE.stats(), "processes": settings.tts_processes}
+    data["tts_cache"] = {**_hit_rate(metrics, "tts_cache"), **TTS_CACHE.stats()}
+    data["jobs"] = JOB_STORE.count_by_state()
+    data["queue"] = queue_stats()
+    data["asr"]["pool"] = MODEL_POOL.stats()
+    data["asr"]["tiers"] = {
+        tier: {"model": tier_model(tier), "jobs": metrics.get(f"asr_tier_{tier}", 0), **pool.stats()}
+        for tier, pool in MODEL_POOLS.items()
+    }
+    if settings.asr_batching:
+        data["asr"]["batching"] = BATCHED_ASR.stats()
+    data["recent_jobs"] = JOB_STORE.recent(5)
     return data
 
 
 @router.get("/job/{job_id}")
 async def job_status(job_id: str):
-    info = JOB_STATUS.get(job_id)
+    info = JOB_STORE.get(job_id)
     if not info:
         raise HTTPException(status_code=404, detail="Job not found")
     return {"job_id": job_id, **info}
+
+
+@router.get("/job/{job_id}/download")
+async def job_download(job_id: str, lang: str | None = None):
+    info = JOB_STORE.get(job_id)
+    if not info:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if info.get("state") != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {info.get('state')}, output not available yet")
+    outputs = info.get("outputs") or {}
+    if lang is not None and lang not in outputs:
+        raise HTTPException(status_code=404, detail=f"No output for language {lang}")
+    output = Path(outputs[lang] if lang is not None else info["output"])
+    if not output.exists():
+        raise HTTPException(status_code=410, detail="Output file no longer available")
+    return FileResponse(output, filename=output.name, media_type="application/octet-stream", headers={"X-Job-ID": job_id})
+
+
+def _sse(event: str, data: dict, event_id: int | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _done_payload(job_id: str, info: dict) -> dict:
+    data = {"state": info.get("state"), "error": info.get("error")}
+    if info.get("state") == "completed":
+        data["download_url"] = f"/api/job/{job_id}/download"
+        data["downloads"] = {lang: f"/api/job/{job_id}/download?lang={lang}" for lang in info.get("outputs") or {}}
+    return data
+
+
+@router.get("/job/{job_id}/events")
+async def job_events(job_id: str, request: Request, last_event_id: int = Header(0, alias="Last-Event-ID")):
+    """Server-sent events for one job: ``phase_start``/``phase_end``, throttled ``segment_progress``
+    and the other events ``log_event`` records for it, as they happen.
+
+    The stream ends with a ``done`` event (final state plus download URLs) once the job completes or
+    fails. Reconnecting ``EventSource`` clients resume after ``Last-Event-ID``.
+    """
+    if JOB_STORE.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        seq = last_event_id
+        last_sent = time.monotonic()
+
+        async def pending():
+            nonlocal seq, last_sent
+            out = []
+            for ev in await asyncio.to_thread(JOB_STORE.events_since, job_id, seq):
+                seq = ev["seq"]
+                out.append(_sse(ev["event"], {"ts": ev["ts"], **ev["data"]}, seq))
+            if out:
+                last_sent = time.monotonic()
+            return out
+
+        yield "retry: 2000\n\n"
+        while True:
+            for chunk in await pending():
+                yield chunk
+            info = await asyncio.to_thread(JOB_STORE.get, job_id) or {}
+            if info.get("state") in ("completed", "failed"):
+                while chunks := await pending():  # written between the read above and the state change
+                    for chunk in chunks:
+                        yield chunk
+                yield _sse("done", _done_payload(job_id, info))
+                return
+            if await request.is_disconnected():
+                return
+            if time.monotonic() - last_sent > 15:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(settings.job_events_poll_interval)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Job-ID": job_id}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+
+@router.post("/job/{job_id}/retry", status_code=202)
+async def job_retry(job_id: str):
+    """Requeue a failed job; completed phases are reused from its checkpoint directory."""
+    info = JOB_STORE.get(job_id)
+    if not info:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not retry_job(job_id):
+        raise HTTPException(status_code=409, detail=f"Only failed jobs can be retried (job is {info.get('state')})")
+    return {"job_id": job_id, "state": "queued", "status_url": f"/api/job/{job_id}"}
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Request, UploadFile, Form
+from fastapi import APIRouter, HTTPException, Request, UploadFile, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from pathlib import Path
 from ..config import settings
+import asyncio
 import io
 import numpy as np
 import soundfile as sf
@@ -58,18 +58,17 @@ async def upload(
     settings.uploads_dir.mkdir(parents=True, exist_ok=True)
     settings.outputs_dir.mkdir(parents=True, exist_ok=True)
 
-    # Save upload
-    suffix = Path(file.filename).suffix or ".bin"
-    input_path = settings.uploads_dir / f"input{suffix}"
-    content = await file.read()
-    input_path.write_bytes(content)
-
-    # Kick off processing via API for simplicity (synchronous for now)
-    # In production use background tasks or a worker queue
-    from ..services.pipeline import process_media
+    # The job is queued and the page follows it over SSE (/api/job/{id}/events) instead of blocking
+    from ..services.pipeline import submit_job
+    from ..services.admission import admit
+    from ..services.upload_validation import save_upload
 
     try:
-        result_path = await process_media(input_path, src_lang, dst_lang, audio_only=audio_only)
+        admit()
+        input_path = await save_upload(file)  # copied in chunks, never the whole file in memory
+        job_id = await asyncio.to_thread(submit_job, input_path, src_lang, dst_lang, audio_only=audio_only)
+    except HTTPException as e:  # fila cheia (429), arquivo inválido
+        return templates.TemplateResponse("index.html", base_context(request, error=e.detail), status_code=e.status_code)
     except Exception as e:
         # Mostra erro amigável na UI (ex.: problemas de rede/SSL ao baixar modelo)
         return templates.TemplateResponse("index.html", base_context(request, error=str(e)))
@@ -78,7 +77,7 @@ async def upload(
         "result.html",
         {
             "request": request,
-            "output_file": result_path.name,
+            "job_id": job_id,
         },
     )
 
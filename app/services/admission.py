@@ -0,0 +1,106 @@
+"""Admission control: bounded pending queue plus per-phase concurrency caps.
+
+``admit()`` rejects new jobs with ``429 Retry-After`` once the durable queue
+(queued + running jobs in ``JOB_STORE``) reaches ``MAX_PENDING_JOBS``, so a
+burst of uploads cannot pile up unbounded work. Inside a process,
+``PHASE_LIMITS.slot("asr"|"tts"|"ffmpeg")`` caps how many heavy phases run at
+once regardless of how many jobs (or fan-out languages) are active.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from fastapi import HTTPException
+
+from ..config import settings
+from .job_store import JOB_STORE
+from .logs import log_event
+
+
+class PhaseLimits:
+    def __init__(self, limits: Dict[str, int]):
+        self._sems = {name: threading.BoundedSemaphore(max(1, n)) for name, n in limits.items()}
+        self._limits = {name: max(1, n) for name, n in limits.items()}
+        self._lock = threading.Lock()
+        self._stats = {name: {"active": 0, "waiting": 0, "acquired": 0, "wait_seconds": 0.0} for name in limits}
+
+    @contextmanager
+    def slot(self, phase: str) -> Iterator[None]:
+        sem = self._sems.get(phase)
+        if sem is None:  # unknown phase: not limited
+            yield
+            return
+        stats = self._stats[phase]
+        with self._lock:
+            stats["waiting"] += 1
+        t0 = time.perf_counter()
+        sem.acquire()
+        waited = time.perf_counter() - t0
+        with self._lock:
+            stats["waiting"] -= 1
+            stats["active"] += 1
+            stats["acquired"] += 1
+            stats["wait_seconds"] += waited
+        try:
+            yield
+        finally:
+            with self._lock:
+                stats["active"] -= 1
+            sem.release()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "limit": self._limits[name],
+                    "active": s["active"],
+                    "waiting": s["waiting"],
+                    "avg_wait_s": round(s["wait_seconds"] / s["acquired"], 3) if s["acquired"] else 0.0,
+                }
+                for name, s in self._stats.items()
+            }
+
+
+PHASE_LIMITS = PhaseLimits(
+    {
+        "asr": settings.asr_max_concurrency,
+        "tts": settings.tts_max_concurrency,
+        "ffmpeg": settings.ffmpeg_max_concurrency,
+    }
+)
+
+
+def pending_jobs() -> int:
+    counts = JOB_STORE.count_by_state()
+    return counts.get("queued", 0) + counts.get("running", 0)
+
+
+def admit() -> None:
+    """Raise 429 (with ``Retry-After``) when the pending queue is full."""
+    pending = pending_jobs()
+    if settings.max_pending_jobs > 0 and pending >= settings.max_pending_jobs:
+        retry_after = max(1, int(settings.admission_retry_after_s))
+        JOB_STORE.incr_metric("admission_rejected")
+        log_event("admission_reject", pending=pending, limit=settings.max_pending_jobs)
+        raise HTTPException(
+            status_code=429,
+            detail=f"Too many pending jobs ({pending}); retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def queue_stats(sample: int = 20) -> Dict[str, Any]:
+    """Queue depth, recent queue wait (submitted -> claimed) and per-phase slot usage."""
+    counts = JOB_STORE.count_by_state()
+    waits = [j["queue_wait_s"] for j in JOB_STORE.recent(sample) if "queue_wait_s" in j]
+    return {
+        "queued": counts.get("queued", 0),
+        "running": counts.get("running", 0),
+        "max_pending": settings.max_pending_jobs,
+        "avg_queue_wait_s": round(sum(waits) / len(waits), 3) if waits else 0.0,
+        "max_queue_wait_s": round(max(waits), 3) if waits else 0.0,
+        "phases": PHASE_LIMITS.snapshot(),
+    }
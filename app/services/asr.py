@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+import bisect
+import multiprocessing as mp
+import queue
+import threading
 
 import numpy as np
 import soundfile as sf
@@ -14,25 +22,169 @@ from ..config import settings
 
 
 _model: WhisperModel | None = None
+_models_by_name: Dict[str, WhisperModel] = {}  # chunk worker processes: one instance per tier model
 
 
-def get_model() -> WhisperModel:
+def _load_model(cpu_threads: int = 0, num_workers: int = 1, model_name: str | None = None) -> WhisperModel:
+    try:
+        return WhisperModel(
+            model_name or settings.asr_model,
+            compute_type=settings.asr_compute_type,  # auto on CPU/GPU
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            download_root=str(settings.models_dir),
+        )
+    except LocalEntryNotFoundError as e:
+        # Erro típico quando o tráfego de saída está bloqueado / SSL falha
+        raise RuntimeError(
+            "Modelo não encontrado no cache local e o download online está bloqueado. "
+            "Baixe manualmente o modelo do Hugging Face e coloque em 'models/', "
+            "ou ajuste o ambiente de rede/SSL. Dica: defina ASR_MODEL para um caminho local."
+        ) from e
+
+
+def get_model(model_name: str | None = None) -> WhisperModel:
+    """Single process-wide instance per model (used inside chunk worker processes)."""
     global _model
-    if _model is None:
+    if model_name is None or model_name == settings.asr_model:
+        if _model is None:
+            _model = _load_model(cpu_threads=settings.asr_chunk_cpu_threads)
+        return _model
+    if model_name not in _models_by_name:
+        _models_by_name[model_name] = _load_model(cpu_threads=settings.asr_chunk_cpu_threads, model_name=model_name)
+    return _models_by_name[model_name]
+
+
+class ModelPool:
+    """Fixed-size pool of models with checkout/return semantics.
+
+    Instances are created lazily up to ``size`` (or all at once by ``preload()``). An instance
+    built with ``num_workers=N`` can run N transcriptions concurrently, so it is handed out N
+    times; beyond that, ``checkout()`` blocks until a slot is returned.
+    """
+
+    def __init__(self, size: int, loader: Callable[[], Any], slots_per_model: int = 1):
+        self.size = max(1, size)
+        self.slots_per_model = max(1, slots_per_model)
+        self._loader = loader
+        self._idle: queue.LifoQueue = queue.LifoQueue()  # LIFO keeps recently used (warm) instances busy
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+
+    def _create(self) -> bool:
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
         try:
-            _model = WhisperModel(
-                settings.asr_model,
-                compute_type=settings.asr_compute_type,  # auto on CPU/GPU
-                download_root=str(settings.models_dir),
-            )
-        except LocalEntryNotFoundError as e:
-            # Erro típico quando o tráfego de saída está bloqueado / SSL falha
-            raise RuntimeError(
-                "Modelo não encontrado no cache local e o download online está bloqueado. "
-                "Baixe manualmente o modelo do Hugging Face e coloque em 'models/', "
-                "ou ajuste o ambiente de rede/SSL. Dica: defina ASR_MODEL para um caminho local."
-            ) from e
-    return _model
+            model = self._loader()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+            raise
+        for _ in range(self.slots_per_model):
+            self._idle.put(model)
+        return True
+
+    def preload(self) -> int:
+        """Load every instance now (e.g. during app startup); returns how many were created."""
+        loaded = 0
+        while self._create():
+            loaded += 1
+        return loaded
+
+    @contextmanager
+    def checkout(self, timeout: float | None = None) -> Iterator[Any]:
+        try:
+            model = self._idle.get_nowait()
+        except queue.Empty:
+            self._create()
+            model = self._idle.get(timeout=timeout)
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(model)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "loaded": self._created,
+                "slots_per_model": self.slots_per_model,
+                "in_use": self._in_use,
+            }
+
+
+# === Model tiers ===============================================================================
+
+def asr_tiers() -> List[tuple[str, str]]:
+    """Configured ``(tier, model)`` pairs, fastest first (``ASR_TIERS="fast=tiny,balanced=small,accurate=medium"``).
+
+    Without ``ASR_TIERS`` there is a single ``default`` tier serving ``ASR_MODEL``.
+    """
+    tiers: List[tuple[str, str]] = []
+    for item in settings.asr_tiers.split(","):
+        name, _, model = item.partition("=")
+        if name.strip():
+            tiers.append((name.strip(), model.strip() or name.strip()))
+    return tiers or [("default", settings.asr_model)]
+
+
+def default_tier() -> str:
+    """The tier serving ``ASR_MODEL`` (else the most accurate one): what ``quality=auto`` starts from."""
+    tiers = asr_tiers()
+    return next((name for name, model in tiers if model == settings.asr_model), tiers[-1][0])
+
+
+def tier_model(tier: str | None) -> str:
+    return dict(asr_tiers()).get(tier or default_tier(), settings.asr_model)
+
+
+def choose_tier(duration_s: float, quality: str = "auto", queue_depth: int = 0) -> str:
+    """Pick the tier for one job.
+
+    An explicit ``quality`` naming a tier is honoured as-is. ``auto`` starts at the default tier and
+    steps down one tier for media longer than ``ASR_TIER_LONG_MEDIA_S`` and one more per
+    ``ASR_TIER_BUSY_QUEUE`` queued jobs (at most two), so heavy load trades accuracy for latency.
+    """
+    names = [name for name, _ in asr_tiers()]
+    if quality in names:
+        return quality
+    idx = names.index(default_tier())
+    if settings.asr_tier_long_media_s > 0 and duration_s > settings.asr_tier_long_media_s:
+        idx -= 1
+    if settings.asr_tier_busy_queue > 0:
+        idx -= min(2, queue_depth // settings.asr_tier_busy_queue)
+    return names[max(0, idx)]
+
+
+MODEL_POOLS: Dict[str, ModelPool] = {
+    tier: ModelPool(
+        settings.asr_pool_size,
+        partial(_load_model, cpu_threads=settings.asr_cpu_threads, num_workers=settings.asr_num_workers, model_name=model),
+        slots_per_model=settings.asr_num_workers,
+    )
+    for tier, model in asr_tiers()
+}
+MODEL_POOL = MODEL_POOLS[default_tier()]
+
+
+def get_pool(tier: str | None = None) -> ModelPool:
+    return MODEL_POOLS.get(tier or "", MODEL_POOL)
+
+
+def preload_models() -> int:
+    """Load every tier's pool (each tier stays resident); returns instances created."""
+    return sum(pool.preload() for pool in MODEL_POOLS.values())
+
+
+# A 16 kHz mono WAV on disk or the same PCM already decoded to float32 (see media.decode_audio)
+AudioSource = Path | np.ndarray
 
 
 @dataclass
@@ -51,10 +203,317 @@ def load_audio(wav_path: Path) -> np.ndarray:
     return audio.astype(np.float32)
 
 
-def transcribe(wav_path: Path, language: str | None = None) -> List[Segment]:
-    model = get_model()
-    segments, _info = model.transcribe(str(wav_path), language=None if language in (None, "auto") else language)
-    out: List[Segment] = []
+# === Voice activity detection =================================================================
+
+def detect_speech(
+    audio: np.ndarray,
+    sr: int = 16000,
+    threshold_db: float = -45.0,
+    min_silence_s: float = 0.5,
+    pad_s: float = 0.2,
+    frame_s: float = 0.03,
+) -> List[tuple[int, int]]:
+    """Energy-based VAD: ``(start_sample, end_sample)`` regions whose frame RMS exceeds ``threshold_db`` (dBFS).
+
+    Gaps shorter than ``min_silence_s`` are bridged and every region is padded by ``pad_s``
+    so word onsets/decays are not clipped.
+    """
+    frame = max(1, int(frame_s * sr))
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+    rms = np.sqrt(np.mean(np.square(audio[: n_frames * frame].reshape(n_frames, frame)), axis=1))
+    voiced = 20 * np.log10(np.maximum(rms, 1e-10)) > threshold_db
+    regions: List[tuple[int, int]] = []
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], voiced.astype(np.int8), [0]])))
+    for a, b in zip(edges[::2], edges[1::2]):
+        start, end = a * frame, b * frame
+        if regions and start - regions[-1][1] < min_silence_s * sr:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    pad = int(pad_s * sr)
+    padded: List[tuple[int, int]] = []
+    for start, end in regions:
+        start, end = max(0, start - pad), min(len(audio), end + pad)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def speech_regions(audio: np.ndarray, mode: str | None = None) -> List[tuple[int, int]] | None:
+    """Speech regions (16 kHz samples) for ``mode`` (default ``ASR_VAD``); None when VAD is off."""
+    mode = settings.asr_vad if mode is None else mode
+    if mode == "energy":
+        return detect_speech(audio, 16000, threshold_db=settings.asr_vad_energy_threshold_db, min_silence_s=settings.asr_vad_min_silence_ms / 1000)
+    if mode == "silero":
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        spans = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=settings.asr_vad_min_silence_ms))
+        return [(int(s["start"]), int(s["end"])) for s in spans]
+    return None
+
+
+class _SpeechTimeline:
+    """Maps timestamps in the compacted (speech-only) audio back to the source timeline."""
+
+    def __init__(self, regions: List[tuple[int, int]], sr: int):
+        self.sr = sr
+        self.starts = [a / sr for a, _ in regions]
+        self.compact_starts = list(np.cumsum([0] + [(b - a) for a, b in regions[:-1]]) / sr)
+
+    def to_source(self, t: float, end: bool = False) -> float:
+        # An end time on a region boundary belongs to the region it closes, not the next one
+        i = max(0, (bisect.bisect_left if end else bisect.bisect_right)(self.compact_starts, t) - 1)
+        return self.starts[i] + (t - self.compact_starts[i])
+
+
+def _decode(model: WhisperModel, audio: str | np.ndarray, language: str | None, stats: Dict[str, float] | None) -> Iterator[Segment]:
+    """Run one transcription honouring ``ASR_VAD`` and record total/speech seconds in ``stats``."""
+    language = None if language in (None, "auto") else language
+    mode = settings.asr_vad
+    stats = {} if stats is None else stats
+    if mode == "energy":
+        if isinstance(audio, str):
+            audio = load_audio(Path(audio))
+        regions = speech_regions(audio, "energy") or []
+        stats["duration_s"] = stats.get("duration_s", 0.0) + len(audio) / 16000
+        stats["speech_s"] = stats.get("speech_s", 0.0) + sum(b - a for a, b in regions) / 16000
+        if not regions:
+            return
+        timeline = _SpeechTimeline(regions, 16000)
+        segments, _info = model.transcribe(np.concatenate([audio[a:b] for a, b in regions]), language=language)
+        for s in segments:  # type: ignore[assignment]
+            yield Segment(start=timeline.to_source(float(s.start)), end=timeline.to_source(float(s.end), end=True), text=s.text.strip())
+        return
+    vad_kwargs: Dict[str, Any] = {}
+    if mode == "silero":
+        vad_kwargs = {"vad_filter": True, "vad_parameters": {"min_silence_duration_ms": settings.asr_vad_min_silence_ms}}
+    segments, info = model.transcribe(audio, language=language, **vad_kwargs)
+    stats["duration_s"] = stats.get("duration_s", 0.0) + float(info.duration)
+    stats["speech_s"] = stats.get("speech_s", 0.0) + float(getattr(info, "duration_after_vad", None) or info.duration)
     for s in segments:  # type: ignore[assignment]
-        out.append(Segment(start=float(s.start), end=float(s.end), text=s.text.strip()))
-    return out
+        yield Segment(start=float(s.start), end=float(s.end), text=s.text.strip())
+
+
+def _audio_windows(audio: AudioSource, size: int) -> Iterator[np.ndarray]:
+    """Consecutive ``size``-sample windows of 16 kHz mono PCM; files are read block by block."""
+    if isinstance(audio, np.ndarray):
+        for start in range(0, len(audio), size):
+            yield audio[start:start + size]
+        return
+    with sf.SoundFile(str(audio)) as f:
+        if f.samplerate != 16000:
+            raise ValueError("Expected 16kHz audio; ensure extract_audio used ar=16000")
+        for block in f.blocks(blocksize=size, dtype="float32", always_2d=True):
+            yield block[:, 0]
+
+
+def speech_prefix(audio: AudioSource, seconds: float) -> np.ndarray:
+    """The first ``seconds`` of speech, as energy-VAD regions concatenated.
+
+    The energy VAD runs whatever ``ASR_VAD`` says, so silent intros and room tone never reach language
+    identification. The source is scanned forward in windows of a few times ``seconds`` (at least 30 s)
+    and the scan stops once enough speech is collected, so VAD and file reads cover only the opening.
+    """
+    limit = int(seconds * 16000)
+    parts: List[np.ndarray] = []
+    total = 0
+    for window in _audio_windows(audio, max(4 * limit, 30 * 16000)):
+        for a, b in speech_regions(window, "energy") or []:
+            take = min(b - a, limit - total)
+            parts.append(window[a:a + take])
+            total += take
+            if total >= limit:
+                return np.concatenate(parts)
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+def identify_language(audio: AudioSource, seconds: float | None = None, tier: str | None = None) -> tuple[str, float]:
+    """Detect the spoken language from a short speech prefix; returns ``(code, probability)``.
+
+    Only one 30 s mel window is encoded (CTranslate2 ``detect_language``) and only the opening of the
+    source is read and VAD-scanned (see ``speech_prefix``); pass the result to ``transcribe``/``translate_text``.
+    """
+    import ctranslate2
+
+    prefix = speech_prefix(audio, min(30.0, settings.asr_langid_seconds if seconds is None else seconds))
+    with get_pool(tier).checkout() as model:
+        if not model.model.is_multilingual:  # *.en checkpoints
+            return "en", 1.0
+        window = np.zeros(30 * 16000, dtype=np.float32)
+        window[: len(prefix)] = prefix
+        features = model.feature_extractor(window)[:, : model.feature_extractor.nb_max_frames]
+        storage = ctranslate2.StorageView.from_array(np.ascontiguousarray(features[np.newaxis], dtype=np.float32))
+        token, prob = model.model.detect_language(storage)[0][0]
+    return token[2:-2], float(prob)
+
+
+def transcribe_iter(
+    wav_path: AudioSource, language: str | None = None, stats: Dict[str, float] | None = None, tier: str | None = None
+) -> Iterator[Segment]:
+    """Yield segments, served from the transcript cache when the same PCM was already transcribed.
+
+    On a miss the segments stream out as they are decoded and are stored once decoding completes.
+    ``tier`` selects the model tier (see ``choose_tier``); None means the default tier.
+    """
+    if not settings.transcript_cache_enabled:
+        yield from _transcribe_iter(wav_path, language, stats, tier=tier)
+        return
+    from .transcript_cache import load_transcript, pcm_digest, store_transcript, transcript_cache_key
+
+    pcm = wav_path if isinstance(wav_path, np.ndarray) else load_audio(wav_path)
+    key = transcript_cache_key(pcm_digest(pcm), language, model=tier_model(tier))
+    cached = load_transcript(key)
+    if cached is not None:
+        if stats is not None:
+            stats.update(cached["stats"])
+        yield from cached["segments"]
+        return
+    run_stats: Dict[str, float] = {}
+    segments: List[Segment] = []
+    for seg in _transcribe_iter(pcm, language, run_stats, tier=tier):
+        segments.append(seg)
+        yield seg
+    if stats is not None:
+        stats.update(run_stats)
+    try:
+        store_transcript(key, segments, run_stats)
+    except OSError:
+        pass  # the cache is an optimisation; never fail the job over it
+
+
+def _transcribe_iter(
+    wav_path: AudioSource, language: str | None = None, stats: Dict[str, float] | None = None, tier: str | None = None
+) -> Iterator[Segment]:
+    """Yield segments as faster-whisper decodes them (its generator is lazy).
+
+    With ``ASR_BATCHING`` the audio is decoded in 30 s windows batched across jobs (see
+    ``asr_batching``); otherwise media longer than ``asr_chunk_min_duration_s`` is split at silences
+    and transcribed across the chunk process pool (segments are still yielded in timeline order).
+    ``stats`` (optional) receives ``duration_s``/``speech_s``; the difference is what VAD skipped.
+    """
+    in_memory = isinstance(wav_path, np.ndarray)
+    if settings.asr_batching:
+        from .asr_batching import batched_asr
+
+        yield from batched_asr(tier).transcribe(wav_path if in_memory else load_audio(wav_path), language=language, stats=stats)
+        return
+    duration = len(wav_path) / 16000 if in_memory else sf.info(str(wav_path)).duration
+    if settings.asr_chunk_min_duration_s > 0 and duration > settings.asr_chunk_min_duration_s:
+        yield from transcribe_chunked(wav_path, language=language, stats=stats, tier=tier)
+        return
+    # The instance stays checked out until decoding finishes (segments are generated lazily)
+    with get_pool(tier).checkout() as model:
+        yield from _decode(model, wav_path if in_memory else str(wav_path), language, stats)
+
+
+def transcribe(
+    wav_path: AudioSource, language: str | None = None, stats: Dict[str, float] | None = None, tier: str | None = None
+) -> List[Segment]:
+    return list(transcribe_iter(wav_path, language=language, stats=stats, tier=tier))
+
+
+# === Long media: chunked, process-parallel ASR ===============================================
+
+def split_on_silence(
+    audio: np.ndarray,
+    sr: int = 16000,
+    target_s: float = 120.0,
+    search_s: float = 10.0,
+    frame_s: float = 0.03,
+) -> List[tuple[int, int]]:
+    """Split ``audio`` into ~``target_s`` chunks, cutting at the quietest point near each boundary.
+
+    Frame RMS is smoothed over ~0.3 s so cuts land inside pauses rather than on a single quiet
+    frame in the middle of a word. Returns ``(start_sample, end_sample)`` pairs covering the input.
+    """
+    n = len(audio)
+    target = int(target_s * sr)
+    if target <= 0 or n <= int(target * 1.5):
+        return [(0, n)]
+    frame = max(1, int(frame_s * sr))
+    n_frames = n // frame
+    energy = np.sqrt(np.mean(np.square(audio[: n_frames * frame].reshape(n_frames, frame)), axis=1))
+    k = max(1, int(0.3 / frame_s))
+    energy = np.convolve(energy, np.ones(k) / k, mode="same")
+    search = int(search_s * sr)
+
+    bounds = [0]
+    pos = 0
+    while n - pos > int(target * 1.5):  # never leave a tiny trailing chunk
+        ideal = pos + target
+        lo = max(pos + target // 2, ideal - search) // frame
+        hi = min(n_frames, (ideal + search) // frame)
+        cut = (lo + int(np.argmin(energy[lo:hi]))) * frame + frame // 2 if hi > lo else ideal
+        bounds.append(cut)
+        pos = cut
+    bounds.append(n)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+_CHUNK_POOLS: Dict[str, ProcessPoolExecutor] = {}  # one pool per tier model
+_CHUNK_POOL_LOCK = threading.Lock()
+
+
+def _init_chunk_worker(model_name: str) -> None:
+    """Process-pool initializer: load the pool's (tier) model up front, the only one this worker serves."""
+    get_model(model_name)
+
+
+def _transcribe_chunk(
+    audio: np.ndarray, offset_s: float, language: str | None, model_name: str | None = None
+) -> tuple[List[Segment], Dict[str, float]]:
+    stats: Dict[str, float] = {}
+    segments = [
+        Segment(start=offset_s + s.start, end=offset_s + s.end, text=s.text)
+        for s in _decode(get_model(model_name), audio, language, stats)
+    ]
+    return segments, stats
+
+
+def _chunk_pool(model_name: str) -> ProcessPoolExecutor:
+    with _CHUNK_POOL_LOCK:
+        pool = _CHUNK_POOLS.get(model_name)
+        if pool is None:
+            # spawn: the parent has threads (executor, sqlite) that must not be forked mid-state
+            pool = _CHUNK_POOLS[model_name] = ProcessPoolExecutor(
+                max_workers=max(1, settings.asr_chunk_processes),
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(model_name,),
+            )
+        return pool
+
+
+def _reset_chunk_pool(model_name: str) -> None:
+    with _CHUNK_POOL_LOCK:
+        pool = _CHUNK_POOLS.pop(model_name, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def transcribe_chunked(
+    wav_path: AudioSource, language: str | None = None, stats: Dict[str, float] | None = None, tier: str | None = None
+) -> Iterator[Segment]:
+    """Transcribe silence-delimited chunks concurrently and stitch timestamps back with offsets."""
+    audio = wav_path if isinstance(wav_path, np.ndarray) else load_audio(wav_path)
+    chunks = split_on_silence(audio, 16000, target_s=settings.asr_chunk_target_s)
+    model_name = tier_model(tier)
+    pool = _chunk_pool(model_name)
+    futures = [pool.submit(_transcribe_chunk, audio[a:b], a / 16000, language, model_name) for a, b in chunks]
+    try:
+        for future in futures:  # in timeline order; later chunks keep decoding meanwhile
+            segments, chunk_stats = future.result()
+            if stats is not None:
+                for k, v in chunk_stats.items():
+                    stats[k] = stats.get(k, 0.0) + v
+            yield from segments
+    except BrokenProcessPool:
+        _reset_chunk_pool(model_name)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,259 @@
+"""Cross-job batched Whisper decoding.
+
+Every caller splits its (VAD-compacted) audio into <=30 s windows and queues
+them on ``BATCHED_ASR``. Dispatcher threads (one per pooled model) collect windows
+from all concurrent jobs (and from the many windows of one long job) until
+``ASR_BATCH_SIZE`` is reached or ``ASR_BATCH_MAX_WAIT_MS`` elapses, then runs one
+batched encoder + decoder call on CTranslate2 (``model.model``) instead of
+batch-size-1 ``WhisperModel.transcribe`` calls. Timestamp tokens are parsed
+back into segments and each window's future resolves to its own job.
+
+Windows are decoded independently (no previous-text conditioning), which is
+what makes them batchable across jobs.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .asr import MODEL_POOL, ModelPool, Segment, _SpeechTimeline, get_pool, speech_regions, split_on_silence
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 30 * SAMPLE_RATE  # Whisper's fixed input length
+TIME_PRECISION = 0.02  # seconds per timestamp token
+
+
+def split_timestamped_tokens(
+    tokens: Sequence[int], timestamp_begin: int, eot: int
+) -> List[Tuple[float, Optional[float], List[int]]]:
+    """Group decoded ids into ``(start, end, text_tokens)`` using Whisper's timestamp tokens.
+
+    Times are relative to the window. A trailing group without a closing timestamp gets
+    ``end=None`` (the caller clamps it to the window duration).
+    """
+    segments: List[Tuple[float, Optional[float], List[int]]] = []
+    text: List[int] = []
+    start: Optional[float] = None
+    for tok in tokens:
+        if tok == eot:
+            break
+        if tok >= timestamp_begin:
+            t = (tok - timestamp_begin) * TIME_PRECISION
+            if start is not None and text:
+                segments.append((start, t, text))
+                text, start = [], None
+            else:  # opening timestamp (or the second of a <|t|><|t|> pair)
+                start = t
+        else:
+            if start is None:
+                start = segments[-1][1] if segments else 0.0
+            text.append(tok)
+    if text:
+        segments.append((start or 0.0, None, text))
+    return segments
+
+
+def split_windows(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """Cut ``audio`` into windows of at most 30 s, preferring quiet points as boundaries."""
+    chunks = split_on_silence(audio, SAMPLE_RATE, target_s=24.0, search_s=4.0)
+    windows: List[Tuple[int, int]] = []
+    for a, b in chunks:
+        while b - a > WINDOW_SAMPLES:  # split_on_silence may leave a tail up to 1.5x target
+            windows.append((a, a + WINDOW_SAMPLES))
+            a += WINDOW_SAMPLES
+        windows.append((a, b))
+    return windows
+
+
+@dataclass
+class _Window:
+    audio: np.ndarray
+    language: Optional[str]
+    future: Future = field(default_factory=Future)
+
+
+class BatchedASR:
+    def __init__(self, batch_size: int, max_wait_ms: float, pool: ModelPool | None = None):
+        self.pool = pool or MODEL_POOL
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[_Window]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stats = {"batches": 0, "windows": 0, "max_batch": 0}
+
+    # --- Dispatcher ---------------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        # One dispatcher per pooled model, so pool instances decode different batches in parallel
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.pool.size:
+                thread = threading.Thread(target=self._loop, name=f"asr-batcher-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _collect(self) -> List[_Window]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=max(0.0, remaining)) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            batch = [w for w in batch if w.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self.decode_batch(batch)
+            except BaseException as e:
+                for w in batch:
+                    w.future.set_exception(e)
+                continue
+            with self._lock:
+                self._stats["batches"] += 1
+                self._stats["windows"] += len(batch)
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            for w, segments in zip(batch, results):
+                w.future.set_result(segments)
+
+    def decode_batch(self, batch: List[_Window]) -> List[List[Segment]]:
+        """One batched encode/generate call; segment times are relative to each window."""
+        import ctranslate2
+        from faster_whisper.tokenizer import Tokenizer
+
+        with self.pool.checkout() as model:
+            n_frames = model.feature_extractor.nb_max_frames
+            feats = []
+            for w in batch:
+                padded = np.zeros(WINDOW_SAMPLES, dtype=np.float32)
+                padded[: len(w.audio)] = w.audio
+                feats.append(model.feature_extractor(padded)[:, :n_frames])
+            features = ctranslate2.StorageView.from_array(np.ascontiguousarray(np.stack(feats), dtype=np.float32))
+            encoded = model.model.encode(features, to_cpu=False)
+
+            languages = [w.language for w in batch]
+            if any(lang is None for lang in languages):
+                detected = model.model.detect_language(encoded)
+                languages = [lang or det[0][0][2:-2] for lang, det in zip(languages, detected)]
+            tokenizers = {
+                lang: Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=lang)
+                for lang in set(languages)
+            }
+            prompts = [list(tokenizers[lang].sot_sequence) for lang in languages]
+            results = model.model.generate(
+                encoded,
+                prompts,
+                beam_size=settings.asr_beam_size,
+                max_length=448,
+                return_scores=True,
+                return_no_speech_prob=True,
+                suppress_blank=True,
+            )
+
+        out: List[List[Segment]] = []
+        for w, lang, result in zip(batch, languages, results):
+            tokenizer = tokenizers[lang]
+            duration = len(w.audio) / SAMPLE_RATE
+            tokens = result.sequences_ids[0]
+            # Same rule as Whisper: silence if the no-speech token wins and the text is unlikely
+            if result.no_speech_prob > 0.6 and (result.scores[0] if result.scores else 0.0) < -1.0:
+                out.append([])
+                continue
+            segments = []
+            for start, end, text_tokens in split_timestamped_tokens(tokens, tokenizer.timestamp_begin, tokenizer.eot):
+                text = tokenizer.decode(text_tokens).strip()
+                if text:
+                    segments.append(Segment(start=min(start, duration), end=min(end if end is not None else duration, duration), text=text))
+            out.append(segments)
+        return out
+
+    # --- Client side --------------------------------------------------------------------------
+
+    def submit(self, audio: np.ndarray, language: Optional[str]) -> Future:
+        self._ensure_started()
+        window = _Window(audio=audio, language=language)
+        self._queue.put(window)
+        return window.future
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None, stats: Dict[str, float] | None = None) -> Iterator[Segment]:
+        """Yield segments (source timeline) for ``audio``; windows go through the shared batcher."""
+        language = None if language in (None, "auto") else language
+        regions = speech_regions(audio)
+        if regions is None:
+            regions = [(0, len(audio))] if len(audio) else []
+        if stats is not None:
+            stats["duration_s"] = stats.get("duration_s", 0.0) + len(audio) / SAMPLE_RATE
+            stats["speech_s"] = stats.get("speech_s", 0.0) + sum(b - a for a, b in regions) / SAMPLE_RATE
+        if not regions:
+            return
+        timeline = _SpeechTimeline(regions, SAMPLE_RATE)
+        compact = np.concatenate([audio[a:b] for a, b in regions])
+        windows = split_windows(compact)
+
+        # Keep a bounded number of windows in flight per job so one long file cannot starve the others
+        in_flight: deque = deque()
+        pending = iter(windows)
+        limit = 2 * self.batch_size
+
+        def refill() -> None:
+            while len(in_flight) < limit:
+                nxt = next(pending, None)
+                if nxt is None:
+                    return
+                in_flight.append((nxt[0], self.submit(compact[nxt[0]:nxt[1]], language)))
+
+        refill()
+        try:
+            while in_flight:
+                offset, future = in_flight.popleft()
+                segments = future.result()
+                refill()
+                base = offset / SAMPLE_RATE
+                for seg in segments:
+                    yield Segment(
+                        start=timeline.to_source(base + seg.start), end=timeline.to_source(base + seg.end, end=True), text=seg.text
+                    )
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            data = dict(self._stats)
+        data["avg_batch"] = round(data["windows"] / data["batches"], 2) if data["batches"] else 0.0
+        data["queued_windows"] = self._queue.qsize()
+        return data
+
+
+BATCHED_ASR = BatchedASR(settings.asr_batch_size, settings.asr_batch_max_wait_ms)
+_TIER_BATCHERS: Dict[str, BatchedASR] = {}
+_TIER_BATCHERS_LOCK = threading.Lock()
+
+
+def batched_asr(tier: Optional[str] = None) -> BatchedASR:
+    """The batcher for ``tier``: windows only share a batch when they run on the same model."""
+    pool = get_pool(tier)
+    if pool is MODEL_POOL:
+        return BATCHED_ASR
+    with _TIER_BATCHERS_LOCK:
+        if tier not in _TIER_BATCHERS:
+            _TIER_BATCHERS[tier] = BatchedASR(settings.asr_batch_size, settings.asr_batch_max_wait_ms, pool=pool)
+        return _TIER_BATCHERS[tier]
@@ -0,0 +1,82 @@
+"""Per-job phase checkpoints so failed or interrupted jobs resume instead of restarting.
+
+Artifacts live in ``data/jobs/<job_id>/`` (``DATA_DIR``, never served); ``manifest.json`` lists the
+completed phases and is rewritten atomically *after* each artifact is on
+disk, so a crash mid-phase never marks a half-written file as done.
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from ..config import settings
+from .asr import Segment
+
+
+class JobCheckpoint:
+    def __init__(self, job_id: str, enabled: bool = True):
+        self.enabled = enabled
+        self.dir = settings.data_dir / "jobs" / job_id
+        self._manifest: Dict[str, Any] = {"phases": {}}
+        # Fan-out threads (one per target language) mark phases on the same checkpoint
+        self._lock = threading.Lock()
+        if enabled:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            manifest = self.dir / "manifest.json"
+            if manifest.exists():
+                try:
+                    self._manifest = json.loads(manifest.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    self._manifest = {"phases": {}}
+
+    def artifact(self, name: str, default: Path) -> Path:
+        """Where a phase should write ``name``: the job dir when checkpointing, else ``default``."""
+        return self.dir / name if self.enabled else default
+
+    def done(self, phase: str) -> bool:
+        entry = self._manifest["phases"].get(phase)
+        if not self.enabled or entry is None:
+            return False
+        # The artifact must still exist (e.g. outputs/ may have been cleaned up)
+        return all(Path(p).exists() for p in entry.get("files", []))
+
+    def get(self, phase: str) -> Dict[str, Any]:
+        return self._manifest["phases"].get(phase, {})
+
+    def mark(self, phase: str, files: List[Path] | None = None, **meta: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._manifest["phases"][phase] = {"files": [str(f) for f in files or []], "ts": time.time(), **meta}
+            tmp = self.dir / "manifest.json.tmp"
+            tmp.write_text(json.dumps(self._manifest, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.dir / "manifest.json")
+
+    def save_json(self, name: str, data: Any) -> Path:
+        path = self.dir / name
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        return path
+
+    def load_json(self, name: str) -> Any:
+        return json.loads((self.dir / name).read_text(encoding="utf-8"))
+
+    def load_segments(self, name: str) -> List[Segment]:
+        return [Segment(start=float(a), end=float(b), text=t) for a, b, t in self.load_json(name)]
+
+    def record_json(self, phase: str, name: str, data: Any, **meta: Any) -> None:
+        if self.enabled:
+            self.mark(phase, files=[self.save_json(name, data)], **meta)
+
+    def record_segments(self, phase: str, name: str, segments: List[Segment], **meta: Any) -> None:
+        self.record_json(phase, name, [[s.start, s.end, s.text] for s in segments], **meta)
+
+    def clear(self) -> None:
+        if self.enabled:
+            shutil.rmtree(self.dir, ignore_errors=True)
@@ -0,0 +1,151 @@
+"""Size-bounded, content-addressed file cache with LRU eviction.
+
+Entries are plain files named after their key (``<root>/<key[:2]>/<key><suffix>``).
+Reads refresh the file mtime, and eviction removes the least recently used
+entries once the directory exceeds ``max_bytes``; writes keep a running size
+total so the directory is not rescanned on every put. Writes go through a temp
+file + ``os.replace`` so concurrent readers (threads or worker processes)
+never see partial entries.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def hash_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Streaming sha256 of a file (never loads the whole upload in memory)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DiskCache:
+    # Eviction trims to this fraction of ``max_bytes`` so a full cache is not rescanned on every write
+    LOW_WATER = 0.9
+
+    def __init__(self, root: Path, max_bytes: int, resync_s: float = 60.0):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.resync_s = resync_s
+        self._lock = threading.Lock()
+        # Running totals, seeded by the first full scan and kept current by writes and evictions
+        self._bytes = 0
+        self._count = 0
+        self._scanned_at: Optional[float] = None
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key[:2]
+
+    def get(self, key: str) -> Optional[Path]:
+        """Return the cached file for ``key`` (any suffix) or None; marks it recently used."""
+        d = self._dir(key)
+        if not d.exists():
+            return None
+        for path in d.glob(f"{key}*"):
+            if path.name.startswith(".tmp"):
+                continue
+            try:
+                os.utime(path)
+            except FileNotFoundError:  # evicted concurrently
+                continue
+            return path
+        return None
+
+    def _commit(self, tmp: str, target: Path) -> None:
+        """Move a finished temp file into place and account for it in the running totals."""
+        size = os.path.getsize(tmp)
+        try:
+            replaced: Optional[int] = target.stat().st_size
+        except FileNotFoundError:
+            replaced = None
+        os.replace(tmp, target)
+        with self._lock:
+            self._bytes += size - (replaced or 0)
+            self._count += replaced is None
+
+    def put_file(self, key: str, src: Path, suffix: str = "") -> Path:
+        target = self._dir(key) / f"{key}{suffix}"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp", dir=target.parent)
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp)
+            self._commit(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        self.evict()
+        return target
+
+    def put_bytes(self, key: str, data: bytes, suffix: str = "") -> Path:
+        target = self._dir(key) / f"{key}{suffix}"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp", dir=target.parent)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            self._commit(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+        self.evict()
+        return target
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for path in self.root.glob("*/*"):
+            if path.name.startswith(".tmp"):
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _stale(self) -> bool:
+        # Other processes write to the same directory, so the running totals are resynced periodically
+        return self._scanned_at is None or time.monotonic() - self._scanned_at >= self.resync_s
+
+    def evict(self, force: bool = False) -> int:
+        """Drop least recently used entries once the cache exceeds ``max_bytes``; returns entries removed.
+
+        The directory is only scanned when the running total passes the cap, when the totals are due a
+        resync (``resync_s``) or when ``force`` is set; eviction then trims to ``LOW_WATER`` of the cap.
+        """
+        with self._lock:
+            if not (force or self._stale() or self._bytes > self.max_bytes):
+                return 0
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries):
+                    if total <= self.max_bytes * self.LOW_WATER:
+                        break
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    removed += 1
+            self._bytes, self._count = total, len(entries) - removed
+            self._scanned_at = time.monotonic()
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and size from the running totals (no directory scan unless a resync is due)."""
+        self.evict()
+        with self._lock:
+            return {"entries": self._count, "bytes": self._bytes, "max_bytes": self.max_bytes}
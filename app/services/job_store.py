@@ -0,0 +1,255 @@
+"""Durable job queue / status store backed by SQLite (WAL mode).
+
+Replaces the in-memory ``JOB_STATUS``/``METRICS`` dicts so that job state
+survives restarts and is shared between uvicorn workers and the standalone
+``python -m app.worker`` processes. Each thread gets its own connection;
+read-modify-write operations run inside ``BEGIN IMMEDIATE`` transactions so
+concurrent writers never lose updates.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    params TEXT NOT NULL,
+    info TEXT NOT NULL,
+    worker TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state_created ON jobs (state, created);
+CREATE TABLE IF NOT EXISTS metrics (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    event TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_job_seq ON job_events (job_id, seq);
+CREATE INDEX IF NOT EXISTS job_events_ts ON job_events (ts);
+"""
+
+DEFAULT_METRICS = ("translate_fail", "tts_fail", "mux_fail")
+
+
+class JobStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # Connections are per thread and per process (never reuse one inherited through fork).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _mutate(self, job_id: str, fn: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT info FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            info = json.loads(row["info"])
+            fn(info)
+            conn.execute(
+                "UPDATE jobs SET info = ?, state = ?, updated = ? WHERE id = ?",
+                (json.dumps(info, ensure_ascii=False), info["state"], time.time(), job_id),
+            )
+            conn.execute("COMMIT")
+            return info
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- Jobs ---------------------------------------------------------------------------------
+
+    def create_job(self, job_id: str, params: Dict[str, Any], info: Dict[str, Any]) -> None:
+        now = time.time()
+        info = {"state": "queued", **info}
+        self._conn().execute(
+            "INSERT INTO jobs (id, state, params, info, worker, created, updated) VALUES (?, ?, ?, ?, NULL, ?, ?)",
+            (job_id, info["state"], json.dumps(params, ensure_ascii=False), json.dumps(info, ensure_ascii=False), now, now),
+        )
+
+    def claim_job(self, job_id: str, worker: str) -> Optional[Dict[str, Any]]:
+        """Atomically move a specific queued job to ``running``; returns its params or None if taken."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT params FROM jobs WHERE id = ? AND state = 'queued'", (job_id,)).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            self._mark_running(conn, job_id, worker)
+            conn.execute("COMMIT")
+            return json.loads(row["params"])
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def claim_next(self, worker: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Atomically claim the oldest queued job (FIFO); returns (job_id, params) or None."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, params FROM jobs WHERE state = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("ROLLBACK")
+                return None
+            self._mark_running(conn, row["id"], worker)
+            conn.execute("COMMIT")
+            return row["id"], json.loads(row["params"])
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _mark_running(conn: sqlite3.Connection, job_id: str, worker: str) -> None:
+        info = json.loads(conn.execute("SELECT info FROM jobs WHERE id = ?", (job_id,)).fetchone()["info"])
+        now = time.time()
+        info.update({"state": "running", "worker": worker, "started": now})
+        if "submitted" in info and "queue_wait_s" not in info:
+            info["queue_wait_s"] = round(now - info["submitted"], 3)
+        conn.execute(
+            "UPDATE jobs SET state = 'running', worker = ?, info = ?, updated = ? WHERE id = ?",
+            (worker, json.dumps(info, ensure_ascii=False), time.time(), job_id),
+        )
+
+    def heartbeat(self, job_id: str) -> None:
+        """Refresh ``updated`` for a running job so it is not considered stale."""
+        self._conn().execute("UPDATE jobs SET updated = ? WHERE id = ? AND state = 'running'", (time.time(), job_id))
+
+    def requeue(
+        self, job_id: str, from_states: Tuple[str, ...] = ("failed",), max_attempts: int | None = None
+    ) -> bool:
+        """Put a job back in the queue (e.g. manual retry); returns False if it is not in ``from_states``.
+
+        With ``max_attempts``, a job that already ran that many times is marked ``failed`` instead.
+        """
+        def apply(info: Dict[str, Any]) -> None:
+            if info["state"] not in from_states:
+                return
+            attempts = info.get("attempts", 1)
+            if max_attempts is not None and attempts >= max_attempts:
+                info.update({"state": "failed", "current_phase": None,
+                             "error": f"gave up after {attempts} attempts (the worker crashed or stalled every time)"})
+                return
+            info.update({"state": "queued", "attempts": attempts + 1, "current_phase": None})
+            info.pop("error", None)
+        info = self._mutate(job_id, apply)
+        if info and info["state"] == "failed" and "gave up after" in info.get("error", ""):
+            self.incr_metric("job_attempts_exhausted")
+        return bool(info and info["state"] == "queued")
+
+    def requeue_stale(self, stale_after: float, max_attempts: int | None = None) -> List[str]:
+        """Requeue running jobs whose worker stopped heart-beating (crash, OOM kill, restart).
+
+        Jobs that reached ``max_attempts`` (poison jobs that kill their worker) are failed instead;
+        only the requeued ids are returned.
+        """
+        cutoff = time.time() - stale_after
+        rows = self._conn().execute(
+            "SELECT id FROM jobs WHERE state = 'running' AND updated < ?", (cutoff,)
+        ).fetchall()
+        return [r["id"] for r in rows if self.requeue(r["id"], from_states=("running",), max_attempts=max_attempts)]
+
+    def queued_ids(self) -> List[str]:
+        rows = self._conn().execute("SELECT id FROM jobs WHERE state = 'queued' ORDER BY created").fetchall()
+        return [r["id"] for r in rows]
+
+    def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        return self._mutate(job_id, lambda info: info.update(fields))
+
+    def increment(self, job_id: str, **deltas: float) -> Optional[Dict[str, Any]]:
+        """Atomically add ``deltas`` to numeric info fields (concurrent fan-out phases share totals)."""
+        def apply(info: Dict[str, Any]) -> None:
+            for name, delta in deltas.items():
+                info[name] = info.get(name, 0) + delta
+        return self._mutate(job_id, apply)
+
+    def append_phase(self, job_id: str, phase: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._mutate(job_id, lambda info: info.setdefault("phases", []).append(phase))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT info FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["info"]) if row else None
+
+    def get_params(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["params"]) if row else None
+
+    def recent(self, limit: int = 5) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT id, info FROM jobs ORDER BY created DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return [{"job_id": r["id"], **json.loads(r["info"])} for r in reversed(rows)]
+
+    def count_by_state(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        return {r["state"]: r["n"] for r in rows}
+
+    # --- Events -------------------------------------------------------------------------------
+
+    def add_event(self, job_id: str, event: str, data: Dict[str, Any]) -> int:
+        """Append one progress event for ``job_id``; returns its sequence number (the SSE event id)."""
+        cur = self._conn().execute(
+            "INSERT INTO job_events (job_id, ts, event, data) VALUES (?, ?, ?, ?)",
+            (job_id, time.time(), event, json.dumps(data, ensure_ascii=False, default=str)),
+        )
+        return int(cur.lastrowid)
+
+    def events_since(self, job_id: str, after_seq: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT seq, ts, event, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (job_id, after_seq, limit),
+        ).fetchall()
+        return [{"seq": r["seq"], "ts": r["ts"], "event": r["event"], "data": json.loads(r["data"])} for r in rows]
+
+    def prune_events(self, older_than: float) -> int:
+        """Drop events recorded before ``older_than`` (epoch seconds); returns rows deleted."""
+        return self._conn().execute("DELETE FROM job_events WHERE ts < ?", (older_than,)).rowcount
+
+    # --- Metrics ------------------------------------------------------------------------------
+
+    def incr_metric(self, name: str, amount: int = 1) -> None:
+        self._conn().execute(
+            "INSERT INTO metrics (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, amount),
+        )
+
+    def metrics(self) -> Dict[str, int]:
+        data = {name: 0 for name in DEFAULT_METRICS}
+        for row in self._conn().execute("SELECT name, value FROM metrics").fetchall():
+            data[row["name"]] = row["value"]
+        return data
+
+
+JOB_STORE = JobStore(settings.jobs_db_path)
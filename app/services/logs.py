@@ -9,13 +9,25 @@ from ..config import settings
 _LOG = logging.getLogger("dubby.events")
 
 def log_event(event: str, **fields: Any) -> None:
-    """Emit structured JSON log (stdout)."""
+    """Emit structured JSON log (stdout).
+
+    Events carrying a ``job_id`` are also persisted to the job store, where
+    ``/api/job/{job_id}/events`` streams them to clients (SSE).
+    """
     record: Dict[str, Any] = {"event": event, "ts": time.time()}
     record.update(fields)
     try:
         _LOG.info(json.dumps(record, ensure_ascii=False))
     except Exception:
         _LOG.info({"event": event, **fields})
+    job_id = fields.get("job_id")
+    if job_id and settings.job_events_enabled:
+        try:
+            from .job_store import JOB_STORE
+
+            JOB_STORE.add_event(str(job_id), event, {k: v for k, v in fields.items() if k != "job_id"})
+        except Exception:
+            pass  # progress events are best-effort; never fail a job over them
 
 def append_event_line(message: str) -> None:
     """Append plain text line to outputs/logs/events.log (best-effort)."""
@@ -5,11 +5,17 @@ import subprocess
 import shutil
 from typing import Optional
 
+import numpy as np
 
-def run_ffmpeg(args: list[str]) -> None:
+from .admission import PHASE_LIMITS
+
+
+def run_ffmpeg(args: list[str], capture_stdout: bool = False) -> bytes | None:
     cmd = ["ffmpeg", "-y", *args]
     try:
-        subprocess.run(cmd, check=True)
+        with PHASE_LIMITS.slot("ffmpeg"):
+            proc = subprocess.run(cmd, check=True, stdout=subprocess.PIPE if capture_stdout else None)
+        return proc.stdout
     except FileNotFoundError as e:
         raise RuntimeError(
             "ffmpeg não encontrado no PATH. Instale o ffmpeg no host ou use o container Docker."
@@ -26,6 +32,21 @@ def extract_audio(input_media: Path, out_wav: Path, sr: int = 16000) -> Path:
     return out_wav
 
 
+def pcm_s16le_to_float32(raw: bytes) -> np.ndarray:
+    audio = np.frombuffer(raw, dtype="<i2").astype(np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
+
+
+def decode_audio(input_media: Path, sr: int = 16000) -> np.ndarray:
+    """Decode to mono float32 PCM through ``pipe:1`` (raw s16le), without writing a WAV."""
+    raw = run_ffmpeg(
+        ["-nostdin", "-i", str(input_media), "-vn", "-ac", "1", "-ar", str(sr), "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"],
+        capture_stdout=True,
+    )
+    return pcm_s16le_to_float32(raw or b"")
+
+
 def mux_video_with_audio(input_media: Path, input_audio: Path, output_media: Path) -> Path:
     output_media.parent.mkdir(parents=True, exist_ok=True)
     run_ffmpeg(["-i", str(input_media), "-i", str(input_audio), "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", "aac", "-shortest", str(output_media)])
@@ -1,99 +1,651 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+import asyncio
+import os
+import shutil
+import threading
 import time
 import logging
 import uuid
 
-from .media import extract_audio, mux_video_with_audio, has_ffmpeg
-from .asr import transcribe
-from .translate import translate_text
-from .tts import synthesize_segments_with_clone, save_wav
+import numpy as np
+import soundfile as sf
+
+from .media import decode_audio, extract_audio, mux_video_with_audio, has_ffmpeg
+from .asr import AudioSource, Segment, choose_tier, identify_language, load_audio, tier_model, transcribe_iter
+from .translate import translate_batch, translate_text
+from .tts import (
+    synthesize_segment,
+    synthesize_segments_with_clone,
+    save_wav,
+    fit_to_slot,
+    concat_segment_audio,
+    apply_post_clone,
+    needs_segment_level_clone,
+)
+from .streaming import StreamingStages
+from .result_cache import RESULT_CACHE, result_cache_key
+from .disk_cache import hash_file
+from .checkpoint import JobCheckpoint
+from .admission import PHASE_LIMITS
 from ..config import settings
 from .logs import log_event
-
-JOB_STATUS: dict[str, dict] = {}
-METRICS = {"translate_fail": 0, "tts_fail": 0, "mux_fail": 0}
+from .job_store import JOB_STORE
 
 logger = logging.getLogger(__name__)
 
+# Every pipeline phase is synchronous (ffmpeg, Whisper, Argos, pyttsx3), so jobs run on a
+# bounded thread pool instead of the event loop; /health and /api/* stay responsive.
+# With JOB_RUNNER=worker the web tier only enqueues and `python -m app.worker` executes.
+_EXECUTOR = ThreadPoolExecutor(max_workers=max(1, settings.pipeline_max_workers), thread_name_prefix="dubby-pipeline")
+_WEB_WORKER_ID = f"web-{os.getpid()}"
 
-async def process_media(input_media: Path, src_lang: str, dst_lang: str, audio_only: bool | None = None, job_id: str | None = None) -> Path:
-    t0 = time.perf_counter()
-    job_id = job_id or uuid.uuid4().hex
-    JOB_STATUS[job_id] = {"state": "running", "src": src_lang, "dst": dst_lang, "input": str(input_media), "started": time.time(), "phases": []}
-    log_event("pipeline_start", job_id=job_id, input=str(input_media), src=src_lang, dst=dst_lang)
 
-    # 1) Extração
-    phase_start = time.perf_counter()
-    wav_path = input_media.with_suffix(".16k.wav")
-    extract_audio(input_media, wav_path, sr=16000)
-    dur = round(time.perf_counter() - phase_start, 3)
-    JOB_STATUS[job_id]["phases"].append({"phase": "extract_audio", "seconds": dur})
-    log_event("phase_end", job_id=job_id, phase="extract_audio", seconds=dur)
+def _register_job(
+    job_id: str,
+    input_media: Path,
+    src_lang: str,
+    dst_langs: list[str],
+    audio_only: bool | None,
+    quality: str = "auto",
+    input_digest: str | None = None,
+) -> None:
+    params = {"input": str(input_media), "src_lang": src_lang, "dst_langs": dst_langs, "audio_only": audio_only, "quality": quality}
+    if input_digest is not None:
+        params["input_digest"] = input_digest  # already hashed at submit time for the result cache
+    info = {
+        "src": src_lang,
+        "dst": ",".join(dst_langs),
+        "dst_langs": dst_langs,
+        "quality": quality,
+        "input": str(input_media),
+        "submitted": time.time(),
+        "current_phase": None,
+        "phases": [],
+    }
+    JOB_STORE.create_job(job_id, params, info)
+
+
+def parse_dst_langs(dst_lang: str | list[str]) -> list[str]:
+    """Accept one code, a comma-separated list ("pt,es,en") or a list; dedupe keeping order."""
+    items = dst_lang.split(",") if isinstance(dst_lang, str) else dst_lang
+    langs: list[str] = []
+    for item in items:
+        code = item.strip()
+        if code and code not in langs:
+            langs.append(code)
+    return langs or ["en"]
 
-    # 2) ASR
-    phase_start = time.perf_counter()
-    segments = transcribe(wav_path, language=None if src_lang == "auto" else src_lang)
+
+def _start_phase(job_id: str, phase: str, lang: str | None = None, **extra) -> float:
+    JOB_STORE.update(job_id, current_phase=f"{phase}:{lang}" if lang else phase)
+    log_event("phase_start", job_id=job_id, phase=phase, **({"lang": lang} if lang else {}), **extra)
+    return time.perf_counter()
+
+
+def _end_phase(job_id: str, phase: str, phase_start: float, lang: str | None = None, **extra) -> float:
     dur = round(time.perf_counter() - phase_start, 3)
-    JOB_STATUS[job_id]["phases"].append({"phase": "asr", "seconds": dur, "segments": len(segments)})
-    log_event("phase_end", job_id=job_id, phase="asr", segments=len(segments), seconds=dur)
+    entry = {"phase": phase, "seconds": dur, **({"lang": lang} if lang else {}), **extra}
+    JOB_STORE.append_phase(job_id, entry)
+    log_event("phase_end", job_id=job_id, **entry)
+    return dur
+
+
+class _Progress:
+    """Per-segment ``segment_progress`` events for one stage, throttled to ``JOB_EVENTS_PROGRESS_INTERVAL``."""
+
+    def __init__(self, job_id: str, stage: str, lang: str | None = None, total: int | None = None, media_s: float | None = None):
+        self.job_id, self.stage, self.lang, self.total, self.media_s = job_id, stage, lang, total, media_s
+        self.done = 0
+        self.position_s = 0.0
+        self._last = 0.0
+        self._emitted = -1
+
+    def tick(self, position_s: float | None = None, n: int = 1) -> None:
+        self.done += n
+        if position_s is not None:
+            self.position_s = position_s
+        now = time.monotonic()
+        if now - self._last >= settings.job_events_progress_interval or self.done == self.total:
+            self._last = now
+            self.emit()
+
+    def emit(self) -> None:
+        if not settings.job_events_enabled or self._emitted == self.done:
+            return
+        self._emitted = self.done
+        fields = {"stage": self.stage, "done": self.done}
+        if self.lang:
+            fields["lang"] = self.lang
+        if self.total is not None:
+            fields["total"] = self.total
+        if self.media_s:  # ASR: how far into the media decoding has got
+            fields.update(position_s=round(self.position_s, 2), media_s=round(self.media_s, 2))
+        log_event("segment_progress", job_id=self.job_id, **fields)
+
+
+def _media_seconds(source: AudioSource) -> float:
+    return len(source) / 16000 if isinstance(source, np.ndarray) else sf.info(str(source)).duration
+
+
+def _phase_resumed(job_id: str, phase: str, lang: str | None = None) -> None:
+    entry = {"phase": phase, "seconds": 0.0, "resumed": True, **({"lang": lang} if lang else {})}
+    JOB_STORE.append_phase(job_id, entry)
+    log_event("phase_resumed", job_id=job_id, phase=phase, lang=lang)
+
+
+def _source_language(src_lang: str) -> str:
+    # Only reached with "auto" when language ID is disabled or failed
+    return src_lang if src_lang != "auto" else "en"
+
+
+def _asr_tier(job_id: str, ckpt: JobCheckpoint, source: AudioSource, quality: str) -> str:
+    """Pick the ASR model tier from media duration, requested quality and queue depth; recorded on the job.
+
+    Checkpointed so a resumed job keeps the tier it started with.
+    """
+    if ckpt.done("asr_tier"):
+        tier = ckpt.get("asr_tier")["tier"]
+    else:
+        duration = _media_seconds(source)
+        queued = JOB_STORE.count_by_state().get("queued", 0)
+        tier = choose_tier(duration, quality=quality, queue_depth=queued)
+        ckpt.mark("asr_tier", tier=tier)
+        JOB_STORE.incr_metric(f"asr_tier_{tier}")
+        log_event("asr_tier", job_id=job_id, tier=tier, model=tier_model(tier), quality=quality, duration_s=round(duration, 2), queued=queued)
+    JOB_STORE.update(job_id, asr_tier=tier, asr_model=tier_model(tier))
+    return tier
+
+
+def _language_id_phase(job_id: str, ckpt: JobCheckpoint, source: AudioSource, tier: str | None = None) -> str:
+    """Resolve src_lang=auto once from a speech prefix; returns the code (or "auto" on failure)."""
+    if ckpt.done("langid"):
+        _phase_resumed(job_id, "langid")
+        return ckpt.get("langid")["language"]
+    phase_start = _start_phase(job_id, "langid")
+    try:
+        language, probability = identify_language(source, tier=tier)
+    except Exception as e:
+        log_event("langid_failed", job_id=job_id, error=str(e))
+        _end_phase(job_id, "langid", phase_start, error=str(e))
+        return "auto"
+    JOB_STORE.update(job_id, detected_language=language, language_probability=round(probability, 4))
+    ckpt.mark("langid", language=language, probability=probability)
+    _end_phase(job_id, "langid", phase_start, language=language, probability=round(probability, 4))
+    return language
+
+
+def _vad_fields(job_id: str, stats: dict) -> dict:
+    """Record how much non-speech audio VAD kept away from Whisper; returns the phase extras."""
+    if "duration_s" not in stats:
+        return {}
+    fields = {
+        "media_seconds": round(stats["duration_s"], 2),
+        "speech_seconds": round(stats["speech_s"], 2),
+        "vad_skipped_seconds": round(stats["duration_s"] - stats["speech_s"], 2),
+    }
+    JOB_STORE.update(job_id, **fields)
+    return fields
+
+
+def _tm_fields(job_id: str, stats: dict) -> dict:
+    """Add this phase's translation-memory hits/misses to the job totals; returns the phase extras."""
+    if not stats:
+        return {}
+    JOB_STORE.increment(job_id, **stats)
+    return dict(stats)
+
+
+def _asr_phase(job_id: str, source: AudioSource, src_lang: str, tier: str | None = None) -> list[Segment]:
+    phase_start = _start_phase(job_id, "asr")
+    stats: dict = {}
+    progress = _Progress(job_id, "asr", media_s=_media_seconds(source))
+    segments: list[Segment] = []
+    with PHASE_LIMITS.slot("asr"):
+        for seg in transcribe_iter(source, language=None if src_lang == "auto" else src_lang, stats=stats, tier=tier):
+            segments.append(seg)
+            progress.tick(seg.end)
+    progress.emit()
+    _end_phase(job_id, "asr", phase_start, segments=len(segments), tier=tier, **_vad_fields(job_id, stats))
     for i, seg in enumerate(segments[:3]):
         logger.debug({"event": "asr_sample", "idx": i, "start": seg.start, "end": seg.end, "text": seg.text[:120]})
+    return segments
 
-    # 3) Tradução
-    phase_start = time.perf_counter()
+
+def _translate_phase(
+    job_id: str, segments: list[Segment], src_lang: str, dst_lang: str, lang_tag: str | None = None
+) -> list[tuple[float, float, str]]:
+    phase_start = _start_phase(job_id, "translate", lang_tag)
+    progress = _Progress(job_id, "translate", lang_tag, total=len(segments))
     translated_segments: list[tuple[float, float, str]] = []
-    for seg in segments:
-        source_language = src_lang if src_lang != "auto" else "en"
-        text = translate_text(seg.text, source_language, dst_lang)
-        translated_segments.append((seg.start, seg.end, text))
-        if len(translated_segments) <= 3:
-            log_event("translate_sample", job_id=job_id, src_sample=seg.text[:80], dst_sample=text[:80])
-    dur = round(time.perf_counter() - phase_start, 3)
-    JOB_STATUS[job_id]["phases"].append({"phase": "translate", "seconds": dur, "segments": len(translated_segments)})
-    log_event("phase_end", job_id=job_id, phase="translate", segments=len(translated_segments), seconds=dur)
+    tm_stats: dict = {}
+    batch_size = max(1, settings.translation_batch_size)
+    for i in range(0, len(segments), batch_size):
+        batch = segments[i : i + batch_size]
+        texts = translate_batch([seg.text for seg in batch], _source_language(src_lang), dst_lang, stats=tm_stats)
+        for seg, text in zip(batch, texts):
+            translated_segments.append((seg.start, seg.end, text))
+            if len(translated_segments) <= 3:
+                log_event("translate_sample", job_id=job_id, lang=dst_lang, src_sample=seg.text[:80], dst_sample=text[:80])
+        progress.tick(n=len(batch))
+    _end_phase(job_id, "translate", phase_start, lang_tag, segments=len(translated_segments), **_tm_fields(job_id, tm_stats))
+    return translated_segments
 
-    # 4) TTS / Clonagem
-    phase_start = time.perf_counter()
-    log_event("phase_start", job_id=job_id, phase="tts_clone")
+
+def _tts_phase(
+    job_id: str, translated_segments: list[tuple[float, float, str]], source: AudioSource, dst_lang: str, lang_tag: str | None = None
+) -> np.ndarray:
+    phase_start = _start_phase(job_id, "tts_clone", lang_tag, segments=len(translated_segments))
     try:
-        audio = synthesize_segments_with_clone(translated_segments, wav_path, target_language=dst_lang, sr=16000)
+        with PHASE_LIMITS.slot("tts"):
+            audio = synthesize_segments_with_clone(translated_segments, source, target_language=dst_lang, sr=16000)
     except Exception as e:
-        METRICS["tts_fail"] += 1
-        JOB_STATUS[job_id]["error"] = f"tts_fail: {e}"
+        JOB_STORE.incr_metric("tts_fail")
+        JOB_STORE.update(job_id, error=f"tts_fail: {e}")
         raise
-    dubbed_wav = settings.outputs_dir / f"{input_media.stem}.dubbed.wav"
-    save_wav(dubbed_wav, audio, sr=16000)
-    dur = round(time.perf_counter() - phase_start, 3)
-    JOB_STATUS[job_id]["phases"].append({"phase": "tts_clone", "seconds": dur})
-    log_event("phase_end", job_id=job_id, phase="tts_clone", seconds=dur, duration_s=round(len(audio)/16000, 2))
+    _end_phase(job_id, "tts_clone", phase_start, lang_tag, duration_s=round(len(audio)/16000, 2))
+    return audio
+
+
+def _streaming_phases(
+    job_id: str, source: AudioSource, src_lang: str, dst_lang: str, tier: str | None = None
+) -> tuple[list[Segment], list[tuple[float, float, str]], np.ndarray]:
+    """Overlap ASR, translation and TTS: each segment flows downstream as soon as it is decoded."""
+    phase_start = _start_phase(job_id, "asr_translate_tts", streaming=True)
+    asr_progress = _Progress(job_id, "asr", media_s=_media_seconds(source))
+    translate_progress = _Progress(job_id, "translate")
+    tts_progress = _Progress(job_id, "tts_clone")
+    source_language = _source_language(src_lang)
+    # OpenVoice consumes the full segment list, so only ASR + translation stream in that case
+    stream_tts = not needs_segment_level_clone()
+    translated_count = 0
+    asr_stats: dict = {}
+    tm_stats: dict = {}
+
+    def translate_stage(seg: Segment) -> tuple[Segment, tuple[float, float, str]]:
+        nonlocal translated_count
+        text = translate_text(seg.text, source_language, dst_lang, stats=tm_stats)
+        translated_count += 1
+        if translated_count <= 3:
+            log_event("translate_sample", job_id=job_id, lang=dst_lang, src_sample=seg.text[:80], dst_sample=text[:80])
+        translate_progress.tick()
+        return seg, (seg.start, seg.end, text)
+
+    def tts_stage(item: tuple[Segment, tuple[float, float, str]]) -> tuple[Segment, tuple[float, float, str], np.ndarray]:
+        seg, (start, end, text) = item
+        try:
+            with PHASE_LIMITS.slot("tts"):
+                seg_audio = synthesize_segment(text, language=dst_lang, sr=16000)
+            tts_progress.tick()
+            return seg, (start, end, text), fit_to_slot(seg_audio, start, end, sr=16000)
+        except Exception as e:
+            JOB_STORE.incr_metric("tts_fail")
+            JOB_STORE.update(job_id, error=f"tts_fail: {e}")
+            raise
+
+    stages = [("translate", translate_stage)]
+    if stream_tts:
+        stages.append(("tts_clone", tts_stage))
+    def asr_source():
+        # The ASR slot is held for the whole decode, not per segment
+        with PHASE_LIMITS.slot("asr"):
+            for seg in transcribe_iter(source, language=None if src_lang == "auto" else src_lang, stats=asr_stats, tier=tier):
+                asr_progress.tick(seg.end)
+                yield seg
+        asr_progress.emit()
+
+    runner = StreamingStages(
+        "asr",
+        asr_source,
+        stages,
+        maxsize=settings.pipeline_stream_queue_size,
+    )
+    outputs = list(runner.run())
+    translate_progress.emit()
+    if stream_tts:
+        tts_progress.emit()
+    segments = [item[0] for item in outputs]
+    translated_segments = [item[1] for item in outputs]
+    if stream_tts:
+        audio = apply_post_clone(concat_segment_audio([item[2] for item in outputs], sr=16000), source, sr=16000)
+    else:
+        try:
+            with PHASE_LIMITS.slot("tts"):
+                audio = synthesize_segments_with_clone(translated_segments, source, target_language=dst_lang, sr=16000)
+        except Exception as e:
+            JOB_STORE.incr_metric("tts_fail")
+            JOB_STORE.update(job_id, error=f"tts_fail: {e}")
+            raise
+
+    busy = {name: round(seconds, 3) for name, seconds in runner.busy.items()}
+    _end_phase(
+        job_id,
+        "asr_translate_tts",
+        phase_start,
+        segments=len(outputs),
+        stage_busy_seconds=busy,
+        tier=tier,
+        **_vad_fields(job_id, asr_stats),
+        **_tm_fields(job_id, tm_stats),
+    )
+    return segments, translated_segments, audio
+
+
+def _extract_phase(job_id: str, ckpt: JobCheckpoint, input_media: Path) -> AudioSource:
+    """Decode the input to 16 kHz mono; returns the PCM buffer (pipe mode) or the WAV path.
+
+    In pipe mode ffmpeg streams s16le to ``pipe:1`` and the same float32 array feeds ASR and the
+    voice profile; the WAV is only written when checkpointing needs it for resume.
+    """
+    wav_path = ckpt.artifact("audio.16k.wav", input_media.with_suffix(".16k.wav"))
+    if ckpt.done("extract_audio"):
+        _phase_resumed(job_id, "extract_audio")
+        return load_audio(wav_path) if settings.pipeline_pcm_pipe else wav_path
+    phase_start = _start_phase(job_id, "extract_audio")
+    if settings.pipeline_pcm_pipe:
+        source: AudioSource = decode_audio(input_media, sr=16000)
+        if ckpt.enabled:
+            save_wav(wav_path, source, sr=16000)
+            ckpt.mark("extract_audio", files=[wav_path])
+        _end_phase(job_id, "extract_audio", phase_start, pcm_pipe=True, duration_s=round(len(source) / 16000, 2))
+        return source
+    extract_audio(input_media, wav_path, sr=16000)
+    ckpt.mark("extract_audio", files=[wav_path])
+    _end_phase(job_id, "extract_audio", phase_start)
+    return wav_path
 
-    # 5) Mux
-    phase_start = time.perf_counter()
-    if audio_only is True or (audio_only is None and not has_ffmpeg()):
+
+def _checkpointed_asr(job_id: str, ckpt: JobCheckpoint, source: AudioSource, src_lang: str, tier: str | None = None) -> list[Segment]:
+    if ckpt.done("asr"):
+        _phase_resumed(job_id, "asr")
+        return ckpt.load_segments("segments.json")
+    segments = _asr_phase(job_id, source, src_lang, tier)
+    ckpt.record_segments("asr", "segments.json", segments)
+    return segments
+
+
+def _mux_phase(job_id: str, input_media: Path, dubbed_wav: Path, stem: str, audio_only: bool, lang_tag: str | None) -> tuple[Path, bool]:
+    phase_start = _start_phase(job_id, "mux", lang_tag)
+    if audio_only:
         output_path = dubbed_wav
         mux_used = False
     else:
-        output_path = settings.outputs_dir / f"{input_media.stem}.dubbed.mp4"
+        output_path = settings.outputs_dir / f"{stem}.dubbed.mp4"
         try:
             mux_video_with_audio(input_media, dubbed_wav, output_path)
             mux_used = True
         except Exception as e:
-            METRICS["mux_fail"] += 1
-            log_event("mux_failed", job_id=job_id, error=str(e))
+            JOB_STORE.incr_metric("mux_fail")
+            log_event("mux_failed", job_id=job_id, lang=lang_tag, error=str(e))
             output_path = dubbed_wav
             mux_used = False
-    dur = round(time.perf_counter() - phase_start, 3)
-    JOB_STATUS[job_id]["phases"].append({"phase": "mux", "seconds": dur, "mux_used": mux_used})
-    log_event("phase_end", job_id=job_id, phase="mux", mux_used=mux_used, seconds=dur)
+    _end_phase(job_id, "mux", phase_start, lang_tag, mux_used=mux_used)
+    return output_path, mux_used
+
+
+def _dub_language(
+    job_id: str,
+    ckpt: JobCheckpoint,
+    input_media: Path,
+    source: AudioSource,
+    segments: list[Segment] | None,
+    src_lang: str,
+    dst_lang: str,
+    audio_only: bool,
+    fan_out: bool,
+    tier: str | None = None,
+) -> tuple[Path, bool]:
+    """Translate -> TTS -> mux for one target language; ``segments=None`` means stream ASR too."""
+    lang_tag = dst_lang if fan_out else None
+
+    def key(name: str) -> str:
+        return f"{name}:{dst_lang}" if fan_out else name
+
+    stem = f"{input_media.stem}.{dst_lang}" if fan_out else input_media.stem
+    dubbed_wav = settings.outputs_dir / f"{stem}.dubbed.wav"
+    translated_name = f"translated.{dst_lang}.json" if fan_out else "translated.json"
+    if ckpt.done(key("tts_clone")):
+        _phase_resumed(job_id, "tts_clone", lang_tag)
+    else:
+        if segments is None and not ckpt.done("asr"):
+            segments, translated_segments, audio = _streaming_phases(job_id, source, src_lang, dst_lang, tier)
+            ckpt.record_segments("asr", "segments.json", segments)
+            ckpt.record_json(key("translate"), translated_name, translated_segments)
+        else:
+            if segments is None:
+                segments = _checkpointed_asr(job_id, ckpt, source, src_lang, tier)
+            if ckpt.done(key("translate")):
+                translated_segments = [tuple(t) for t in ckpt.load_json(translated_name)]
+                _phase_resumed(job_id, "translate", lang_tag)
+            else:
+                translated_segments = _translate_phase(job_id, segments, src_lang, dst_lang, lang_tag)
+                ckpt.record_json(key("translate"), translated_name, translated_segments)
+            audio = _tts_phase(job_id, translated_segments, source, dst_lang, lang_tag)
+        save_wav(dubbed_wav, audio, sr=16000)
+        ckpt.mark(key("tts_clone"), files=[dubbed_wav])
+
+    return _mux_phase(job_id, input_media, dubbed_wav, stem, audio_only, lang_tag)
+
+
+def _resolve_audio_only(audio_only: bool | None) -> bool:
+    return audio_only is True or (audio_only is None and not has_ffmpeg())
+
+
+def _cached_results(
+    digest: str, src_lang: str, dst_langs: list[str], audio_only: bool, quality: str
+) -> tuple[dict[str, str], dict[str, Path]]:
+    """Result-cache keys per target language and the entries already cached (no hit/miss metrics)."""
+    keys = {lang: result_cache_key(digest, src_lang, lang, audio_only, quality) for lang in dst_langs}
+    hits = {lang: path for lang, key in keys.items() if (path := RESULT_CACHE.get(key)) is not None}
+    return keys, hits
+
+
+def _restore_cached(input_media: Path, lang: str, cached: Path, fan_out: bool) -> Path:
+    stem = f"{input_media.stem}.{lang}" if fan_out else input_media.stem
+    # Copy (not hard-link): later jobs rewrite outputs in place and must not corrupt the cache entry
+    output = settings.outputs_dir / f"{stem}.dubbed{cached.suffix}"
+    shutil.copyfile(cached, output)
+    return output
+
+
+def _complete_from_cache(
+    job_id: str, input_media: Path, digest: str, src_lang: str, dst_langs: list[str], audio_only: bool | None, quality: str
+) -> bool:
+    """Finish a just-registered job at submit time when every target language is in the result cache.
+
+    A repeat upload then completes immediately instead of waiting behind ``PIPELINE_MAX_WORKERS``
+    busy jobs. Returns False (job left queued) on any miss or when a runner claimed it first.
+    """
+    t0 = time.perf_counter()
+    _, hits = _cached_results(digest, src_lang, dst_langs, _resolve_audio_only(audio_only), quality)
+    if len(hits) < len(dst_langs) or JOB_STORE.claim_job(job_id, _WEB_WORKER_ID) is None:
+        return False
+    log_event("pipeline_start", job_id=job_id, input=str(input_media), src=src_lang, dst=",".join(dst_langs))
+    try:
+        outputs = {lang: _restore_cached(input_media, lang, hits[lang], len(dst_langs) > 1) for lang in dst_langs}
+    except OSError as e:  # evicted between lookup and copy: run the job normally
+        logger.debug(f"Result cache entry vanished for {job_id}: {e}")
+        JOB_STORE.requeue(job_id, from_states=("running",))
+        return False
+    JOB_STORE.incr_metric("result_cache_hit", len(dst_langs))
+    _complete_job(job_id, t0, dst_langs, outputs, cache_hit=True)
+    return True
+
+
+def _run_media_pipeline(
+    input_media: Path,
+    src_lang: str,
+    dst_langs: list[str],
+    audio_only: bool | None,
+    job_id: str,
+    quality: str = "auto",
+    input_digest: str | None = None,
+) -> dict[str, Path]:
+    """Blocking pipeline body; runs on ``_EXECUTOR`` or inside a worker process.
+
+    Extraction and ASR run once; translation/TTS/mux fan out per target language.
+    Returns ``{dst_lang: output_path}``.
+    """
+    t0 = time.perf_counter()
+    log_event("pipeline_start", job_id=job_id, input=str(input_media), src=src_lang, dst=",".join(dst_langs))
+    audio_only = _resolve_audio_only(audio_only)
+    fan_out = len(dst_langs) > 1
 
+    # 0) Cache de resultado (mesma mídia + mesmos parâmetros), por idioma
+    outputs: dict[str, Path] = {}
+    cache_keys: dict[str, str] = {}
+    if settings.result_cache_enabled:
+        cache_keys, hits = _cached_results(input_digest or hash_file(input_media), src_lang, dst_langs, audio_only, quality)
+        for lang in dst_langs:
+            if lang not in hits:
+                JOB_STORE.incr_metric("result_cache_miss")
+                continue
+            JOB_STORE.incr_metric("result_cache_hit")
+            outputs[lang] = _restore_cached(input_media, lang, hits[lang], fan_out)
+    pending = [lang for lang in dst_langs if lang not in outputs]
+    if not pending:
+        return _complete_job(job_id, t0, dst_langs, outputs, cache_hit=True)
+
+    ckpt = JobCheckpoint(job_id, enabled=settings.job_checkpoints_enabled)
+
+    # 1) Extração
+    source = _extract_phase(job_id, ckpt, input_media)
+    tier = _asr_tier(job_id, ckpt, source, quality)
+    if src_lang == "auto" and settings.asr_langid_enabled:
+        src_lang = _language_id_phase(job_id, ckpt, source, tier)
+
+    # 2) ASR once (a single target language may stream ASR -> translation -> TTS instead)
+    segments = None
+    if len(pending) > 1 or not settings.pipeline_streaming:
+        segments = _checkpointed_asr(job_id, ckpt, source, src_lang, tier)
+
+    # 3-5) Tradução -> TTS / Clonagem -> Mux, in parallel per language
+    def dub(lang: str) -> tuple[Path, bool]:
+        return _dub_language(job_id, ckpt, input_media, source, segments, src_lang, lang, audio_only, fan_out, tier)
+
+    if len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=max(1, min(len(pending), settings.fanout_max_workers)), thread_name_prefix="dubby-fanout") as pool:
+            results = dict(zip(pending, pool.map(dub, pending)))
+    else:
+        results = {pending[0]: dub(pending[0])}
+
+    for lang, (output_path, mux_used) in results.items():
+        outputs[lang] = output_path
+        # A WAV fallback after a failed mux is not what was requested; never pin it in the cache
+        if lang in cache_keys and (audio_only or mux_used):
+            try:
+                RESULT_CACHE.put_file(cache_keys[lang], output_path, suffix=output_path.suffix)
+            except OSError as e:
+                logger.warning(f"Could not store result in cache: {e}")
+
+    result = _complete_job(job_id, t0, dst_langs, outputs)
+    if not settings.job_keep_checkpoints:
+        ckpt.clear()
+    return result
+
+
+def _complete_job(job_id: str, t0: float, dst_langs: list[str], outputs: dict[str, Path], **extra) -> dict[str, Path]:
     total = round(time.perf_counter() - t0, 3)
-    JOB_STATUS[job_id]["state"] = "completed"
-    JOB_STATUS[job_id]["total_seconds"] = total
-    JOB_STATUS[job_id]["output"] = str(output_path)
-    log_event("pipeline_complete", job_id=job_id, output=str(output_path), total_seconds=total)
-    return output_path
+    primary = str(outputs[dst_langs[0]])
+    JOB_STORE.update(
+        job_id,
+        state="completed",
+        current_phase=None,
+        total_seconds=total,
+        output=primary,
+        outputs={lang: str(path) for lang, path in outputs.items()},
+        **extra,
+    )
+    log_event(
+        "pipeline_complete",
+        job_id=job_id,
+        output=primary,
+        outputs={k: str(v) for k, v in outputs.items()},
+        download_url=f"/api/job/{job_id}/download",
+        total_seconds=total,
+        **extra,
+    )
+    return {lang: outputs[lang] for lang in dst_langs}
+
+
+@contextmanager
+def _heartbeat(job_id: str):
+    """Keep a running job fresh in the store so crash recovery can tell it apart from orphans."""
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(settings.job_heartbeat_interval):
+            try:
+                JOB_STORE.heartbeat(job_id)
+            except Exception as e:
+                logger.debug(f"heartbeat failed for {job_id}: {e}")
+
+    thread = threading.Thread(target=beat, name=f"heartbeat-{job_id[:8]}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join(timeout=1.0)
+
+
+def run_job(job_id: str, params: dict) -> Path:
+    """Execute an already-claimed job, recording failure state in the store.
+
+    Returns the output of the first target language (see ``outputs`` in the job info for all).
+    """
+    dst_langs = params.get("dst_langs") or [params["dst_lang"]]
+    try:
+        with _heartbeat(job_id):
+            outputs = _run_media_pipeline(
+                Path(params["input"]),
+                params["src_lang"],
+                dst_langs,
+                params.get("audio_only"),
+                job_id,
+                quality=params.get("quality", "auto"),
+                input_digest=params.get("input_digest"),
+            )
+            return outputs[dst_langs[0]]
+    except Exception as e:
+        info = JOB_STORE.get(job_id) or {}
+        JOB_STORE.update(job_id, state="failed", error=info.get("error") or str(e))
+        log_event("pipeline_failure", job_id=job_id, phase=info.get("current_phase"), error=str(e))
+        raise
+
+
+def _run_if_unclaimed(job_id: str) -> Path | None:
+    """Executor entry point: an external worker may have claimed the job first."""
+    params = JOB_STORE.claim_job(job_id, _WEB_WORKER_ID)
+    if params is None:
+        return None
+    return run_job(job_id, params)
+
+
+async def wait_for_job(job_id: str) -> Path:
+    """Poll the store until a job finishes (used when workers run out of process)."""
+    while True:
+        info = JOB_STORE.get(job_id) or {}
+        if info.get("state") == "completed":
+            return Path(info["output"])
+        if info.get("state") == "failed":
+            raise RuntimeError(info.get("error") or "job failed")
+        await asyncio.sleep(settings.worker_poll_interval)
+
+
+async def process_media(input_media: Path, src_lang: str, dst_lang: str | list[str], audio_only: bool | None = None, job_id: str | None = None) -> Path:
+    """Run the pipeline off the event loop and await its result (first target language)."""
+    job_id = job_id or uuid.uuid4().hex
+    _register_job(job_id, input_media, src_lang, parse_dst_langs(dst_lang), audio_only)
+    if settings.job_runner == "worker":
+        return await wait_for_job(job_id)
+    loop = asyncio.get_running_loop()
+    output = await loop.run_in_executor(_EXECUTOR, partial(_run_if_unclaimed, job_id))
+    return output if output is not None else await wait_for_job(job_id)
 
 
 async def run_pipeline(input_media: Path, src_lang: str = "auto", dst_lang: str = "en", audio_only: bool | None = None) -> tuple[str, Path]:
@@ -101,3 +653,85 @@ async def run_pipeline(input_media: Path, src_lang: str = "auto", dst_lang: str
     job_id = uuid.uuid4().hex
     output = await process_media(input_media, src_lang, dst_lang, audio_only=audio_only, job_id=job_id)
     return job_id, output
+
+
+def _schedule(job_id: str) -> None:
+    """Hand a queued job to the in-process executor (no-op when external workers run jobs)."""
+    if settings.job_runner == "worker":
+        return
+    future = _EXECUTOR.submit(_run_if_unclaimed, job_id)
+    # Failures are already recorded in the store; consume the exception so it is not reported as unretrieved.
+    future.add_done_callback(lambda f: f.exception())
+
+
+def submit_job(
+    input_media: Path, src_lang: str = "auto", dst_lang: str | list[str] = "en", audio_only: bool | None = None, quality: str = "auto"
+) -> str:
+    """Enqueue a job and return its id immediately (fire-and-forget).
+
+    ``dst_lang`` may list several languages ("pt,es,en"): one extraction + ASR pass, fan-out per language.
+    ``quality`` is ``auto`` or an ASR tier name (see ``ASR_TIERS``). A job whose every output is
+    already in the result cache is completed here and never enqueued. Hashes the upload, so call it
+    off the event loop.
+    """
+    job_id = uuid.uuid4().hex
+    dst_langs = parse_dst_langs(dst_lang)
+    digest = hash_file(input_media) if settings.result_cache_enabled else None
+    _register_job(job_id, input_media, src_lang, dst_langs, audio_only, quality, input_digest=digest)
+    log_event("job_submitted", job_id=job_id, input=str(input_media), src=src_lang, dst=",".join(dst_langs))
+    if digest is None or not _complete_from_cache(job_id, input_media, digest, src_lang, dst_langs, audio_only, quality):
+        _schedule(job_id)
+    return job_id
+
+
+def retry_job(job_id: str) -> bool:
+    """Requeue a failed job; it resumes from its last checkpointed phase."""
+    if not JOB_STORE.requeue(job_id):
+        return False
+    _schedule(job_id)
+    log_event("job_retry", job_id=job_id)
+    return True
+
+
+def recover_jobs() -> list[str]:
+    """Requeue jobs orphaned by a crashed worker and, in inline mode, schedule every queued job."""
+    stale = JOB_STORE.requeue_stale(settings.job_stale_after_s, settings.job_max_attempts)
+    if stale:
+        log_event("jobs_requeued", job_ids=stale)
+    prune_old_events()
+    if settings.job_runner != "worker":
+        for job_id in JOB_STORE.queued_ids():
+            _schedule(job_id)
+    return stale
+
+
+def prune_old_events() -> int:
+    """Drop job events older than ``JOB_EVENTS_RETENTION_S``; returns rows deleted."""
+    return JOB_STORE.prune_events(time.time() - settings.job_events_retention_s)
+
+
+def requeue_orphans() -> list[str]:
+    """Requeue running jobs whose runner stopped heart-beating and, in inline mode, schedule them here."""
+    stale = JOB_STORE.requeue_stale(settings.job_stale_after_s, settings.job_max_attempts)
+    if stale:
+        log_event("jobs_requeued", job_ids=stale)
+        if settings.job_runner != "worker":
+            for job_id in stale:
+                _schedule(job_id)
+    return stale
+
+
+async def recovery_loop() -> None:
+    """Inline mode's counterpart of the worker's periodic stale check (and event pruning).
+
+    The startup pass alone misses jobs of a process that crashed less than ``JOB_STALE_AFTER_S``
+    before the restart: they still look fresh then, and would otherwise stay ``running`` (and hold
+    admission slots) forever. A long-lived server would also keep every job event.
+    """
+    while True:
+        await asyncio.sleep(max(1.0, settings.job_stale_after_s / 2))
+        try:
+            await asyncio.to_thread(requeue_orphans)
+            await asyncio.to_thread(prune_old_events)
+        except Exception as e:
+            logger.warning(f"Stale job check failed: {e}")
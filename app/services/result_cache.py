@@ -0,0 +1,43 @@
+"""Content-addressed cache of finished dubs.
+
+The key combines the sha256 of the uploaded bytes with every setting that
+changes the produced artifact, so re-submitting the same media with the same
+parameters returns the stored output without re-running the pipeline.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+
+from ..config import settings
+from .disk_cache import DiskCache
+from .transcript_cache import asr_cache_params
+
+# Bump when pipeline changes alter the output for identical inputs/settings
+RESULT_CACHE_VERSION = 1
+
+RESULT_CACHE = DiskCache(settings.cache_dir / "results", settings.result_cache_max_mb * 1024 * 1024)
+
+
+def result_cache_key(input_digest: str, src_lang: str, dst_lang: str, audio_only: bool, quality: str = "auto") -> str:
+    """``input_digest`` is the sha256 of the uploaded bytes (see ``disk_cache.hash_file``)."""
+    params = {
+        "v": RESULT_CACHE_VERSION,
+        "input": input_digest,
+        "src_lang": src_lang,
+        "dst_lang": dst_lang,
+        "audio_only": audio_only,
+        "asr_model": settings.asr_model,
+        "asr_tiers": settings.asr_tiers,
+        "quality": quality,
+        **asr_cache_params(),
+        # For src_lang=auto the detected language (and so the whole transcript) depends on the langid window
+        "asr_langid": [settings.asr_langid_enabled, settings.asr_langid_seconds] if src_lang == "auto" else None,
+        "translation_backend": settings.translation_backend,
+        "tts_backend": settings.tts_backend,
+        "voice_clone_enabled": settings.voice_clone_enabled,
+        "voice_clone_mode": settings.voice_clone_mode,
+        "voice_clone_pitch_strength": settings.voice_clone_pitch_strength,
+        "voice_clone_formant_strength": settings.voice_clone_formant_strength,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
@@ -0,0 +1,114 @@
+"""Bounded-queue stage runner used by the streaming pipeline mode.
+
+Each stage runs on its own thread and hands items downstream through a
+bounded ``queue.Queue``, so a slow consumer applies backpressure instead of
+letting upstream stages buffer the whole job. Item order is preserved.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class StreamingStages:
+    """Run ``source`` and ``stages`` concurrently; iterate ``run()`` for the final outputs.
+
+    ``busy`` records seconds each stage spent working (excluding queue waits), which is
+    what bounds wall-clock time once the stages overlap.
+    """
+
+    def __init__(
+        self,
+        source_name: str,
+        source: Callable[[], Iterable[Any]],
+        stages: List[Tuple[str, Callable[[Any], Any]]],
+        maxsize: int = 8,
+    ):
+        self.source_name = source_name
+        self.source = source
+        self.stages = stages
+        self.maxsize = max(1, maxsize)
+        self.busy: dict[str, float] = {source_name: 0.0, **{name: 0.0 for name, _ in stages}}
+        self._stop = threading.Event()
+
+    def _put(self, q: queue.Queue, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue) -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _run_source(self, out_q: queue.Queue) -> None:
+        try:
+            it = iter(self.source())
+            while not self._stop.is_set():
+                t0 = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    break
+                finally:
+                    self.busy[self.source_name] += time.perf_counter() - t0
+                if not self._put(out_q, item):
+                    return
+            self._put(out_q, _DONE)
+        except BaseException as e:  # propagate to the consumer
+            self._put(out_q, _Failure(e))
+
+    def _run_stage(self, name: str, fn: Callable[[Any], Any], in_q: queue.Queue, out_q: queue.Queue) -> None:
+        while True:
+            item = self._get(in_q)
+            if item is _DONE or isinstance(item, _Failure):
+                self._put(out_q, item)
+                return
+            t0 = time.perf_counter()
+            try:
+                result = fn(item)
+            except BaseException as e:
+                self._put(out_q, _Failure(e))
+                return
+            finally:
+                self.busy[name] += time.perf_counter() - t0
+            if not self._put(out_q, result):
+                return
+
+    def run(self) -> Iterator[Any]:
+        queues = [queue.Queue(maxsize=self.maxsize) for _ in range(len(self.stages) + 1)]
+        threads = [threading.Thread(target=self._run_source, args=(queues[0],), name=f"stream-{self.source_name}", daemon=True)]
+        for i, (name, fn) in enumerate(self.stages):
+            threads.append(
+                threading.Thread(target=self._run_stage, args=(name, fn, queues[i], queues[i + 1]), name=f"stream-{name}", daemon=True)
+            )
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.exc
+                yield item
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join(timeout=5.0)
@@ -0,0 +1,83 @@
+"""Content-addressed cache of ASR transcripts.
+
+Keyed by the sha256 of the decoded 16 kHz PCM plus every ASR setting that
+changes the segments, so re-dubbing the same source into another language
+or voice mode skips Whisper entirely. Entries are gzip'd JSON
+(``[[start, end, text], ...]`` with millisecond timestamps) stored in a
+size-capped ``DiskCache``.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+from .asr import Segment
+from .disk_cache import DiskCache
+from .job_store import JOB_STORE
+
+# Bump when ASR changes alter the segments for identical audio/settings
+TRANSCRIPT_CACHE_VERSION = 1
+
+TRANSCRIPT_CACHE = DiskCache(settings.cache_dir / "transcripts", settings.transcript_cache_max_mb * 1024 * 1024)
+
+
+def pcm_digest(audio: np.ndarray) -> str:
+    """sha256 of the float32 PCM buffer (hashed in place, no copy for contiguous arrays)."""
+    return hashlib.sha256(memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast("B")).hexdigest()
+
+
+def asr_cache_params() -> Dict[str, Any]:
+    """Every setting besides the model and language that changes ASR segments for the same audio."""
+    return {
+        "asr_compute_type": settings.asr_compute_type,
+        "asr_vad": settings.asr_vad,
+        "asr_vad_min_silence_ms": settings.asr_vad_min_silence_ms,
+        "asr_vad_energy_threshold_db": settings.asr_vad_energy_threshold_db,
+        "asr_batching": settings.asr_batching,
+        "asr_beam_size": settings.asr_beam_size if settings.asr_batching else None,
+        # Chunked ASR splits long media at silences, which moves segment boundaries and changes text
+        "asr_chunk_min_duration_s": settings.asr_chunk_min_duration_s,
+        "asr_chunk_target_s": settings.asr_chunk_target_s,
+    }
+
+
+def transcript_cache_key(digest: str, language: str | None, model: str | None = None) -> str:
+    params = {
+        "v": TRANSCRIPT_CACHE_VERSION,
+        "pcm": digest,
+        "language": language or "auto",
+        "asr_model": model or settings.asr_model,
+        **asr_cache_params(),
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_transcript(key: str) -> Optional[Dict[str, Any]]:
+    """Cached ``{"segments": [Segment], "stats": {...}}`` for ``key`` or None; counts hit/miss."""
+    path = TRANSCRIPT_CACHE.get(key)
+    if path is not None:
+        try:
+            payload = json.loads(gzip.decompress(path.read_bytes()))
+            JOB_STORE.incr_metric("transcript_cache_hit")
+            return {
+                "segments": [Segment(start=a / 1000, end=b / 1000, text=t) for a, b, t in payload["segments"]],
+                "stats": payload.get("stats", {}),
+            }
+        except (OSError, ValueError, KeyError):
+            pass  # corrupt/evicted entry: treat as a miss and overwrite
+    JOB_STORE.incr_metric("transcript_cache_miss")
+    return None
+
+
+def store_transcript(key: str, segments: List[Segment], stats: Dict[str, float] | None = None) -> None:
+    payload = {
+        "segments": [[round(s.start * 1000), round(s.end * 1000), s.text] for s in segments],
+        "stats": stats or {},
+    }
+    data = gzip.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    TRANSCRIPT_CACHE.put_bytes(key, data, suffix=".json.gz")
@@ -1,11 +1,18 @@
-"""Translation service using argostranslate."""
+"""Translation service: argostranslate packages or OPUS-MT (Marian) models run directly by CTranslate2."""
 
+import functools
 import logging
 import os
+import re
+import threading
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import argostranslate.package
+import argostranslate.settings
 import argostranslate.translate
 from ..config import settings
+from .job_store import JOB_STORE
+from .translation_memory import TRANSLATION_MEMORY, memory_key
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +35,51 @@ LANGUAGE_MAP = {
 _FAILED_PAIRS: set[tuple[str, str]] = set()
 _OFFLINE_ONLY = settings.translation_offline_only or os.getenv("TRANSLATION_OFFLINE_ONLY", "false").lower() in {"1", "true", "yes"}
 
+# In-process index of installed packages and resolved translation objects. get_installed_packages()
+# scans the package directory on disk, so it runs once (and again only after an install).
+_INDEX_LOCK = threading.Lock()
+_INSTALLED: Dict[Tuple[str, str], Any] | None = None
+_TRANSLATIONS: Dict[Tuple[str, str], Any] = {}
+
+
+def _installed_index() -> Dict[Tuple[str, str], Any]:
+    """``{(from_code, to_code): package}`` for every installed Argos package (built once)."""
+    global _INSTALLED
+    with _INDEX_LOCK:
+        if _INSTALLED is None:
+            _INSTALLED = {(p.from_code, p.to_code): p for p in argostranslate.package.get_installed_packages()}
+        return _INSTALLED
+
+
+def invalidate_translation_cache() -> None:
+    """Forget the installed-package index and loaded translations (call after installing packages)."""
+    global _INSTALLED
+    with _INDEX_LOCK:
+        _INSTALLED = None
+        _TRANSLATIONS.clear()
+    # argostranslate memoizes its language graph too (lru_cache in recent versions)
+    cache_clear = getattr(argostranslate.translate.get_installed_languages, "cache_clear", None)
+    if cache_clear is not None:
+        cache_clear()
+
+
+def install_package(path: Path) -> None:
+    argostranslate.package.install_from_path(path)
+    invalidate_translation_cache()
+
+
+def get_translation(source: str, target: str):
+    """Argos translation object for an installed pair (resolved once, then a dict lookup)."""
+    pair = (source, target)
+    translation = _TRANSLATIONS.get(pair)
+    if translation is None:
+        translation = argostranslate.translate.get_translation_from_codes(source, target)
+        if translation is None:
+            raise LookupError(f"No installed translation {source}->{target}")
+        with _INDEX_LOCK:
+            translation = _TRANSLATIONS.setdefault(pair, translation)
+    return translation
+
 
 def ensure_translation_package(from_lang: str, to_lang: str) -> bool:
     """Ensure the translation package is installed.
@@ -36,15 +88,16 @@ def ensure_translation_package(from_lang: str, to_lang: str) -> bool:
         - Offline-only mode: skips remote index/download attempts if TRANSLATION_OFFLINE_ONLY=true.
         - Failure cache: don't retry same pair repeatedly within one process (avoids log spam).
     """
+    if _marian_backend():
+        # Marian models are converted offline into MARIAN_MODELS_DIR; there is nothing to download
+        return (marian_model_dir(from_lang, to_lang) / "model.bin").is_file()
     pair = (from_lang, to_lang)
     if pair in _FAILED_PAIRS:
         return False
     try:
         # Already installed?
-        for package in argostranslate.package.get_installed_packages():
-            if package.from_code == from_lang and package.to_code == to_lang:
-                logger.debug(f"Translation package {from_lang}->{to_lang} already installed")
-                return True
+        if pair in _installed_index():
+            return True
 
         if _OFFLINE_ONLY:
             logger.info(f"Offline-only mode: skipping online fetch for {from_lang}->{to_lang}")
@@ -67,7 +120,7 @@ def ensure_translation_package(from_lang: str, to_lang: str) -> bool:
 
         logger.info(f"Installing translation package {from_lang}->{to_lang}")
         try:
-            argostranslate.package.install_from_path(target_package.download())
+            install_package(target_package.download())
             return True
         except Exception as e:
             logger.error(f"Download/install failed for {from_lang}->{to_lang}: {e}")
@@ -79,482 +132,750 @@ def ensure_translation_package(from_lang: str, to_lang: str) -> bool:
         return False
 
 
-def translate_text(text: str, source_lang: str = "en", target_lang: str = "pt") -> str:
-    """Translate text from source language to target language using argostranslate."""
+def translate_text(
+    text: str, source_lang: str = "en", target_lang: str = "pt", stats: Dict[str, int] | None = None
+) -> str:
+    """Translate text from source language to target language using argostranslate.
+
+    Repeated segments are served from the translation memory; ``stats`` (optional) receives
+    ``tm_hits``/``tm_misses``.
+    """
+    source = LANGUAGE_MAP.get(source_lang, source_lang)
+    target = LANGUAGE_MAP.get(target_lang, target_lang)
+    logger.debug(f"Translating from {source} to {target}: '{text[:100]}...'")
+    return _translate([text], source, target, stats, lambda pending: [_translate_one(t, source, target) for t in pending])[0]
+
+
+def translate_batch(
+    texts: List[str], source_lang: str = "en", target_lang: str = "pt", stats: Dict[str, int] | None = None
+) -> List[str]:
+    """Translate many segments with one batched CTranslate2 call; results align with ``texts``.
+
+    All sentences of all segments are tokenized up front and sent to the package's
+    ``ctranslate2.Translator.translate_batch`` (``TRANSLATION_BATCH_SIZE`` examples per batch)
+    instead of one ``argostranslate.translate.translate`` call per segment. Pairs that are not a
+    single installed package (pivot translations) and any batch failure are translated one
+    segment at a time. With ``TRANSLATION_BACKEND=marian`` the batch goes to the pair's
+    OPUS-MT model instead. Segments already in the translation memory never reach the model.
+    """
+    source = LANGUAGE_MAP.get(source_lang, source_lang)
+    target = LANGUAGE_MAP.get(target_lang, target_lang)
+    return _translate(list(texts), source, target, stats, lambda pending: _translate_many(pending, source, target))
+
+
+def _translate(
+    texts: List[str],
+    source: str,
+    target: str,
+    stats: Dict[str, int] | None,
+    neural: Callable[[List[str]], List[Optional[str]]],
+) -> List[str]:
+    """Translation memory + neural translation + dictionary fallback, shared by both entry points."""
+    if source == target:
+        logger.debug("Source and target languages are the same, skipping translation")
+        return list(texts)
+    # Ensure translation package is available
+    if not ensure_translation_package(source, target):
+        logger.warning(f"Translation package not available for {source}->{target}, using fallback")
+        return [_fallback_translate(text, source, target) for text in texts]
+
+    results: List[Optional[str]] = [text if not text.strip() else None for text in texts]
+    pending = [i for i, text in enumerate(texts) if text.strip()]
+    keys: Dict[int, str] = {}
+    version = ""
+    if settings.translation_memory_enabled and pending:
+        try:
+            version = _package_version(source, target)
+            keys = {i: memory_key(texts[i], source, target, version) for i in pending}
+            found = TRANSLATION_MEMORY.get_many(set(keys.values()))
+        except Exception as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+            keys, found = {}, {}
+        for i in pending:
+            if i in keys and keys[i] in found:
+                results[i] = found[keys[i]]
+        hits = sum(1 for i in pending if results[i] is not None)
+        _count(stats, hits, len(pending) - hits)
+        pending = [i for i in pending if results[i] is None]
+
+    if pending:
+        translated = neural([texts[i] for i in pending])
+        learned = []
+        for i, out in zip(pending, translated):
+            if out is None:
+                results[i] = _fallback_translate(texts[i], source, target)
+                continue
+            results[i] = out
+            if i in keys:
+                learned.append((keys[i], source, target, version, texts[i], out))
+        if learned:
+            try:
+                TRANSLATION_MEMORY.put_many(learned)
+            except Exception as e:
+                logger.warning(f"Could not store translations in memory: {e}")
+    return [r if r is not None else "" for r in results]
+
+
+def _count(stats: Dict[str, int] | None, hits: int, misses: int) -> None:
+    if hits:
+        JOB_STORE.incr_metric("translation_memory_hit", hits)
+    if misses:
+        JOB_STORE.incr_metric("translation_memory_miss", misses)
+    if stats is not None:
+        stats["tm_hits"] = stats.get("tm_hits", 0) + hits
+        stats["tm_misses"] = stats.get("tm_misses", 0) + misses
+
+
+def _package_version(source: str, target: str) -> str:
+    """Version tag for memory keys: the pair's package, or every package a pivot route could use."""
+    if _marian_backend():
+        return _marian_version(source, target)
+    index = _installed_index()
+    pkg = index.get((source, target))
+    if pkg is not None:
+        return str(getattr(pkg, "package_version", ""))
+    legs = sorted(f"{a}-{b}@{getattr(p, 'package_version', '')}" for (a, b), p in index.items() if a == source or b == target)
+    return "pivot:" + ",".join(legs)
+
+
+def _translate_one(text: str, source: str, target: str) -> Optional[str]:
+    """argostranslate for one segment; None when it fails or returns nothing."""
+    if _marian_backend():
+        return _translate_many([text], source, target)[0]
     try:
-        # Map language codes
-        source = LANGUAGE_MAP.get(source_lang, source_lang)
-        target = LANGUAGE_MAP.get(target_lang, target_lang)
-        logger.debug(f"Translating from {source} to {target}: '{text[:100]}...'")
-        
-        # Skip translation if source and target are the same
-        if source == target:
-            logger.info("Source and target languages are the same, skipping translation")
-            return text
-        
-        # Ensure translation package is available
-        if not ensure_translation_package(source, target):
-            logger.warning(f"Translation package not available for {source}->{target}, using fallback")
-            # Fallback to simple dictionary for common words
-            return _fallback_translate(text, source, target)
-        
-        # Perform translation using argostranslate
-        translated_text = argostranslate.translate.translate(text, source, target)
-        
-        if translated_text and translated_text.strip():
-            logger.debug(f"Translation successful: '{text[:50]}...' -> '{translated_text[:50]}...'")
-            return translated_text
-        else:
-            logger.warning("Empty translation result, using fallback")
-            return _fallback_translate(text, source, target)
-            
+        translated_text = get_translation(source, target).translate(text)
     except Exception as e:
         logger.error(f"Translation failed: {e}, using fallback")
-        safe_source = locals().get('source', source_lang)
-        safe_target = locals().get('target', target_lang)
-        return _fallback_translate(text, safe_source, safe_target)
+        return None
+    if translated_text and translated_text.strip():
+        logger.debug(f"Translation successful: '{text[:50]}...' -> '{translated_text[:50]}...'")
+        return translated_text
+    logger.warning("Empty translation result, using fallback")
+    return None
+
+
+def _translate_many(texts: List[str], source: str, target: str) -> List[Optional[str]]:
+    if _marian_backend():
+        try:
+            translated = get_marian_model(source, target).translate_batch(texts)
+        except Exception as e:
+            logger.error(f"Marian translation failed: {e}, using fallback")
+            return [None for _ in texts]
+        return [out if out.strip() else None for out in translated]
+    try:
+        translation = get_translation(source, target)
+        package_translation = getattr(translation, "underlying", translation)
+        if not isinstance(package_translation, argostranslate.translate.PackageTranslation):
+            return [_translate_one(text, source, target) for text in texts]
+        translated = _translate_package_batch(package_translation, texts)
+    except Exception as e:
+        logger.error(f"Batched translation failed: {e}, translating segment by segment")
+        return [_translate_one(text, source, target) for text in texts]
+    return [out if out.strip() else None for out in translated]
+
+
+def _translate_package_batch(translation, texts: List[str]) -> List[str]:
+    import ctranslate2
+
+    pkg = translation.pkg
+    if translation.translator is None:
+        translation.translator = ctranslate2.Translator(
+            str(pkg.package_path / "model"),
+            device=argostranslate.settings.device,
+            inter_threads=argostranslate.settings.inter_threads,
+            intra_threads=argostranslate.settings.intra_threads,
+            compute_type=argostranslate.settings.compute_type,
+        )
+    # Segments are usually one sentence already; split further only when the package ships a sentencizer
+    sentencizer = getattr(translation, "sentencizer", None)
+    owners: List[int] = []
+    tokenized = []
+    for i, text in enumerate(texts):
+        if not text.strip():
+            continue
+        for sentence in sentencizer.split_sentences(text) if sentencizer is not None else [text]:
+            owners.append(i)
+            tokenized.append(pkg.tokenizer.encode(sentence))
+    if not tokenized:
+        return ["" for _ in texts]
+    target_prefix = [[pkg.target_prefix]] * len(tokenized) if pkg.target_prefix else None
+    results = translation.translator.translate_batch(
+        tokenized,
+        target_prefix=target_prefix,
+        replace_unknowns=True,
+        max_batch_size=max(1, settings.translation_batch_size),
+        beam_size=max(1, argostranslate.settings.beam_size),
+        num_hypotheses=1,
+        length_penalty=0.2,
+    )
+    tokens: List[list] = [[] for _ in texts]
+    for owner, result in zip(owners, results):
+        tokens[owner].extend(result.hypotheses[0])
+    out = []
+    for text, toks in zip(texts, tokens):
+        value = pkg.tokenizer.decode(toks) if toks else ""
+        if pkg.target_prefix and value.startswith(pkg.target_prefix):
+            value = value[len(pkg.target_prefix):]
+        out.append(value[1:] if value.startswith(" ") else value)
+    return out
+
+
+# === Marian (OPUS-MT through CTranslate2) ========================================================
+
+# ASR segments are mostly one sentence; longer ones are split at sentence ends (no stanza needed)
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_MARIAN: Dict[Tuple[str, str], "MarianModel"] = {}
+
+
+def _marian_backend() -> bool:
+    return settings.translation_backend == "marian"
+
+
+def marian_model_dir(source: str, target: str) -> Path:
+    return settings.marian_models_dir / f"opus-mt-{source}-{target}"
+
+
+def _marian_version(source: str, target: str) -> str:
+    model_bin = marian_model_dir(source, target) / "model.bin"
+    try:
+        stat = model_bin.stat()
+    except OSError:
+        return "marian:missing"
+    return f"marian:{int(stat.st_mtime)}:{stat.st_size}"
+
+
+def _marian_prefixes() -> Dict[Tuple[str, str], str]:
+    """``MARIAN_SOURCE_PREFIXES="en-pt=>>por<<"``: token prepended to the source for multilingual models."""
+    prefixes: Dict[Tuple[str, str], str] = {}
+    for item in settings.marian_source_prefixes.split(","):
+        pair, _, token = item.partition("=")
+        source, _, target = pair.strip().partition("-")
+        if source and target and token.strip():
+            prefixes[(source, target)] = token.strip()
+    return prefixes
+
+
+class MarianModel:
+    """A converted OPUS-MT model: CTranslate2 translator plus its SentencePiece source/target models.
+
+    Expects the layout produced by ``ct2-transformers-converter --quantization int8
+    --copy_files source.spm target.spm`` (``model.bin``, vocabularies, ``source.spm``, ``target.spm``).
+    """
+
+    def __init__(self, model_dir: Path, source_prefix: str | None = None):
+        import ctranslate2
+        import sentencepiece
+
+        self.model_dir = model_dir
+        self.source_prefix = source_prefix
+        self.translator = ctranslate2.Translator(
+            str(model_dir),
+            device=settings.marian_device,
+            compute_type=settings.marian_compute_type,
+            inter_threads=max(1, settings.marian_inter_threads),
+            intra_threads=max(0, settings.marian_intra_threads),
+        )
+        self.source_sp = sentencepiece.SentencePieceProcessor(model_file=str(model_dir / "source.spm"))
+        self.target_sp = sentencepiece.SentencePieceProcessor(model_file=str(model_dir / "target.spm"))
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        owners: List[int] = []
+        tokenized: List[List[str]] = []
+        for i, text in enumerate(texts):
+            if not text.strip():
+                continue
+            for sentence in _SENTENCE_END.split(text.strip()):
+                tokens = self.source_sp.encode(sentence, out_type=str)
+                if self.source_prefix:
+                    tokens = [self.source_prefix] + tokens
+                owners.append(i)
+                tokenized.append(tokens + ["</s>"])
+        if not tokenized:
+            return ["" for _ in texts]
+        results = self.translator.translate_batch(
+            tokenized,
+            max_batch_size=max(1, settings.translation_batch_size),
+            beam_size=max(1, settings.marian_beam_size),
+            num_hypotheses=1,
+            max_decoding_length=256,
+        )
+        sentences: List[List[str]] = [[] for _ in texts]
+        for owner, result in zip(owners, results):
+            sentences[owner].append(self.target_sp.decode(result.hypotheses[0]))
+        return [" ".join(s for s in parts if s) for parts in sentences]
+
+
+def get_marian_model(source: str, target: str) -> MarianModel:
+    """Loaded Marian model for a pair (loaded once per process); LookupError when it is not converted."""
+    pair = (source, target)
+    model = _MARIAN.get(pair)
+    if model is None:
+        model_dir = marian_model_dir(source, target)
+        if not (model_dir / "model.bin").is_file():
+            raise LookupError(f"No Marian model for {source}->{target} in {model_dir}")
+        with _INDEX_LOCK:
+            model = _MARIAN.get(pair)
+            if model is None:
+                model = _MARIAN[pair] = MarianModel(model_dir, _marian_prefixes().get(pair))
+    return model
+
+
+def loaded_marian_models() -> List[str]:
+    return sorted(f"{source}-{target}" for source, target in _MARIAN)
+
+
+# English -> Portuguese dictionary used when no Argos package is available for the pair
+_EN_PT_FALLBACK: Dict[str, str] = {
+    # Greetings and basic phrases
+    "hello": "olá",
+    "hi": "oi",
+    "how are you": "como vai você",
+    "good morning": "bom dia",
+    "good afternoon": "boa tarde",
+    "good evening": "boa noite",
+    "good night": "boa noite",
+    "thank you": "obrigado",
+    "thanks": "obrigado",
+    "yes": "sim",
+    "no": "não",
+    "please": "por favor",
+    "excuse me": "com licença",
+    "sorry": "desculpe",
+    "goodbye": "tchau",
+    "see you": "até logo",
+    "see you later": "até mais tarde",
+    "nice to meet you": "prazer em conhecê-lo",
+
+    # Pronouns and basic verbs
+    "i am": "eu sou",
+    "you are": "você é",
+    "he is": "ele é",
+    "she is": "ela é",
+    "we are": "nós somos",
+    "they are": "eles são",
+    "i have": "eu tenho",
+    "you have": "você tem",
+    "he has": "ele tem",
+    "she has": "ela tem",
+    "we have": "nós temos",
+    "they have": "eles têm",
+    "i": "eu",
+    "you": "você",
+    "he": "ele",
+    "she": "ela",
+    "we": "nós",
+    "they": "eles",
+    "me": "me",
+    "my": "meu",
+    "your": "seu",
+    "his": "dele",
+    "her": "dela",
+    "our": "nosso",
+    "their": "deles",
+
+    # Common verbs
+    "am": "sou",
+    "is": "é",
+    "are": "são",
+    "was": "era",
+    "were": "eram",
+    "be": "ser",
+    "have": "ter",
+    "has": "tem",
+    "had": "tinha",
+    "do": "fazer",
+    "does": "faz",
+    "did": "fez",
+    "will": "vai",
+    "would": "iria",
+    "can": "pode",
+    "could": "poderia",
+    "should": "deveria",
+    "must": "deve",
+    "go": "ir",
+    "come": "vir",
+    "see": "ver",
+    "know": "saber",
+    "think": "pensar",
+    "want": "querer",
+    "need": "precisar",
+    "like": "gostar",
+    "eat": "comer",
+    "drink": "beber",
+    "sleep": "dormir",
+    "study": "estudar",
+    "play": "jogar",
+    "walk": "caminhar",
+    "run": "correr",
+    "speak": "falar",
+    "talk": "conversar",
+    "listen": "escutar",
+    "read": "ler",
+    "write": "escrever",
+    "help": "ajudar",
+    "give": "dar",
+    "take": "pegar",
+    "get": "conseguir",
+    "make": "fazer",
+    "put": "colocar",
+    "find": "encontrar",
+    "look": "olhar",
+    "feel": "sentir",
+    "tell": "contar",
+    "say": "dizer",
+    "ask": "perguntar",
+
+    # Question words
+    "what": "o que",
+    "where": "onde",
+    "why": "por que",
+    "how": "como",
+    "who": "quem",
+    "which": "qual",
+    "whose": "de quem",
+
+    # Time expressions
+    "today": "hoje",
+    "tomorrow": "amanhã",
+    "yesterday": "ontem",
+    "now": "agora",
+    "later": "mais tarde",
+    "always": "sempre",
+    "never": "nunca",
+    "sometimes": "às vezes",
+    "often": "frequentemente",
+    "usually": "geralmente",
+
+    # Place expressions
+    "here": "aqui",
+    "there": "lá",
+    "everywhere": "em todo lugar",
+    "somewhere": "em algum lugar",
+    "nowhere": "em lugar nenhum",
+    "home": "casa",
+    "work": "trabalho",
+    "school": "escola",
+    "hospital": "hospital",
+    "restaurant": "restaurante",
+    "store": "loja",
+    "market": "mercado",
+
+    # Adjectives
+    "good": "bom",
+    "bad": "ruim",
+    "great": "ótimo",
+    "excellent": "excelente",
+    "wonderful": "maravilhoso",
+    "beautiful": "bonito",
+    "ugly": "feio",
+    "nice": "legal",
+    "fine": "bem",
+    "ok": "ok",
+    "okay": "ok",
+    "big": "grande",
+    "small": "pequeno",
+    "large": "grande",
+    "new": "novo",
+    "old": "velho",
+    "young": "jovem",
+    "hot": "quente",
+    "cold": "frio",
+    "warm": "morno",
+    "cool": "fresco",
+    "fast": "rápido",
+    "slow": "lento",
+    "easy": "fácil",
+    "difficult": "difícil",
+    "hard": "difícil",
+    "soft": "macio",
+    "happy": "feliz",
+    "sad": "triste",
+    "angry": "bravo",
+    "tired": "cansado",
+    "hungry": "com fome",
+    "thirsty": "com sede",
+    "sick": "doente",
+    "healthy": "saudável",
+    "rich": "rico",
+    "poor": "pobre",
+    "free": "grátis",
+    "expensive": "caro",
+    "cheap": "barato",
+    "important": "importante",
+    "interesting": "interessante",
+    "boring": "chato",
+    "funny": "engraçado",
+    "serious": "sério",
+    "different": "diferente",
+    "same": "mesmo",
+    "similar": "similar",
+    "correct": "correto",
+    "wrong": "errado",
+    "right": "certo",
+    "left": "esquerda",
+    "true": "verdadeiro",
+    "false": "falso",
+
+    # Numbers
+    "one": "um",
+    "two": "dois",
+    "three": "três",
+    "four": "quatro",
+    "five": "cinco",
+    "six": "seis",
+    "seven": "sete",
+    "eight": "oito",
+    "nine": "nove",
+    "ten": "dez",
+    "first": "primeiro",
+    "third": "terceiro",
+    "last": "último",
+
+    # Common nouns
+    "time": "tempo",
+    "day": "dia",
+    "night": "noite",
+    "morning": "manhã",
+    "afternoon": "tarde",
+    "evening": "noite",
+    "week": "semana",
+    "month": "mês",
+    "year": "ano",
+    "hour": "hora",
+    "minute": "minuto",
+    "second": "segundo",
+    "moment": "momento",
+    "house": "casa",
+    "car": "carro",
+    "food": "comida",
+    "water": "água",
+    "money": "dinheiro",
+    "friend": "amigo",
+    "family": "família",
+    "person": "pessoa",
+    "people": "pessoas",
+    "man": "homem",
+    "woman": "mulher",
+    "child": "criança",
+    "children": "crianças",
+    "boy": "menino",
+    "girl": "menina",
+    "baby": "bebê",
+    "mother": "mãe",
+    "father": "pai",
+    "sister": "irmã",
+    "brother": "irmão",
+    "wife": "esposa",
+    "husband": "marido",
+    "son": "filho",
+    "daughter": "filha",
+    "love": "amor",
+    "life": "vida",
+    "world": "mundo",
+    "country": "país",
+    "city": "cidade",
+    "place": "lugar",
+    "street": "rua",
+    "road": "estrada",
+    "phone": "telefone",
+    "computer": "computador",
+    "book": "livro",
+    "table": "mesa",
+    "chair": "cadeira",
+    "door": "porta",
+    "window": "janela",
+    "room": "quarto",
+    "kitchen": "cozinha",
+    "bathroom": "banheiro",
+    "bed": "cama",
+    "television": "televisão",
+    "tv": "tv",
+    "music": "música",
+    "movie": "filme",
+    "game": "jogo",
+    "sport": "esporte",
+    "dog": "cachorro",
+    "cat": "gato",
+    "animal": "animal",
+    "tree": "árvore",
+    "flower": "flor",
+    "sun": "sol",
+    "moon": "lua",
+    "star": "estrela",
+    "sky": "céu",
+    "rain": "chuva",
+    "snow": "neve",
+    "wind": "vento",
+    "fire": "fogo",
+    "earth": "terra",
+    "air": "ar",
+    "color": "cor",
+    "red": "vermelho",
+    "blue": "azul",
+    "green": "verde",
+    "yellow": "amarelo",
+    "black": "preto",
+    "white": "branco",
+    "problem": "problema",
+    "question": "pergunta",
+    "answer": "resposta",
+    "idea": "ideia",
+    "information": "informação",
+    "news": "notícias",
+    "story": "história",
+    "example": "exemplo",
+    "way": "caminho",
+    "thing": "coisa",
+    "something": "alguma coisa",
+    "nothing": "nada",
+    "everything": "tudo",
+    "anything": "qualquer coisa",
+
+    # Prepositions and connectors
+    "and": "e",
+    "or": "ou",
+    "but": "mas",
+    "because": "porque",
+    "so": "então",
+    "if": "se",
+    "when": "quando",
+    "while": "enquanto",
+    "after": "depois",
+    "before": "antes",
+    "with": "com",
+    "without": "sem",
+    "for": "para",
+    "to": "para",
+    "from": "de",
+    "of": "de",
+    "in": "em",
+    "on": "em",
+    "at": "em",
+    "by": "por",
+    "about": "sobre",
+    "under": "sob",
+    "over": "sobre",
+    "through": "através",
+    "between": "entre",
+    "during": "durante",
+    "until": "até",
+    "since": "desde",
+    "against": "contra",
+    "towards": "em direção a",
+    "within": "dentro de",
+    "outside": "fora",
+    "inside": "dentro",
+    "above": "acima",
+    "below": "abaixo",
+    "near": "perto",
+    "far": "longe",
+    "next": "próximo",
+    "behind": "atrás",
+    "front": "frente",
+    "around": "ao redor",
+
+    # Other common words
+    "very": "muito",
+    "more": "mais",
+    "most": "mais",
+    "less": "menos",
+    "least": "menos",
+    "much": "muito",
+    "many": "muitos",
+    "few": "poucos",
+    "little": "pouco",
+    "all": "todos",
+    "some": "alguns",
+    "any": "qualquer",
+    "each": "cada",
+    "every": "todo",
+    "other": "outro",
+    "another": "outro",
+    "both": "ambos",
+    "either": "qualquer um",
+    "neither": "nem",
+    "only": "apenas",
+    "also": "também",
+    "too": "também",
+    "still": "ainda",
+    "already": "já",
+    "just": "apenas",
+    "even": "mesmo",
+    "maybe": "talvez",
+    "perhaps": "talvez",
+    "probably": "provavelmente",
+    "definitely": "definitivamente",
+    "absolutely": "absolutamente",
+    "exactly": "exatamente",
+    "completely": "completamente",
+    "totally": "totalmente",
+    "quite": "bastante",
+    "rather": "bastante",
+    "pretty": "bem",
+    "enough": "suficiente",
+    "almost": "quase",
+    "nearly": "quase",
+    "especially": "especialmente",
+    "particularly": "particularmente",
+    "really": "realmente",
+    "actually": "na verdade",
+    "finally": "finalmente",
+    "suddenly": "de repente",
+    "quickly": "rapidamente",
+    "slowly": "lentamente",
+    "carefully": "cuidadosamente",
+    "easily": "facilmente",
+    "clearly": "claramente",
+    "certainly": "certamente",
+    "obviously": "obviamente",
+}
+
+# Dictionaries available to ``_fallback_translate``, by (source, target) pair
+_FALLBACK_DICTIONARIES: Dict[Tuple[str, str], Dict[str, str]] = {("en", "pt"): _EN_PT_FALLBACK}
+
+
+@functools.lru_cache(maxsize=None)
+def _fallback_matcher(source_lang: str, target_lang: str) -> Optional[Tuple["re.Pattern[str]", Dict[str, str]]]:
+    """One compiled alternation per pair (built on first use), longest phrases first.
+
+    Alternation order makes the regex prefer the longest phrase starting at each position, so a
+    single left-to-right ``sub`` replaces what the old per-word loop did, without re-translating
+    words that an earlier replacement produced.
+    """
+    table = _FALLBACK_DICTIONARIES.get((source_lang, target_lang))
+    if not table:
+        return None
+    keys = sorted(table, key=len, reverse=True)
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keys) + r")\b", re.IGNORECASE)
+    return pattern, table
 
 
 def _fallback_translate(text: str, source_lang: str, target_lang: str) -> str:
     """Fallback translation using simple dictionary."""
-    if source_lang == "en" and target_lang == "pt":
-        # Comprehensive English to Portuguese dictionary
-        simple_translations = {
-            # Greetings and basic phrases
-            "hello": "olá",
-            "hi": "oi", 
-            "how are you": "como vai você",
-            "good morning": "bom dia",
-            "good afternoon": "boa tarde", 
-            "good evening": "boa noite",
-            "good night": "boa noite",
-            "thank you": "obrigado",
-            "thanks": "obrigado",
-            "yes": "sim",
-            "no": "não",
-            "please": "por favor",
-            "excuse me": "com licença",
-            "sorry": "desculpe",
-            "goodbye": "tchau",
-            "see you": "até logo",
-            "see you later": "até mais tarde",
-            "nice to meet you": "prazer em conhecê-lo",
-            
-            # Pronouns and basic verbs
-            "i am": "eu sou",
-            "you are": "você é",
-            "he is": "ele é",
-            "she is": "ela é",
-            "we are": "nós somos",
-            "they are": "eles são",
-            "i have": "eu tenho",
-            "you have": "você tem",
-            "he has": "ele tem",
-            "she has": "ela tem",
-            "we have": "nós temos",
-            "they have": "eles têm",
-            "i": "eu",
-            "you": "você",
-            "he": "ele",
-            "she": "ela",
-            "we": "nós",
-            "they": "eles",
-            "me": "me",
-            "my": "meu",
-            "your": "seu",
-            "his": "dele",
-            "her": "dela",
-            "our": "nosso",
-            "their": "deles",
-            
-            # Common verbs
-            "am": "sou",
-            "is": "é",
-            "are": "são",
-            "was": "era",
-            "were": "eram",
-            "be": "ser",
-            "have": "ter",
-            "has": "tem",
-            "had": "tinha",
-            "do": "fazer",
-            "does": "faz",
-            "did": "fez",
-            "will": "vai",
-            "would": "iria",
-            "can": "pode",
-            "could": "poderia",
-            "should": "deveria",
-            "must": "deve",
-            "go": "ir",
-            "come": "vir",
-            "see": "ver",
-            "know": "saber",
-            "think": "pensar",
-            "want": "querer",
-            "need": "precisar",
-            "like": "gostar",
-            "love": "amar",
-            "eat": "comer",
-            "drink": "beber",
-            "sleep": "dormir",
-            "work": "trabalhar",
-            "study": "estudar",
-            "play": "jogar",
-            "walk": "caminhar",
-            "run": "correr",
-            "speak": "falar",
-            "talk": "conversar",
-            "listen": "escutar",
-            "read": "ler",
-            "write": "escrever",
-            "help": "ajudar",
-            "give": "dar",
-            "take": "pegar",
-            "get": "conseguir",
-            "make": "fazer",
-            "put": "colocar",
-            "find": "encontrar",
-            "look": "olhar",
-            "feel": "sentir",
-            "tell": "contar",
-            "say": "dizer",
-            "ask": "perguntar",
-            "answer": "responder",
-            
-            # Question words
-            "what": "o que",
-            "where": "onde",
-            "when": "quando",
-            "why": "por que",
-            "how": "como",
-            "who": "quem",
-            "which": "qual",
-            "whose": "de quem",
-            
-            # Time expressions
-            "today": "hoje",
-            "tomorrow": "amanhã",
-            "yesterday": "ontem",
-            "now": "agora",
-            "later": "mais tarde",
-            "before": "antes",
-            "after": "depois",
-            "always": "sempre",
-            "never": "nunca",
-            "sometimes": "às vezes",
-            "often": "frequentemente",
-            "usually": "geralmente",
-            
-            # Place expressions
-            "here": "aqui",
-            "there": "lá",
-            "everywhere": "em todo lugar",
-            "somewhere": "em algum lugar",
-            "nowhere": "em lugar nenhum",
-            "home": "casa",
-            "work": "trabalho",
-            "school": "escola",
-            "hospital": "hospital",
-            "restaurant": "restaurante",
-            "store": "loja",
-            "market": "mercado",
-            
-            # Adjectives
-            "good": "bom",
-            "bad": "ruim",
-            "great": "ótimo",
-            "excellent": "excelente",
-            "wonderful": "maravilhoso",
-            "beautiful": "bonito",
-            "ugly": "feio",
-            "nice": "legal",
-            "fine": "bem",
-            "ok": "ok",
-            "okay": "ok",
-            "big": "grande",
-            "small": "pequeno",
-            "large": "grande",
-            "little": "pequeno",
-            "new": "novo",
-            "old": "velho",
-            "young": "jovem",
-            "hot": "quente",
-            "cold": "frio",
-            "warm": "morno",
-            "cool": "fresco",
-            "fast": "rápido",
-            "slow": "lento",
-            "easy": "fácil",
-            "difficult": "difícil",
-            "hard": "difícil",
-            "soft": "macio",
-            "happy": "feliz",
-            "sad": "triste",
-            "angry": "bravo",
-            "tired": "cansado",
-            "hungry": "com fome",
-            "thirsty": "com sede",
-            "sick": "doente",
-            "healthy": "saudável",
-            "rich": "rico",
-            "poor": "pobre",
-            "free": "grátis",
-            "expensive": "caro",
-            "cheap": "barato",
-            "important": "importante",
-            "interesting": "interessante",
-            "boring": "chato",
-            "funny": "engraçado",
-            "serious": "sério",
-            "different": "diferente",
-            "same": "mesmo",
-            "similar": "similar",
-            "correct": "correto",
-            "wrong": "errado",
-            "right": "certo",
-            "left": "esquerda",
-            "true": "verdadeiro",
-            "false": "falso",
-            
-            # Numbers
-            "one": "um",
-            "two": "dois",
-            "three": "três",
-            "four": "quatro",
-            "five": "cinco",
-            "six": "seis",
-            "seven": "sete",
-            "eight": "oito",
-            "nine": "nove",
-            "ten": "dez",
-            "first": "primeiro",
-            "second": "segundo",
-            "third": "terceiro",
-            "last": "último",
-            
-            # Common nouns
-            "time": "tempo",
-            "day": "dia",
-            "night": "noite",
-            "morning": "manhã",
-            "afternoon": "tarde",
-            "evening": "noite",
-            "week": "semana",
-            "month": "mês",
-            "year": "ano",
-            "hour": "hora",
-            "minute": "minuto",
-            "second": "segundo",
-            "moment": "momento",
-            "house": "casa",
-            "car": "carro",
-            "food": "comida",
-            "water": "água",
-            "money": "dinheiro",
-            "friend": "amigo",
-            "family": "família",
-            "person": "pessoa",
-            "people": "pessoas",
-            "man": "homem",
-            "woman": "mulher",
-            "child": "criança",
-            "children": "crianças",
-            "boy": "menino",
-            "girl": "menina",
-            "baby": "bebê",
-            "mother": "mãe",
-            "father": "pai",
-            "sister": "irmã",
-            "brother": "irmão",
-            "wife": "esposa",
-            "husband": "marido",
-            "son": "filho",
-            "daughter": "filha",
-            "love": "amor",
-            "life": "vida",
-            "world": "mundo",
-            "country": "país",
-            "city": "cidade",
-            "place": "lugar",
-            "street": "rua",
-            "road": "estrada",
-            "phone": "telefone",
-            "computer": "computador",
-            "book": "livro",
-            "table": "mesa",
-            "chair": "cadeira",
-            "door": "porta",
-            "window": "janela",
-            "room": "quarto",
-            "kitchen": "cozinha",
-            "bathroom": "banheiro",
-            "bed": "cama",
-            "television": "televisão",
-            "tv": "tv",
-            "music": "música",
-            "movie": "filme",
-            "game": "jogo",
-            "sport": "esporte",
-            "dog": "cachorro",
-            "cat": "gato",
-            "animal": "animal",
-            "tree": "árvore",
-            "flower": "flor",
-            "sun": "sol",
-            "moon": "lua",
-            "star": "estrela",
-            "sky": "céu",
-            "rain": "chuva",
-            "snow": "neve",
-            "wind": "vento",
-            "fire": "fogo",
-            "earth": "terra",
-            "air": "ar",
-            "color": "cor",
-            "red": "vermelho",
-            "blue": "azul",
-            "green": "verde",
-            "yellow": "amarelo",
-            "black": "preto",
-            "white": "branco",
-            "problem": "problema",
-            "question": "pergunta",
-            "answer": "resposta",
-            "idea": "ideia",
-            "information": "informação",
-            "news": "notícias",
-            "story": "história",
-            "example": "exemplo",
-            "way": "caminho",
-            "thing": "coisa",
-            "something": "alguma coisa",
-            "nothing": "nada",
-            "everything": "tudo",
-            "anything": "qualquer coisa",
-            
-            # Prepositions and connectors
-            "and": "e",
-            "or": "ou",
-            "but": "mas",
-            "because": "porque",
-            "so": "então",
-            "if": "se",
-            "when": "quando",
-            "while": "enquanto",
-            "after": "depois",
-            "before": "antes",
-            "with": "com",
-            "without": "sem",
-            "for": "para",
-            "to": "para",
-            "from": "de",
-            "of": "de",
-            "in": "em",
-            "on": "em",
-            "at": "em",
-            "by": "por",
-            "about": "sobre",
-            "under": "sob",
-            "over": "sobre",
-            "through": "através",
-            "between": "entre",
-            "during": "durante",
-            "until": "até",
-            "since": "desde",
-            "against": "contra",
-            "towards": "em direção a",
-            "within": "dentro de",
-            "outside": "fora",
-            "inside": "dentro",
-            "above": "acima",
-            "below": "abaixo",
-            "near": "perto",
-            "far": "longe",
-            "next": "próximo",
-            "behind": "atrás",
-            "front": "frente",
-            "around": "ao redor",
-            
-            # Other common words
-            "very": "muito",
-            "more": "mais",
-            "most": "mais",
-            "less": "menos",
-            "least": "menos",
-            "much": "muito",
-            "many": "muitos",
-            "few": "poucos",
-            "little": "pouco",
-            "all": "todos",
-            "some": "alguns",
-            "any": "qualquer",
-            "each": "cada",
-            "every": "todo",
-            "other": "outro",
-            "another": "outro",
-            "both": "ambos",
-            "either": "qualquer um",
-            "neither": "nem",
-            "only": "apenas",
-            "also": "também",
-            "too": "também",
-            "still": "ainda",
-            "already": "já",
-            "just": "apenas",
-            "even": "mesmo",
-            "maybe": "talvez",
-            "perhaps": "talvez",
-            "probably": "provavelmente",
-            "certainly": "certamente",
-            "definitely": "definitivamente",
-            "absolutely": "absolutamente",
-            "exactly": "exatamente",
-            "completely": "completamente",
-            "totally": "totalmente",
-            "quite": "bastante",
-            "rather": "bastante",
-            "pretty": "bem",
-            "enough": "suficiente",
-            "almost": "quase",
-            "nearly": "quase",
-            "especially": "especialmente",
-            "particularly": "particularmente",
-            "really": "realmente",
-            "actually": "na verdade",
-            "finally": "finalmente",
-            "suddenly": "de repente",
-            "quickly": "rapidamente",
-            "slowly": "lentamente",
-            "carefully": "cuidadosamente",
-            "easily": "facilmente",
-            "clearly": "claramente",
-            "certainly": "certamente",
-            "obviously": "obviamente",
-        }
-        
-        text_lower = text.lower()
-        translated = text
-        
-        # Replace known words/phrases (order matters - longer phrases first)
-        sorted_translations = sorted(simple_translations.items(), key=lambda x: len(x[0]), reverse=True)
-        
-        for en_word, pt_word in sorted_translations:
-            if en_word in text_lower:
-                # Case-insensitive replacement maintaining original case
-                import re
-                pattern = r'\b' + re.escape(en_word) + r'\b'
-                translated = re.sub(pattern, pt_word, translated, flags=re.IGNORECASE)
-        
-        return translated
-    
-    # If no fallback available, return original
-    return text
+    matcher = _fallback_matcher(source_lang, target_lang)
+    if matcher is None:
+        # If no fallback available, return original
+        return text
+    pattern, table = matcher
+    return pattern.sub(lambda m: table[m.group(0).lower()], text)
 
 
 def initialize_translation_service() -> None:
     """Initialize translation service by updating package index."""
     try:
+        if _marian_backend():
+            # Load every converted pair now; Argos packages are neither needed nor downloaded
+            for model_dir in sorted(settings.marian_models_dir.glob("opus-mt-*")):
+                source, _, target = model_dir.name[len("opus-mt-"):].partition("-")
+                if not source or not target or "-" in target:
+                    continue
+                try:
+                    get_marian_model(source, target)
+                except Exception as e:
+                    logger.warning(f"Could not load Marian model {model_dir.name}: {e}")
+            logger.info(f"Translation service initialized (backend=marian, models={loaded_marian_models()})")
+            return
+
         logger.info("Initializing argostranslate translation service...")
 
         # 1. Instalar pacotes locais se existirem (offline friendly)
@@ -563,7 +884,7 @@ def initialize_translation_service() -> None:
             for model_file in pkg_dir.glob("*.argosmodel"):
                 try:
                     logger.info(f"Installing local Argos package: {model_file.name}")
-                    argostranslate.package.install_from_path(model_file)
+                    install_package(model_file)
                 except Exception as e:
                     logger.warning(f"Failed to install local package {model_file.name}: {e}")
 
@@ -578,6 +899,13 @@ def initialize_translation_service() -> None:
         for from_lang, to_lang in common_pairs:
             ensure_translation_package(from_lang, to_lang)
 
+        # 3. Resolve every installed pair now so the first job only pays a dict lookup
+        for from_lang, to_lang in list(_installed_index()):
+            try:
+                get_translation(from_lang, to_lang)
+            except Exception as e:
+                logger.warning(f"Could not load translation {from_lang}->{to_lang}: {e}")
+
         logger.info("Translation service initialized (offline_only=%s)" % _OFFLINE_ONLY)
             
     except Exception as e:
@@ -0,0 +1,141 @@
+"""Two-tier translation memory for repeated segments.
+
+Intros, outros and disclaimers recur across the catalogue; their
+translations are looked up by normalized source text, language pair,
+backend and package version — first in an in-process LRU, then in a
+persistent SQLite table (``data/cache/translation_memory.sqlite3``) shared
+by every process. Only neural translations are stored, never the dictionary
+fallback, and a package upgrade changes the key so stale entries are simply
+never hit again.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from ..config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY,
+    src TEXT NOT NULL,
+    dst TEXT NOT NULL,
+    version TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+
+def normalize(text: str) -> str:
+    """NFC + collapsed whitespace: ASR emits the same phrase with varying spacing."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def memory_key(text: str, src: str, dst: str, version: str) -> str:
+    params = {"text": normalize(text), "src": src, "dst": dst, "backend": settings.translation_backend, "version": version}
+    return hashlib.sha256(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    # COUNT(*) walks the whole table; /api/status reuses the last count for this long
+    COUNT_TTL_S = 60.0
+
+    def __init__(self, db_path: Path, max_entries: int):
+        self.db_path = Path(db_path)
+        self.max_entries = max(0, max_entries)
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._schema_ready = False
+        self._count: tuple[float, int] | None = None  # (monotonic time, rows)
+
+    def _conn(self) -> sqlite3.Connection:
+        # Same per-thread/per-process connection rule as the job store
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _remember(self, key: str, target: str) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._lru[key] = target
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Translations found for ``keys`` (LRU first, then one SQLite query for the rest)."""
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+                else:
+                    missing.append(key)
+        for i in range(0, len(missing), 500):  # stay under SQLite's bound-parameter limit
+            chunk = missing[i : i + 500]
+            rows = self._conn().execute(
+                f"SELECT key, target FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for key, target in rows:
+                found[key] = target
+                self._remember(key, target)
+        return found
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: Iterable[tuple[str, str, str, str, str, str]]) -> None:
+        """Store ``(key, src, dst, version, source_text, target_text)`` rows."""
+        rows = [(key, src, dst, version, normalize(source), target, time.time()) for key, src, dst, version, source, target in entries]
+        if not rows:
+            return
+        self._conn().executemany(
+            "INSERT OR REPLACE INTO translations (key, src, dst, version, source, target, created) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        for key, *_rest, target, _created in rows:
+            self._remember(key, target)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            cached = len(self._lru)
+            count = self._count
+        if count is None or time.monotonic() - count[0] >= self.COUNT_TTL_S:
+            count = (time.monotonic(), self._conn().execute("SELECT COUNT(*) FROM translations").fetchone()[0])
+            with self._lock:
+                self._count = count
+        return {"entries": count[1], "lru_entries": cached, "lru_max_entries": self.max_entries}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._count = None
+        self._conn().execute("DELETE FROM translations")
+
+
+TRANSLATION_MEMORY = TranslationMemory(
+    settings.cache_dir / "translation_memory.sqlite3", settings.translation_memory_lru_entries
+)
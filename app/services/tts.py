@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Dict
 import numpy as np
 import soundfile as sf
 import tempfile
 import io
 import os
+import signal
 import logging
+import multiprocessing as mp
+import threading
+import time
 
 from ..config import settings
+from .job_store import JOB_STORE
+from .tts_cache import load_phrase, phrase_cache_key, store_phrase
 from .voice_clone import (
     synthesize_segments_voice_clone as vc_clone,
     is_openvoice_ready,
@@ -47,162 +58,480 @@ VOICE_CONFIG = {
     }
 }
 
+# A failed pyttsx3.init() (e.g. no espeak installed) is retried at most this often, not per segment
+_ENGINE_RETRY_S = 60.0
+
+
+def _pick_voice(available_voices, language: str):
+    """Melhor voz instalada para o idioma: preferidas, depois pistas no nome/ID, depois fallbacks."""
+    # Obter configurações para o idioma
+    config = VOICE_CONFIG.get(language, VOICE_CONFIG['en'])
+    preferred_voices = config.get('preferred_voices', [])
+
+    # Primeiro, tentar encontrar uma voz preferida
+    for voice in available_voices:
+        for preferred in preferred_voices:
+            if preferred.lower() in voice.id.lower():
+                logger.info(f"Voz preferida encontrada para {language}: {voice.name} ({voice.id})")
+                return voice
+
+    # Se não encontrar voz preferida, procurar por idioma no nome ou ID
+    for voice in available_voices:
+        voice_info = f"{voice.name} {voice.id}".lower()
+        if language == 'pt' and ('port' in voice_info or 'brazil' in voice_info or 'br' in voice_info):
+            logger.info(f"Voz portuguesa encontrada: {voice.name} ({voice.id})")
+            return voice
+        elif language == 'en' and ('english' in voice_info or 'us' in voice_info or 'uk' in voice_info):
+            logger.info(f"Voz inglesa encontrada: {voice.name} ({voice.id})")
+            return voice
+        elif language == 'es' and ('spanish' in voice_info or 'esp' in voice_info):
+            logger.info(f"Voz espanhola encontrada: {voice.name} ({voice.id})")
+            return voice
+
+    # Fallback: usar a primeira voz feminina disponível
+    for voice in available_voices:
+        if any(name in voice.name.lower() for name in ['female', 'woman', 'samantha', 'alex', 'luciana']):
+            logger.info(f"Usando voz fallback: {voice.name} ({voice.id})")
+            return voice
+
+    # Último recurso: primeira voz disponível
+    logger.info(f"Usando primeira voz disponível: {available_voices[0].name}")
+    return available_voices[0]
+
+
+class TTSEngineService:
+    """Long-lived pyttsx3 engine shared by every segment and job in this process.
+
+    The driver is created once and only re-created after it fails; pyttsx3 is not thread-safe,
+    so it is used under a lock. The best voice per language is resolved once from the installed
+    voice list (``refresh()`` re-scans it), and voice/rate/volume are only pushed to the driver
+    when the language changes between segments.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._engine = None
+        self._failed_at: float | None = None
+        self._installed: list | None = None
+        self._voices: Dict[str, Any] = {}
+        self._applied: tuple | None = None
+        self.inits = 0
+
+    def _get_engine(self):
+        if self._engine is None:
+            if self._failed_at is not None and time.monotonic() - self._failed_at < _ENGINE_RETRY_S:
+                raise RuntimeError("pyttsx3 engine unavailable (init failed recently)")
+            import pyttsx3
+            try:
+                self._engine = pyttsx3.init()
+            except Exception:
+                self._failed_at = time.monotonic()
+                raise
+            self._failed_at = None
+            self._applied = None
+            self.inits += 1
+        return self._engine
+
+    def voice_for(self, language: str):
+        """Best installed voice for ``language`` (resolved once, then cached), or None."""
+        with self._lock:
+            if language not in self._voices:
+                if self._installed is None:
+                    self._installed = list(self._get_engine().getProperty('voices') or [])
+                    if not self._installed:
+                        logger.warning("Nenhuma voz encontrada no sistema")
+                self._voices[language] = _pick_voice(self._installed, language) if self._installed else None
+            return self._voices[language]
+
+    def refresh(self) -> None:
+        """Forget resolved voices (e.g. after installing new system voices)."""
+        with self._lock:
+            self._installed = None
+            self._voices.clear()
+            self._applied = None
+
+    def reset(self) -> None:
+        """Drop the engine so the next segment creates a fresh driver."""
+        with self._lock:
+            self._engine = None
+            self._applied = None
+
+    @contextmanager
+    def session(self, language: str):
+        """The engine configured for ``language``, held exclusively for the duration of the block."""
+        with self._lock:
+            engine = self._get_engine()
+            config = VOICE_CONFIG.get(language, VOICE_CONFIG['pt'])
+            voice = self.voice_for(language)
+            wanted = (getattr(voice, 'id', None), config['rate'], config['volume'])
+            if wanted != self._applied:
+                if voice is not None:
+                    engine.setProperty('voice', voice.id)
+                engine.setProperty('rate', config['rate'])
+                engine.setProperty('volume', config['volume'])
+                self._applied = wanted
+                logger.info(f"TTS configurado para {language}: rate={config['rate']}, volume={config['volume']}")
+            try:
+                yield engine
+            except Exception:
+                self.reset()
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "engine_ready": self._engine is not None,
+                "engine_inits": self.inits,
+                "voices": {lang: getattr(voice, 'id', None) for lang, voice in self._voices.items()},
+            }
+
+
+TTS_ENGINE = TTSEngineService()
+
+
 def get_best_voice_for_language(language: str = 'pt'):
-    """Encontra a melhor voz disponível para o idioma especificado."""
+    """Encontra a melhor voz disponível para o idioma especificado (cache por processo)."""
     try:
-        import pyttsx3
-        engine = pyttsx3.init()
-        available_voices = engine.getProperty('voices')
-        
-        if not available_voices:
-            logger.warning("Nenhuma voz encontrada no sistema")
-            return None
-        
-        # Obter configurações para o idioma
-        config = VOICE_CONFIG.get(language, VOICE_CONFIG['en'])
-        preferred_voices = config.get('preferred_voices', [])
-        
-        # Primeiro, tentar encontrar uma voz preferida
-        for voice in available_voices:
-            for preferred in preferred_voices:
-                if preferred.lower() in voice.id.lower():
-                    logger.info(f"Voz preferida encontrada para {language}: {voice.name} ({voice.id})")
-                    return voice
-        
-        # Se não encontrar voz preferida, procurar por idioma no nome ou ID
-        for voice in available_voices:
-            voice_info = f"{voice.name} {voice.id}".lower()
-            if language == 'pt' and ('port' in voice_info or 'brazil' in voice_info or 'br' in voice_info):
-                logger.info(f"Voz portuguesa encontrada: {voice.name} ({voice.id})")
-                return voice
-            elif language == 'en' and ('english' in voice_info or 'us' in voice_info or 'uk' in voice_info):
-                logger.info(f"Voz inglesa encontrada: {voice.name} ({voice.id})")
-                return voice
-            elif language == 'es' and ('spanish' in voice_info or 'esp' in voice_info):
-                logger.info(f"Voz espanhola encontrada: {voice.name} ({voice.id})")
-                return voice
-        
-        # Fallback: usar a primeira voz feminina disponível
-        for voice in available_voices:
-            if any(name in voice.name.lower() for name in ['female', 'woman', 'samantha', 'alex', 'luciana']):
-                logger.info(f"Usando voz fallback: {voice.name} ({voice.id})")
-                return voice
-        
-        # Último recurso: primeira voz disponível
-        logger.info(f"Usando primeira voz disponível: {available_voices[0].name}")
-        return available_voices[0]
-        
+        return TTS_ENGINE.voice_for(language)
     except Exception as e:
         logger.error(f"Erro ao buscar vozes: {e}")
         return None
 
 
+def _read_rendered(path: str, sr: int) -> np.ndarray | None:
+    """Load a file written by the engine as normalized float32 mono at ``sr`` (None if empty)."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    data, orig_sr = sf.read(path)
+
+    # Converter para mono se necessário
+    if len(data.shape) > 1:
+        data = data.mean(axis=1)
+
+    # Resample se necessário
+    if orig_sr != sr:
+        import scipy.signal
+        data = scipy.signal.resample(data, int(len(data) * sr / orig_sr))
+
+    # Normalizar volume e aplicar compressão suave
+    if np.max(np.abs(data)) > 0:
+        # Normalizar
+        data = data / np.max(np.abs(data))
+
+        # Aplicar compressão suave para tornar o áudio mais consistente
+        data = np.tanh(data * 1.2) * 0.8
+    return data.astype(np.float32)
+
+
+def _tone_fallback(text: str, sr: int, duration_per_char: float = 0.05) -> np.ndarray:
+    # Fallback: gera um tom senoidal breve por caractere (placeholder)
+    duration = max(0.3, min(5.0, len(text) * duration_per_char))
+    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+    freq = 220.0
+    audio = 0.1 * np.sin(2 * np.pi * freq * t).astype(np.float32)
+    logger.warning(f"Usando fallback de tom para '{text[:30]}...'")
+    return audio
+
+
+def _cached_phrases(texts: list[str], indices: list[int], language: str, sr: int) -> tuple[Dict[int, str], Dict[int, np.ndarray]]:
+    """Phrase-cache keys and hits for ``texts[i]`` (``i`` in ``indices``), keyed with this process's voice."""
+    keys: Dict[int, str] = {}
+    found: Dict[int, np.ndarray] = {}
+    if not settings.tts_cache_enabled or not indices:
+        return keys, found
+    try:
+        voice_id = getattr(TTS_ENGINE.voice_for(language), 'id', None)
+    except Exception:
+        return keys, found  # engine unavailable: rendering logs it and falls back to the tone
+    config = VOICE_CONFIG.get(language, VOICE_CONFIG['pt'])
+    try:
+        for i in indices:
+            keys[i] = phrase_cache_key(texts[i], language, voice_id, config['rate'], config['volume'], sr)
+            audio = load_phrase(keys[i])
+            if audio is not None:
+                found[i] = audio
+    except Exception as e:
+        logger.warning(f"Cache de TTS indisponível: {e}")
+        return {}, {}
+    if found:
+        JOB_STORE.incr_metric("tts_cache_hit", len(found))
+    if len(keys) > len(found):
+        JOB_STORE.incr_metric("tts_cache_miss", len(keys) - len(found))
+    return keys, found
+
+
 def synthesize_segment(text: str, language: str = 'pt', sr: int = 16000, duration_per_char: float = 0.05) -> np.ndarray:
     """Sintetiza um segmento de texto usando TTS real (pyttsx3) ou fallback."""
-    
+
     if not text.strip():
         # Sem texto, retorna silêncio curto
         return np.zeros(int(sr * 0.5), dtype=np.float32)
-    
+
+    # Frases repetidas saem do cache em disco em vez de passar pelo engine
+    keys, found = _cached_phrases([text], [0], language, sr)
+    if found:
+        return found[0]
+    return _render_one(text, language, sr, duration_per_char, key=keys.get(0))
+
+
+def _render_one(text: str, language: str, sr: int, duration_per_char: float = 0.05, key: str | None = None) -> np.ndarray:
     try:
-        # Tentar TTS real com pyttsx3
-        import pyttsx3
-        
-        # Criar engine TTS
-        engine = pyttsx3.init()
-        
-        # Obter configurações para o idioma
-        config = VOICE_CONFIG.get(language, VOICE_CONFIG['pt'])
-        
-        # Configurar voz específica para o idioma
-        best_voice = get_best_voice_for_language(language)
-        if best_voice:
-            engine.setProperty('voice', best_voice.id)
-        
-        # Configurar velocidade (palavras por minuto) baseada no idioma
-        engine.setProperty('rate', config['rate'])
-        
-        # Configurar volume baseado no idioma
-        engine.setProperty('volume', config['volume'])
-        
-        logger.info(f"TTS configurado para {language}: rate={config['rate']}, volume={config['volume']}")
-        logger.info(f"Sintetizando: '{text[:100]}{'...' if len(text) > 100 else ''}'")
-        
-        # Criar arquivo temporário para o áudio
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-        
-        try:
-            # Salvar TTS no arquivo temporário
-            engine.save_to_file(text, tmp_path)
-            engine.runAndWait()
-            
-            # Ler o arquivo gerado
-            if os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
-                data, orig_sr = sf.read(tmp_path)
-                
-                # Converter para mono se necessário
-                if len(data.shape) > 1:
-                    data = data.mean(axis=1)
-                
-                # Resample se necessário
-                if orig_sr != sr:
-                    import scipy.signal
-                    data = scipy.signal.resample(data, int(len(data) * sr / orig_sr))
-                
-                # Normalizar volume e aplicar compressão suave
-                if np.max(np.abs(data)) > 0:
-                    # Normalizar
-                    data = data / np.max(np.abs(data))
-                    
-                    # Aplicar compressão suave para tornar o áudio mais consistente
-                    data = np.tanh(data * 1.2) * 0.8
-                
-                logger.info(f"TTS bem-sucedido: {len(data)/sr:.2f}s de áudio gerado")
-                return data.astype(np.float32)
-            else:
+        # Engine de longa duração, já configurado para o idioma (voz/rate/volume)
+        with TTS_ENGINE.session(language) as engine:
+            logger.info(f"Sintetizando: '{text[:100]}{'...' if len(text) > 100 else ''}'")
+
+            # Criar arquivo temporário para o áudio
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
+                tmp_path = tmp_file.name
+
+            try:
+                # Salvar TTS no arquivo temporário
+                engine.save_to_file(text, tmp_path)
+                engine.runAndWait()
+
+                data = _read_rendered(tmp_path, sr)
+                if data is not None:
+                    logger.info(f"TTS bem-sucedido: {len(data)/sr:.2f}s de áudio gerado")
+                    if key is not None:
+                        store_phrase(key, data, sr)
+                    return data
                 logger.warning("Arquivo TTS vazio ou não encontrado")
-            
-        finally:
-            # Limpar arquivo temporário
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-        
+
+            finally:
+                # Limpar arquivo temporário
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+
     except Exception as e:
         logger.error(f"Erro no pyttsx3: {e}, usando fallback")
-    
-    # Fallback: gera um tom senoidal breve por caractere (placeholder)
-    duration = max(0.3, min(5.0, len(text) * duration_per_char))
-    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-    freq = 220.0
-    audio = 0.1 * np.sin(2 * np.pi * freq * t).astype(np.float32)
-    logger.warning(f"Usando fallback de tom para '{text[:30]}...'")
-    return audio
+
+    return _tone_fallback(text, sr, duration_per_char)
+
+
+def synthesize_batch(texts: list[str], language: str = 'pt', sr: int = 16000) -> list[np.ndarray]:
+    """Render many texts (in worker processes when ``TTS_PROCESSES`` > 0); results align with ``texts``."""
+    if settings.tts_processes > 0 and texts:
+        return _render_pooled(texts, language, sr)
+    return _render_local(texts, language, sr)
+
+
+def _render_local(texts: list[str], language: str = 'pt', sr: int = 16000) -> list[np.ndarray]:
+    """Render many texts with this process's engine in as few runs as possible.
+
+    Up to ``TTS_BATCH_SIZE`` utterances are queued with ``save_to_file`` into one temporary
+    directory and rendered by a single ``runAndWait``, so the fixed per-run cost is paid once per
+    batch instead of once per segment. A failed batch, or a segment whose file came back empty,
+    is re-rendered on its own (falling back to the tone). Repeated phrases are rendered once per
+    call and phrases already in the disk cache are not rendered at all.
+    """
+    results: list[np.ndarray | None] = [
+        None if text.strip() else np.zeros(int(sr * 0.5), dtype=np.float32) for text in texts
+    ]
+    first: Dict[str, int] = {}
+    for i, text in enumerate(texts):
+        if text.strip():
+            first.setdefault(" ".join(text.split()), i)
+    keys, found = _cached_phrases(texts, sorted(first.values()), language, sr)
+    for i, audio in found.items():
+        results[i] = audio
+    pending = [i for i in sorted(first.values()) if i not in found]
+    size = max(1, settings.tts_batch_size)
+    for start in range(0, len(pending), size):
+        chunk = pending[start:start + size]
+        try:
+            with TTS_ENGINE.session(language) as engine, tempfile.TemporaryDirectory(prefix="tts_batch_") as tmp_dir:
+                paths = {i: os.path.join(tmp_dir, f"seg_{i:05d}.wav") for i in chunk}
+                for i in chunk:
+                    engine.save_to_file(texts[i], paths[i])
+                engine.runAndWait()
+                for i in chunk:
+                    results[i] = _read_rendered(paths[i], sr)
+                    if results[i] is not None and i in keys:
+                        store_phrase(keys[i], results[i], sr)
+        except Exception as e:
+            logger.error(f"Erro no lote pyttsx3 ({len(chunk)} segmentos): {e}, sintetizando um a um")
+        for i in chunk:
+            if results[i] is None:
+                results[i] = _render_one(texts[i], language, sr, key=keys.get(i))
+    for i, text in enumerate(texts):
+        if results[i] is None:
+            results[i] = results[first[" ".join(text.split())]]
+    return results
+
+
+# === Process-pool rendering ======================================================================
+
+_TTS_POOL: ProcessPoolExecutor | None = None
+_TTS_WORKER_PIDS: Any = None  # SimpleQueue on which the current pool's workers announce their pid
+_TTS_POOL_LOCK = threading.Lock()
+_TTS_SLOTS: tuple[int, threading.BoundedSemaphore] | None = None
+
+
+def _announce_tts_worker(pids: Any) -> None:
+    pids.put(os.getpid())
+
+
+def _tts_pool() -> ProcessPoolExecutor:
+    global _TTS_POOL, _TTS_WORKER_PIDS
+    with _TTS_POOL_LOCK:
+        if _TTS_POOL is None:
+            # spawn: every worker builds its own engine; no driver state is inherited from the parent
+            ctx = mp.get_context("spawn")
+            _TTS_WORKER_PIDS = ctx.SimpleQueue()
+            _TTS_POOL = ProcessPoolExecutor(
+                max_workers=max(1, settings.tts_processes),
+                mp_context=ctx,
+                initializer=_announce_tts_worker,
+                initargs=(_TTS_WORKER_PIDS,),
+            )
+        return _TTS_POOL
+
+
+def _tts_slots() -> threading.BoundedSemaphore:
+    """Process-wide cap of batches in flight (one per worker), shared by every job and fan-out thread.
+
+    Holding a slot means a worker is free the moment the batch is submitted, so its timeout measures
+    rendering only, never time spent queued behind another job's batches.
+    """
+    global _TTS_SLOTS
+    size = max(1, settings.tts_processes)
+    with _TTS_POOL_LOCK:
+        if _TTS_SLOTS is None or _TTS_SLOTS[0] != size:
+            _TTS_SLOTS = (size, threading.BoundedSemaphore(size))
+        return _TTS_SLOTS[1]
+
+
+def _recycle_tts_pool(pool: ProcessPoolExecutor | None = None) -> None:
+    """Kill every worker (a hung espeak never returns on its own) and drop the pool; the next batch respawns it.
+
+    With ``pool``, only that generation is recycled: callers whose batches broke because another job
+    already recycled it must not tear down the fresh pool.
+    """
+    global _TTS_POOL, _TTS_WORKER_PIDS
+    with _TTS_POOL_LOCK:
+        if _TTS_POOL is None or (pool is not None and pool is not _TTS_POOL):
+            return
+        pool, _TTS_POOL = _TTS_POOL, None
+        pids, _TTS_WORKER_PIDS = _TTS_WORKER_PIDS, None
+    JOB_STORE.incr_metric("tts_worker_recycled")
+    # Health is judged from the futures (BrokenProcessPool, timeout); killing needs the pids the
+    # workers announced at startup, since the executor's own process table is private
+    while pids is not None and not pids.empty():
+        try:
+            os.kill(pids.get(), signal.SIGTERM)
+        except OSError:  # already exited
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_pooled(texts: list[str], language: str, sr: int) -> list[np.ndarray]:
+    """Render ``texts`` on the worker pool; a crashed or hung worker is recycled, never fatal to the job.
+
+    Every batch first takes a process-wide slot (``_tts_slots``), so it starts as soon as it is
+    submitted and ``TTS_WORKER_TIMEOUT_S`` bounds its own rendering time; a batch past its deadline
+    that the pool has not started yet is not hung and just gets a new deadline. A batch lost to a
+    crash or timeout is retried one segment at a time on a fresh pool. A crash breaks every in-flight
+    batch, so a single segment gets two more tries before falling back to the tone; one that hangs
+    again gets it at once.
+    """
+    workers = max(1, settings.tts_processes)
+    size = max(1, min(settings.tts_batch_size, -(-len(texts) // workers)))
+    queue = deque((list(range(i, min(i + size, len(texts)))), 0) for i in range(0, len(texts), size))
+    results: list[np.ndarray | None] = [None] * len(texts)
+    in_flight: dict[Future, tuple[list[int], int, ProcessPoolExecutor, float]] = {}
+
+    def lost(idx: list[int], attempt: int, hung: bool = False) -> None:
+        if len(idx) > 1:
+            queue.extend(([i], attempt + 1) for i in idx)  # isolate the culprit
+        elif not hung and attempt < 2:
+            queue.append((idx, attempt + 1))
+        else:
+            results[idx[0]] = _tone_fallback(texts[idx[0]], sr)
+
+    while queue or in_flight:
+        while queue and len(in_flight) < workers:
+            slots = _tts_slots()
+            # Block for a free worker only when none of our batches is running; else go collect results
+            if not slots.acquire(blocking=not in_flight):
+                break
+            idx, attempt = queue.popleft()
+            pool = _tts_pool()
+            try:
+                future = pool.submit(_render_local, [texts[i] for i in idx], language, sr)
+            except Exception as e:  # broken or shut down by another job's recycle
+                slots.release()
+                logger.error(f"Worker TTS indisponível ({len(idx)} segmentos): {e!r}")
+                _recycle_tts_pool(pool)
+                lost(idx, attempt)
+                continue
+            future.add_done_callback(lambda _f, slots=slots: slots.release())
+            in_flight[future] = (idx, attempt, pool, time.monotonic() + settings.tts_worker_timeout_s)
+        if not in_flight:
+            continue
+        next_deadline = min(entry[3] for entry in in_flight.values())
+        done, _ = wait(in_flight, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+        crashed: set[ProcessPoolExecutor] = set()
+        for future in done:
+            idx, attempt, pool, _ = in_flight.pop(future)
+            try:
+                for i, audio in zip(idx, future.result()):
+                    results[i] = audio
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    crashed.add(pool)
+                logger.error(f"Worker TTS falhou ({len(idx)} segmentos): {e!r}")
+                lost(idx, attempt)
+        now = time.monotonic()
+        hung: set[Future] = set()
+        for future, (idx, attempt, pool, deadline) in list(in_flight.items()):
+            if deadline > now:
+                continue
+            if future.running():
+                hung.add(future)
+            else:
+                in_flight[future] = (idx, attempt, pool, now + settings.tts_worker_timeout_s)
+        if hung:
+            logger.warning(f"Worker TTS travado (> {settings.tts_worker_timeout_s}s), reciclando o pool")
+        failed = crashed | {in_flight[future][2] for future in hung}
+        for pool in failed:
+            _recycle_tts_pool(pool)
+        # A crash breaks every batch of that pool (culprit unknown); after a hang the others were innocent
+        for future, (idx, attempt, pool, _) in list(in_flight.items()):
+            if pool not in failed:
+                continue
+            del in_flight[future]
+            if future in hung or pool in crashed:
+                lost(idx, attempt, hung=future in hung)
+            else:
+                queue.appendleft((idx, attempt))
+    return results
 
 
 def synthesize_segments(segments: list[tuple[float, float, str]], target_language: str = 'pt', sr: int = 16000) -> np.ndarray:
     """Concatena áudios por segmento, tentando aproximar o timing (sem clonagem)."""
     logger.info(f"[TTS-base] Sintetizando {len(segments)} segmentos em {target_language}")
-    
-    out = []
-    for i, (start, end, text) in enumerate(segments):
-        logger.info(f"[TTS {i+1}/{len(segments)}] Segmento {start:.1f}s-{end:.1f}s: '{text[:50]}{'...' if len(text) > 50 else ''}'")
-        
-        seg_audio = synthesize_segment(text, language=target_language, sr=sr)
-        target_len = int((end - start) * sr)
-        
-        if len(seg_audio) < target_len:
-            # Adicionar padding se o áudio for mais curto que o esperado
-            pad = np.zeros(target_len - len(seg_audio), dtype=np.float32)
-            seg_audio = np.concatenate([seg_audio, pad])
-        elif len(seg_audio) > target_len:
-            # Truncar se o áudio for mais longo que o esperado
-            seg_audio = seg_audio[:target_len]
-        
-        out.append(seg_audio)
-    
-    if out:
-        final_audio = np.concatenate(out)
+
+    rendered = synthesize_batch([text for _, _, text in segments], language=target_language, sr=sr)
+    out = [fit_to_slot(seg_audio, start, end, sr) for (start, end, _), seg_audio in zip(segments, rendered)]
+    return concat_segment_audio(out, sr)
+
+
+def fit_to_slot(seg_audio: np.ndarray, start: float, end: float, sr: int = 16000) -> np.ndarray:
+    """Pad or truncate a synthesized segment to the (start, end) slot length."""
+    target_len = int((end - start) * sr)
+    if len(seg_audio) < target_len:
+        # Adicionar padding se o áudio for mais curto que o esperado
+        pad = np.zeros(target_len - len(seg_audio), dtype=np.float32)
+        seg_audio = np.concatenate([seg_audio, pad])
+    elif len(seg_audio) > target_len:
+        # Truncar se o áudio for mais longo que o esperado
+        seg_audio = seg_audio[:target_len]
+    return seg_audio
+
+
+def concat_segment_audio(parts: list[np.ndarray], sr: int = 16000) -> np.ndarray:
+    if parts:
+        final_audio = np.concatenate(parts)
         logger.info(f"TTS finalizado: {len(final_audio)/sr:.2f}s de áudio total")
         return final_audio
     
@@ -227,7 +556,7 @@ def _openvoice_available() -> bool:
 
 def synthesize_segments_with_clone(
     segments: list[tuple[float, float, str]],
-    reference_wav: Path,
+    reference_wav: Path | np.ndarray,
     target_language: str = 'pt',
     sr: int = 16000
 ) -> np.ndarray:
@@ -241,19 +570,27 @@ def synthesize_segments_with_clone(
             return cloned
         logger.info("Clonagem OpenVoice não produziu áudio, tentando demais modos...")
 
-    # 2) Modo spectral (pseudo-clone) – aplica perfil sobre TTS base
+    # 2) Modo spectral (pseudo-clone) / 3) fallback puro
+    base = synthesize_segments(segments, target_language=target_language, sr=sr)
+    return apply_post_clone(base, reference_wav, sr=sr)
+
+
+def needs_segment_level_clone() -> bool:
+    """True when OpenVoice would consume the whole segment list (no per-segment streaming)."""
+    mode = getattr(settings, 'voice_clone_mode', 'baseline')
+    return settings.voice_clone_enabled and mode in ("openvoice", "baseline") and is_openvoice_ready()
+
+
+def apply_post_clone(base: np.ndarray, reference_wav: Path | np.ndarray, sr: int = 16000) -> np.ndarray:
+    """Apply the spectral pseudo-clone over already synthesized base audio (if enabled)."""
+    mode = getattr(settings, 'voice_clone_mode', 'baseline')
     if settings.voice_clone_enabled and mode in ("spectral", "baseline"):
         logger.info("Aplicando modo spectral de clonagem (pseudo timbre)")
-        base = synthesize_segments(segments, target_language=target_language, sr=sr)
         try:
-            enhanced = spectral_clone_segments(base, reference_wav, sr)
-            return enhanced
+            return spectral_clone_segments(base, reference_wav, sr)
         except Exception as e:
             logger.warning(f"Falha no modo spectral: {e}. Fallback para áudio base.")
-            return base
-
-    # 3) Fallback puro
-    return synthesize_segments(segments, target_language=target_language, sr=sr)
+    return base
 
 
 def save_wav(wav_path: Path, audio: np.ndarray, sr: int = 16000) -> Path:
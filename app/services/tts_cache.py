@@ -0,0 +1,63 @@
+"""Content-addressed cache of synthesized phrases.
+
+Greetings, catchphrases and repeated lines are rendered once: the key covers
+the whitespace-normalized text plus everything that changes the waveform
+(language, voice id, rate, volume, sample rate), and entries are 16-bit FLAC
+in a size-capped ``DiskCache`` shared by every process and TTS worker. Only
+real engine output is stored, never the tone fallback.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+from ..config import settings
+from .disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Bump when rendering/post-processing changes alter the audio for identical parameters
+TTS_CACHE_VERSION = 1
+
+TTS_CACHE = DiskCache(settings.cache_dir / "tts", settings.tts_cache_max_mb * 1024 * 1024)
+
+
+def phrase_cache_key(text: str, language: str, voice_id: str | None, rate: int, volume: float, sr: int) -> str:
+    params = {
+        "v": TTS_CACHE_VERSION,
+        "engine": "pyttsx3",
+        "text": " ".join(text.split()),
+        "language": language,
+        "voice": voice_id,
+        "rate": rate,
+        "volume": volume,
+        "sr": sr,
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def load_phrase(key: str) -> Optional[np.ndarray]:
+    """Cached float32 PCM for ``key`` or None (missing, evicted or corrupt)."""
+    path = TTS_CACHE.get(key)
+    if path is None:
+        return None
+    try:
+        data, _ = sf.read(str(path), dtype="float32")
+    except (OSError, RuntimeError):  # corrupt/evicted entry (LibsndfileError is a RuntimeError): a miss
+        return None
+    return data
+
+
+def store_phrase(key: str, audio: np.ndarray, sr: int) -> None:
+    buf = io.BytesIO()
+    sf.write(buf, audio, sr, format="FLAC", subtype="PCM_16")
+    try:
+        TTS_CACHE.put_bytes(key, buf.getvalue(), suffix=".flac")
+    except OSError as e:
+        logger.warning(f"Could not store phrase in TTS cache: {e}")
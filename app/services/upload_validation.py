@@ -5,19 +5,25 @@ from .logs import log_event
 from ..config import settings
 
 
-def validate_upload(file: UploadFile, data: bytes) -> Path:
-    """Validate uploaded file against size and extension constraints.
-
-    Returns a safe target path (randomized name) if valid, else raises HTTPException.
-    """
+def _check_size(size: int) -> None:
     max_bytes = settings.max_upload_mb * 1024 * 1024
-    size = len(data)
     if size == 0:
         raise HTTPException(status_code=400, detail="Empty file upload")
     if size > max_bytes:
         log_event("upload_reject", reason="size", size=size, limit=max_bytes)
         raise HTTPException(status_code=413, detail=f"File exceeds {settings.max_upload_mb} MB limit")
 
+
+def validate_upload(file: UploadFile, data: bytes) -> Path:
+    """Validate uploaded file against size and extension constraints.
+
+    Returns a safe target path (randomized name) if valid, else raises HTTPException.
+    """
+    _check_size(len(data))
+    return _target_path(file)
+
+
+def _target_path(file: UploadFile) -> Path:
     allowed = {ext.strip().lower() for ext in settings.allowed_upload_extensions.split(',') if ext.strip()}
     orig_name = file.filename or "uploaded.bin"
     ext = Path(orig_name).suffix.lower()
@@ -30,3 +36,22 @@ def validate_upload(file: UploadFile, data: bytes) -> Path:
     safe_name = f"{uuid.uuid4().hex}{ext}"
     target = settings.uploads_dir / safe_name
     return target
+
+
+async def save_upload(file: UploadFile, chunk_size: int = 1024 * 1024) -> Path:
+    """Validate and copy the upload to ``uploads/`` in chunks (never holds the whole file in memory)."""
+    target = _target_path(file)
+    max_bytes = settings.max_upload_mb * 1024 * 1024
+    size = 0
+    try:
+        with open(target, "wb") as fh:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    break
+                fh.write(chunk)
+        _check_size(size)
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    return target
@@ -74,7 +74,7 @@ def is_openvoice_ready() -> bool:
 
 def synthesize_segments_voice_clone(
     segments: List[tuple[float, float, str]],
-    reference_wav: Path,
+    reference_wav: Path | np.ndarray,
     target_language: str = 'pt',
     sr: int = 16000,
 ) -> np.ndarray | None:
@@ -86,7 +86,7 @@ def synthesize_segments_voice_clone(
         # Already logged by readiness function in debug level.
         return None
 
-    if not reference_wav.exists():
+    if isinstance(reference_wav, Path) and not reference_wav.exists():
         logger.warning("Reference wav for cloning not found; fallback")
         return None
 
@@ -123,9 +123,13 @@ def compute_pitch(track: np.ndarray, sr: int) -> float:
     return sr/lag
 
 
-def analyze_reference_voice(reference_wav: Path, sr: int = 16000) -> Optional[Dict[str, Any]]:
+def analyze_reference_voice(reference_wav: Path | np.ndarray, sr: int = 16000) -> Optional[Dict[str, Any]]:
+    """Profile the reference voice; an ndarray is taken as PCM already at ``sr`` (no re-read from disk)."""
     try:
-        audio, ref_sr = sf.read(str(reference_wav))
+        if isinstance(reference_wav, np.ndarray):
+            audio, ref_sr = reference_wav, sr
+        else:
+            audio, ref_sr = sf.read(str(reference_wav))
         if audio.ndim > 1:
             audio = audio.mean(axis=1)
         if ref_sr != sr:
@@ -187,7 +191,7 @@ def apply_voice_profile(generated: np.ndarray, sr: int, profile: Dict[str, Any])
 
 def spectral_clone_segments(
     base_audio: np.ndarray,
-    reference_wav: Path,
+    reference_wav: Path | np.ndarray,
     sr: int
 ) -> np.ndarray:
     profile = analyze_reference_voice(reference_wav, sr=sr)
@@ -0,0 +1,92 @@
+"""Standalone pipeline worker: ``python -m app.worker [--processes N]``.
+
+Workers pull queued jobs from the shared SQLite job store, so compute can be
+scaled independently of the HTTP tier (run the web app with JOB_RUNNER=worker).
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing as mp
+import os
+import socket
+import time
+
+from .config import settings
+from .services.job_store import JOB_STORE
+from .services.logs import log_event
+
+logger = logging.getLogger(__name__)
+
+
+def run_worker(poll_interval: float | None = None, max_jobs: int | None = None) -> int:
+    """Claim and execute jobs until interrupted (or ``max_jobs`` reached). Returns jobs processed."""
+    from .services.pipeline import prune_old_events, run_job
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    interval = settings.worker_poll_interval if poll_interval is None else poll_interval
+    processed = 0
+    last_recovery = 0.0
+    log_event("worker_start", worker=worker_id, db=str(JOB_STORE.db_path))
+    if settings.asr_preload:
+        try:
+            from .services.asr import preload_models
+            preload_models()
+        except Exception as e:
+            logger.warning(f"Failed to preload ASR models on {worker_id}: {e}")
+    while max_jobs is None or processed < max_jobs:
+        # Jobs of crashed workers go back to the queue and resume from their checkpoints
+        if time.monotonic() - last_recovery > settings.job_stale_after_s / 2:
+            stale = JOB_STORE.requeue_stale(settings.job_stale_after_s, settings.job_max_attempts)
+            if stale:
+                log_event("jobs_requeued", worker=worker_id, job_ids=stale)
+            prune_old_events()
+            last_recovery = time.monotonic()
+        claimed = JOB_STORE.claim_next(worker_id)
+        if claimed is None:
+            time.sleep(interval)
+            continue
+        job_id, params = claimed
+        log_event("worker_claim", worker=worker_id, job_id=job_id)
+        try:
+            run_job(job_id, params)
+        except Exception as e:
+            # Failure already recorded in the store by run_job; keep serving the queue.
+            logger.warning(f"Job {job_id} failed on {worker_id}: {e}")
+        processed += 1
+    return processed
+
+
+def _worker_entry(poll_interval: float | None) -> None:
+    try:
+        run_worker(poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="dubby pipeline worker")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes to run")
+    parser.add_argument("--poll-interval", type=float, default=None, help="Seconds between polls when idle")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if settings.debug else logging.INFO)
+
+    if args.processes <= 1:
+        _worker_entry(args.poll_interval)
+        return
+
+    procs = [mp.Process(target=_worker_entry, args=(args.poll_interval,), daemon=False) for _ in range(args.processes)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.join()
+
+
+if __name__ == "__main__":
+    main()
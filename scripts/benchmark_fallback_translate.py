@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Per-segment cost of the dictionary fallback translator: old per-word loop vs precompiled matcher.
+
+Usage:
+  python scripts/benchmark_fallback_translate.py --segments 2000
+
+The legacy path is reproduced here (sort the dictionary, then one ``re.sub`` with a freshly built
+pattern per matching entry) so both run on the same synthetic ASR-like segments.
+"""
+from __future__ import annotations
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.translate import _EN_PT_FALLBACK, _fallback_matcher, _fallback_translate  # noqa: E402
+
+
+def legacy_fallback(text: str) -> str:
+    text_lower = text.lower()
+    translated = text
+    for en_word, pt_word in sorted(dict(_EN_PT_FALLBACK).items(), key=lambda x: len(x[0]), reverse=True):
+        if en_word in text_lower:
+            pattern = r"\b" + re.escape(en_word) + r"\b"
+            translated = re.sub(pattern, pt_word, translated, flags=re.IGNORECASE)
+    return translated
+
+
+def make_segments(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    vocab = list(_EN_PT_FALLBACK) + ["dubbing", "pipeline", "video", "okay so", "the", "a", "channel"]
+    return [" ".join(rng.choice(vocab) for _ in range(rng.randint(6, 24))).capitalize() + "." for _ in range(n)]
+
+
+def bench(fn, segments: list[str]) -> float:
+    t0 = time.perf_counter()
+    for seg in segments:
+        fn(seg)
+    return (time.perf_counter() - t0) / len(segments)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--segments", type=int, default=2000, help="Number of synthetic segments")
+    args = ap.parse_args()
+
+    segments = make_segments(args.segments)
+    t0 = time.perf_counter()
+    _fallback_matcher("en", "pt")
+    build = time.perf_counter() - t0
+
+    legacy = bench(legacy_fallback, segments)
+    compiled = bench(lambda s: _fallback_translate(s, "en", "pt"), segments)
+    print(f"segments: {len(segments)} (avg {sum(len(s) for s in segments) / len(segments):.0f} chars)")
+    print(f"matcher build (once per pair): {build * 1000:.2f} ms")
+    print(f"legacy per-word loop:  {legacy * 1e6:9.1f} us/segment")
+    print(f"precompiled matcher:   {compiled * 1e6:9.1f} us/segment  ({legacy / compiled:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Throughput of the Argos and Marian translation backends on the same segments.
+
+Usage:
+  python scripts/benchmark_translation_backends.py --src en --dst pt
+  python scripts/benchmark_translation_backends.py --segments-file segments.txt --repeat 5
+
+Segments are read one per line (default: a built-in sample of ASR-like sentences). The translation
+memory is disabled so every run reaches the model; each backend is warmed up once before timing.
+Marian models are expected in MARIAN_MODELS_DIR (models/marian/opus-mt-{src}-{dst}).
+"""
+from __future__ import annotations
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.services import translate  # noqa: E402
+
+SAMPLE = [
+    "Hello everyone and welcome back to the channel.",
+    "Today we are going to talk about how to cook rice properly.",
+    "First, rinse the rice until the water runs clear.",
+    "Then add two cups of water for every cup of rice.",
+    "Bring it to a boil, cover the pot and lower the heat.",
+    "After fifteen minutes, turn off the stove and let it rest.",
+    "That's it for today. Thanks for watching!",
+    "If you liked this video, please subscribe and leave a comment.",
+]
+
+
+def run(backend: str, segments: list[str], src: str, dst: str, repeat: int) -> tuple[float, list[str]] | None:
+    settings.translation_backend = backend
+    if not translate.ensure_translation_package(src, dst):
+        return None
+    out = translate.translate_batch(segments, src, dst)  # warm-up: loads the model
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        translate.translate_batch(segments, src, dst)
+    return (time.perf_counter() - t0) / repeat, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--src", default="en")
+    ap.add_argument("--dst", default="pt")
+    ap.add_argument("--segments-file", type=Path, help="Text file with one segment per line")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per backend")
+    ap.add_argument("--backends", default="argos,marian")
+    args = ap.parse_args()
+
+    segments = SAMPLE
+    if args.segments_file:
+        segments = [line.strip() for line in args.segments_file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    settings.translation_memory_enabled = False
+
+    outputs: dict[str, list[str]] = {}
+    print(f"{len(segments)} segments {args.src}->{args.dst}, {args.repeat} runs per backend")
+    for backend in [b.strip() for b in args.backends.split(",") if b.strip()]:
+        result = run(backend, segments, args.src, args.dst, max(1, args.repeat))
+        if result is None:
+            print(f"{backend:>7}: unavailable (no model for {args.src}->{args.dst})")
+            continue
+        seconds, outputs[backend] = result
+        print(f"{backend:>7}: {seconds * 1000:8.1f} ms/run  {len(segments) / seconds:8.1f} segments/s")
+
+    for i, segment in enumerate(segments[:3] if outputs else []):
+        print(f"\n[{i}] {segment}")
+        for backend, out in outputs.items():
+            print(f"  {backend:>7}: {out[i]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,3 +5,81 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# Isolate the job store, caches, uploads and outputs from the local workspace (must run before app import)
+import os
+import tempfile
+
+_TMP = Path(tempfile.mkdtemp(prefix="dubby-tests-"))
+os.environ.setdefault("DATA_DIR", str(_TMP / "data"))
+os.environ.setdefault("CACHE_DIR", str(_TMP / "data" / "cache"))
+os.environ.setdefault("JOBS_DB_PATH", str(_TMP / "data" / "jobs.sqlite3"))
+os.environ.setdefault("UPLOADS_DIR", str(_TMP / "uploads"))
+os.environ.setdefault("OUTPUTS_DIR", str(_TMP / "outputs"))
+os.environ.setdefault("ASR_PRELOAD", "false")  # never download/load Whisper at app startup in tests
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+
+class FakePipeline:
+    """Recording stand-ins for the heavy phases of ``pipeline`` (ffmpeg, Whisper, translation, TTS).
+
+    Tests shape a run through the attributes (``segments``, ``audio_s``, ``translate``, ``pcm``,
+    ``tts_failures``) and inspect ``calls`` afterwards; phase signatures live only here.
+    """
+
+    def __init__(self, tmp_path: Path):
+        from app.services.asr import Segment
+
+        self.tmp_path = tmp_path
+        self.segments = [Segment(0.0, 1.0, "hello")]
+        self.audio_s = 1.0
+        self.pcm = None  # decode_audio returns this buffer when set
+        self.translate = lambda text, src, dst: text
+        self.tts_failures = 0
+        self.calls = {"extract": 0, "asr": [], "tiers": [], "asr_sources": [], "translate": [], "tts": [], "tts_references": []}
+
+    def media(self, name: str, content: bytes | None = None) -> Path:
+        path = self.tmp_path / name
+        path.write_bytes(content if content is not None else name.encode())
+        return path
+
+    def extract_audio(self, src, dst, sr=16000):
+        self.calls["extract"] += 1
+        sf.write(str(dst), np.zeros(int(sr * self.audio_s), dtype=np.float32), sr)
+        return dst
+
+    def decode_audio(self, src, sr=16000):
+        self.calls["extract"] += 1
+        return self.pcm if self.pcm is not None else np.zeros(int(sr * self.audio_s), dtype=np.float32)
+
+    def transcribe_iter(self, source, language=None, stats=None, tier=None):
+        self.calls["asr"].append(language)
+        self.calls["tiers"].append(tier)
+        self.calls["asr_sources"].append(source)
+        return iter(list(self.segments))
+
+    def translate_batch(self, texts, src, dst, stats=None):
+        self.calls["translate"].append((src, dst))
+        return [self.translate(text, src, dst) for text in texts]
+
+    def synthesize_segments_with_clone(self, segments, reference_wav, target_language="pt", sr=16000):
+        self.calls["tts"].append(target_language)
+        self.calls["tts_references"].append(reference_wav)
+        if self.tts_failures > 0:
+            self.tts_failures -= 1
+            raise RuntimeError("espeak crashed")
+        return np.zeros(int(sr * self.audio_s), dtype=np.float32)
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch, tmp_path: Path) -> FakePipeline:
+    from app.services import pipeline
+
+    fake = FakePipeline(tmp_path)
+    for name in ("extract_audio", "decode_audio", "transcribe_iter", "translate_batch", "synthesize_segments_with_clone"):
+        monkeypatch.setattr(pipeline, name, getattr(fake, name))
+    monkeypatch.setattr(pipeline.settings, "pipeline_streaming", False)
+    return fake
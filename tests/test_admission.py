@@ -0,0 +1,61 @@
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import admission
+from app.services.admission import PhaseLimits
+from app.services.job_store import JOB_STORE
+
+
+def test_phase_limits_cap_concurrency():
+    limits = PhaseLimits({"asr": 2})
+    peak = 0
+    active = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal peak, active
+        with limits.slot("asr"):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
+    snap = limits.snapshot()["asr"]
+    assert snap["limit"] == 2 and snap["active"] == 0 and snap["waiting"] == 0
+    assert snap["avg_wait_s"] > 0
+
+
+def test_full_queue_returns_429_with_retry_after(monkeypatch):
+    job_id = uuid.uuid4().hex
+    JOB_STORE.create_job(job_id, {"input": "x"}, {"submitted": time.time()})
+    monkeypatch.setattr(admission.settings, "max_pending_jobs", admission.pending_jobs())
+    monkeypatch.setattr(admission.settings, "admission_retry_after_s", 7)
+    client = TestClient(app)
+    r = client.post("/api/jobs", files={"file": ("clip.wav", b"data", "audio/wav")}, data={"dst_lang": "pt"})
+    assert r.status_code == 429
+    assert r.headers["Retry-After"] == "7"
+    JOB_STORE.update(job_id, state="completed")
+
+
+def test_status_exposes_queue_depth_and_wait():
+    job_id = uuid.uuid4().hex
+    JOB_STORE.create_job(job_id, {"input": "x"}, {"submitted": time.time() - 2.0})
+    JOB_STORE.claim_job(job_id, "test")
+    assert JOB_STORE.get(job_id)["queue_wait_s"] >= 2.0
+    queue = TestClient(app).get("/api/status").json()["queue"]
+    assert queue["running"] >= 1
+    assert queue["max_queue_wait_s"] >= 2.0
+    assert set(queue["phases"]) == {"asr", "tts", "ffmpeg"}
+    JOB_STORE.update(job_id, state="completed")
@@ -0,0 +1,59 @@
+import threading
+
+import numpy as np
+
+from app.services import asr_batching
+from app.services.asr import Segment
+from app.services.asr_batching import BatchedASR, split_timestamped_tokens, split_windows
+
+TS = 1000  # fake timestamp_begin
+EOT = 999
+
+
+def test_timestamp_tokens_become_segments():
+    tokens = [TS + 0, 1, 2, TS + 50, TS + 50, 3, TS + 120, TS + 130, 4, 5, EOT]
+    segs = split_timestamped_tokens(tokens, TS, EOT)
+    assert segs == [(0.0, 1.0, [1, 2]), (1.0, 2.4, [3]), (2.6, None, [4, 5])]
+
+
+def test_windows_never_exceed_30_seconds():
+    audio = np.random.default_rng(1).standard_normal(16000 * 95).astype(np.float32)
+    windows = split_windows(audio)
+    assert windows[0][0] == 0 and windows[-1][1] == len(audio)
+    assert all(b - a <= 30 * 16000 for a, b in windows)
+
+
+class _RecordingBatcher(BatchedASR):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_sizes = []
+
+    def decode_batch(self, batch):
+        self.batch_sizes.append(len(batch))
+        # Echo the window's marker value so results can be traced back to their job
+        return [[Segment(0.5, 1.0, f"job{int(w.audio[0])}")] for w in batch]
+
+
+def test_concurrent_jobs_share_batches_and_get_their_own_segments(monkeypatch):
+    monkeypatch.setattr(asr_batching.settings, "asr_vad", "off")
+    batcher = _RecordingBatcher(batch_size=8, max_wait_ms=200)
+    results = {}
+
+    def job(marker):
+        audio = np.full(16000 * 70, float(marker), dtype=np.float32)
+        stats = {}
+        results[marker] = (list(batcher.transcribe(audio, "en", stats=stats)), stats)
+
+    threads = [threading.Thread(target=job, args=(m,)) for m in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(batcher.batch_sizes) > 3  # windows of both jobs were decoded together
+    for marker, (segments, stats) in results.items():
+        assert {s.text for s in segments} == {f"job{marker}"}
+        assert len(segments) == 3  # 70 s -> three windows
+        assert segments[0].start == 0.5 and segments[1].start > 20.0
+        assert stats == {"duration_s": 70.0, "speech_s": 70.0}
+    assert batcher.stats()["windows"] == 6
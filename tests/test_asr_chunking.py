@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+from app.services import asr
+from app.services.asr import Segment, split_on_silence
+
+
+def _speech_with_gaps(sr, seconds, gaps):
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(seconds * sr)) * 0.3).astype(np.float32)
+    for a, b in gaps:
+        audio[int(a * sr):int(b * sr)] = 0.0
+    return audio
+
+
+def test_split_on_silence_cuts_inside_gaps():
+    sr = 1000
+    gaps = [(13.0, 14.0), (27.0, 28.0)]
+    audio = _speech_with_gaps(sr, 40, gaps)
+    chunks = split_on_silence(audio, sr, target_s=12.0, search_s=3.0)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    cuts = [end / sr for _, end in chunks[:-1]]
+    assert len(cuts) == 2
+    for cut, (a, b) in zip(cuts, gaps):
+        assert a <= cut <= b
+
+
+def test_split_on_silence_short_audio_is_single_chunk():
+    audio = np.zeros(1000 * 15, dtype=np.float32)
+    assert split_on_silence(audio, 1000, target_s=12.0) == [(0, len(audio))]
+
+
+def test_chunked_transcription_offsets_timestamps(tmp_path, monkeypatch):
+    sr = 16000
+    wav = tmp_path / "long.wav"
+    sf.write(wav, _speech_with_gaps(sr, 10, [(4.5, 5.5)]), sr)
+
+    def fake_chunk(audio, offset_s, language, model_name=None):
+        dur = len(audio) / sr
+        segments = [Segment(start=offset_s + 0.1, end=offset_s + dur - 0.1, text=f"chunk@{offset_s:.1f}")]
+        return segments, {"duration_s": dur, "speech_s": dur - 0.5}
+
+    monkeypatch.setattr(asr.settings, "asr_chunk_min_duration_s", 5.0)
+    monkeypatch.setattr(asr.settings, "asr_chunk_target_s", 4.0)
+    monkeypatch.setattr(asr, "_transcribe_chunk", fake_chunk)
+    monkeypatch.setattr(asr, "_chunk_pool", lambda model_name: ThreadPoolExecutor(max_workers=2))
+
+    stats = {}
+    segments = asr.transcribe(wav, language="en", stats=stats)
+    assert abs(stats["duration_s"] - 10.0) < 1e-6 and abs(stats["speech_s"] - 9.0) < 1e-6
+    assert len(segments) == 2
+    assert segments[0].start == 0.1
+    assert 4.5 <= segments[1].start - 0.1 <= 5.5
+    assert abs(segments[-1].end - 9.9) < 1e-6
+
+
+def test_chunk_workers_load_only_their_tier_model(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(asr, "_load_model", lambda cpu_threads=0, num_workers=1, model_name=None: loaded.append(model_name) or model_name)
+    monkeypatch.setattr(asr, "_model", None)
+    monkeypatch.setattr(asr, "_models_by_name", {})
+    monkeypatch.setattr(asr.settings, "asr_model", "medium")
+    monkeypatch.setattr(asr.settings, "asr_tiers", "fast=tiny,accurate=medium")
+
+    requested = []
+    monkeypatch.setattr(asr, "_chunk_pool", lambda model_name: requested.append(model_name) or ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(asr, "_transcribe_chunk", lambda audio, offset_s, language, model_name=None: ([], {}))
+    list(asr.transcribe_chunked(np.zeros(16000, dtype=np.float32), language="en", tier="fast"))
+    assert requested == ["tiny"]
+
+    # What the spawned worker runs: its initializer loads the tier model, chunks reuse it
+    asr._init_chunk_worker("tiny")
+    assert asr.get_model("tiny") == "tiny"
+    assert loaded == ["tiny"]
+
+
+def test_chunked_asr_is_opt_in(monkeypatch):
+    from app.config import Settings
+
+    monkeypatch.delenv("ASR_CHUNK_MIN_DURATION_S", raising=False)
+    assert Settings(_env_file=None).asr_chunk_min_duration_s == 0
@@ -0,0 +1,61 @@
+import threading
+import time
+
+import pytest
+
+from app.services.asr import ModelPool
+
+
+def test_pool_loads_lazily_and_reuses_instances():
+    created = []
+    pool = ModelPool(2, lambda: created.append(object()) or created[-1])
+    with pool.checkout() as a:
+        assert pool.stats()["in_use"] == 1
+    with pool.checkout() as b:
+        assert b is a
+    assert len(created) == 1
+    assert pool.preload() == 1
+    assert pool.stats() == {"size": 2, "loaded": 2, "slots_per_model": 1, "in_use": 0}
+
+
+def test_checkout_blocks_when_all_slots_busy():
+    pool = ModelPool(1, object, slots_per_model=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def job():
+        nonlocal active, peak
+        with pool.checkout():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=job) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
+    assert pool.stats()["loaded"] == 1
+
+
+def test_failed_load_does_not_consume_capacity():
+    calls = {"n": 0}
+
+    def loader():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("boom")
+        return object()
+
+    pool = ModelPool(1, loader)
+    with pytest.raises(RuntimeError):
+        with pool.checkout():
+            pass
+    with pool.checkout() as model:
+        assert model is not None
+    assert pool.stats()["loaded"] == 1
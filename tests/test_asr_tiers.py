@@ -0,0 +1,43 @@
+from app.services import asr, pipeline
+from app.services.asr import choose_tier
+from app.services.job_store import JOB_STORE
+
+
+def _tiers(monkeypatch):
+    monkeypatch.setattr(asr.settings, "asr_tiers", "fast=tiny,balanced=small,accurate=medium")
+    monkeypatch.setattr(asr.settings, "asr_model", "medium")
+    monkeypatch.setattr(asr.settings, "asr_tier_long_media_s", 1800.0)
+    monkeypatch.setattr(asr.settings, "asr_tier_busy_queue", 4)
+
+
+def test_policy_steps_down_for_long_media_and_busy_queue(monkeypatch):
+    _tiers(monkeypatch)
+    assert asr.asr_tiers() == [("fast", "tiny"), ("balanced", "small"), ("accurate", "medium")]
+    assert choose_tier(60) == "accurate"
+    assert choose_tier(3600) == "balanced"
+    assert choose_tier(60, queue_depth=4) == "balanced"
+    assert choose_tier(60, queue_depth=8) == "fast"
+    assert choose_tier(3600, queue_depth=100) == "fast"
+    # An explicit tier is honoured regardless of load
+    assert choose_tier(3600, quality="accurate", queue_depth=100) == "accurate"
+    assert choose_tier(60, quality="fast") == "fast"
+
+
+def test_single_default_tier_without_configuration(monkeypatch):
+    monkeypatch.setattr(asr.settings, "asr_tiers", "")
+    assert asr.asr_tiers() == [("default", asr.settings.asr_model)]
+    assert choose_tier(10_000, queue_depth=100) == "default"
+
+
+def test_job_records_the_tier_that_served_it(fake_pipeline, monkeypatch):
+    _tiers(monkeypatch)
+    monkeypatch.setattr(pipeline.settings, "pipeline_pcm_pipe", True)
+    media = fake_pipeline.media("tier.wav", b"tiered media")
+
+    pipeline._register_job("tier1", media, "en", ["pt"], True, quality="fast")
+    pipeline.run_job("tier1", JOB_STORE.claim_job("tier1", "test"))
+
+    info = JOB_STORE.get("tier1")
+    assert fake_pipeline.calls["tiers"] == ["fast"]
+    assert info["asr_tier"] == "fast" and info["asr_model"] == "tiny" and info["quality"] == "fast"
+    assert JOB_STORE.metrics()["asr_tier_fast"] >= 1
@@ -0,0 +1,72 @@
+import pytest
+
+from app.services import pipeline
+from app.services.asr import Segment
+from app.services.job_store import JOB_STORE
+
+
+@pytest.fixture
+def fake_phases(fake_pipeline):
+    fake_pipeline.segments = [Segment(0.0, 1.0, "hello"), Segment(1.0, 2.0, "thank you")]
+    fake_pipeline.audio_s = 2.0
+    fake_pipeline.translate = lambda text, src, dst: text.upper()
+    fake_pipeline.tts_failures = 1
+    return fake_pipeline
+
+
+@pytest.mark.parametrize("pcm_pipe", [True, False])
+def test_failed_tts_resumes_without_rerunning_asr(fake_phases, monkeypatch, pcm_pipe):
+    monkeypatch.setattr(pipeline.settings, "pipeline_pcm_pipe", pcm_pipe)
+    job_id = f"resume-{'pipe' if pcm_pipe else 'wav'}"
+    media = fake_phases.media("clip.wav", job_id.encode())  # distinct content: no result-cache hit from the other param
+    pipeline._register_job(job_id, media, "en", ["pt"], True)
+
+    with pytest.raises(RuntimeError):
+        pipeline.run_job(job_id, JOB_STORE.claim_job(job_id, "test"))
+    assert JOB_STORE.get(job_id)["state"] == "failed"
+    assert JOB_STORE.metrics()["tts_fail"] >= 1
+
+    assert JOB_STORE.requeue(job_id)
+    output = pipeline.run_job(job_id, JOB_STORE.claim_job(job_id, "test"))
+
+    info = JOB_STORE.get(job_id)
+    assert info["state"] == "completed" and info["attempts"] == 2
+    assert output.exists()
+    calls = fake_phases.calls
+    assert (calls["extract"], len(calls["asr"]), len(calls["tts"])) == (1, 1, 2)
+    resumed = [p["phase"] for p in info["phases"] if p.get("resumed")]
+    assert resumed == ["extract_audio", "asr", "translate"]
+    # Checkpoints are discarded once the job completes
+    assert not (pipeline.settings.data_dir / "jobs" / job_id).exists()
+
+
+def test_stale_running_job_is_requeued():
+    JOB_STORE.create_job("stale1", {"input": "x"}, {"phases": []})
+    JOB_STORE.claim_job("stale1", "dead-worker")
+    assert JOB_STORE.requeue_stale(stale_after=3600) == []
+    assert JOB_STORE.requeue_stale(stale_after=-1) == ["stale1"]
+    assert JOB_STORE.get("stale1")["state"] == "queued"
+
+
+def test_poison_job_is_failed_after_max_attempts():
+    JOB_STORE.create_job("poison1", {"input": "x"}, {"phases": []})
+    JOB_STORE.claim_job("poison1", "dead-worker")
+    assert JOB_STORE.requeue_stale(stale_after=-1, max_attempts=2) == ["poison1"]
+    JOB_STORE.claim_job("poison1", "dead-worker")
+    assert JOB_STORE.requeue_stale(stale_after=-1, max_attempts=2) == []
+    info = JOB_STORE.get("poison1")
+    assert info["state"] == "failed" and info["attempts"] == 2 and "gave up after 2 attempts" in info["error"]
+    # A manual retry is still allowed
+    assert JOB_STORE.requeue("poison1")
+
+
+def test_inline_mode_reschedules_orphans_found_after_startup(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(pipeline, "_schedule", scheduled.append)
+    monkeypatch.setattr(pipeline.settings, "job_runner", "inline")
+    JOB_STORE.create_job("orphan1", {"input": "x"}, {"phases": []})
+    JOB_STORE.claim_job("orphan1", "web-previous-process")
+    assert pipeline.requeue_orphans() == []  # still fresh (restart within JOB_STALE_AFTER_S)
+    monkeypatch.setattr(pipeline.settings, "job_stale_after_s", -1)
+    assert pipeline.requeue_orphans() == ["orphan1"]
+    assert scheduled == ["orphan1"] and JOB_STORE.get("orphan1")["state"] == "queued"
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+from app.services.disk_cache import DiskCache, hash_file
+
+
+def test_put_get_and_lru_eviction(tmp_path: Path):
+    cache = DiskCache(tmp_path / "cache", max_bytes=250)
+    cache.put_bytes("aa01", b"x" * 100, suffix=".wav")
+    cache.put_bytes("bb02", b"y" * 100, suffix=".wav")
+    # Age both entries, then touch the first one through a read
+    for key in ("aa01", "bb02"):
+        path = cache.get(key)
+        os.utime(path, (1, 1))
+    assert cache.get("aa01").read_bytes() == b"x" * 100
+
+    cache.put_bytes("cc03", b"z" * 100, suffix=".mp4")
+
+    assert cache.get("bb02") is None  # least recently used, evicted
+    assert cache.get("aa01") is not None
+    assert cache.get("cc03").suffix == ".mp4"
+    assert cache.stats()["entries"] == 2
+
+
+
+def test_writes_use_running_totals_instead_of_rescanning(tmp_path: Path, monkeypatch):
+    cache = DiskCache(tmp_path / "cache", max_bytes=1000)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+    for i in range(50):
+        cache.put_bytes(f"{i:04x}", b"x" * 10)
+    assert len(scans) == 1  # seeded once; 500 bytes never reach the cap
+    assert cache.stats() == {"entries": 50, "bytes": 500, "max_bytes": 1000}
+    cache.put_bytes("0000", b"y" * 20)  # overwrite: size delta only
+    assert cache.stats()["bytes"] == 510 and cache.stats()["entries"] == 50
+
+    # Past the cap one scan trims to the low-water mark, leaving headroom for the next writes
+    for i in range(50, 100):
+        cache.put_bytes(f"{i:04x}", b"x" * 10)
+    assert len(scans) == 2
+    assert cache.stats()["bytes"] <= 900
+
+
+def test_totals_resync_with_writes_from_other_processes(tmp_path: Path):
+    ours = DiskCache(tmp_path / "cache", max_bytes=10_000, resync_s=0.0)
+    other = DiskCache(tmp_path / "cache", max_bytes=10_000)
+    ours.put_bytes("aa01", b"x" * 100)
+    other.put_bytes("bb02", b"y" * 100)
+    assert ours.stats()["entries"] == 2 and ours.stats()["bytes"] == 200
+
+def test_hash_file_streams(tmp_path: Path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"abc" * 1000)
+    assert hash_file(f, chunk_size=7) == hash_file(f)
+
+
+def test_caches_live_outside_the_served_outputs_dir(monkeypatch):
+    from app.config import Settings, settings
+    from app.services.result_cache import RESULT_CACHE
+    from app.services.transcript_cache import TRANSCRIPT_CACHE
+    from app.services.translation_memory import TRANSLATION_MEMORY
+    from app.services.tts_cache import TTS_CACHE
+
+    served = settings.outputs_dir.resolve()
+    for path in (RESULT_CACHE.root, TRANSCRIPT_CACHE.root, TTS_CACHE.root, TRANSLATION_MEMORY.db_path):
+        assert served not in path.resolve().parents
+    for name in ("CACHE_DIR", "OUTPUTS_DIR"):
+        monkeypatch.delenv(name, raising=False)
+    defaults = Settings(_env_file=None)
+    assert defaults.outputs_dir.resolve() not in defaults.cache_dir.resolve().parents
@@ -7,3 +7,21 @@ def test_health_ok():
     r = client.get("/health")
     assert r.status_code == 200
     assert r.json().get("status") == "ok"
+
+
+def test_status_runs_off_the_event_loop_and_serves_cached_counts(tmp_path, monkeypatch):
+    import inspect
+
+    from app.routers import api
+    from app.services.translation_memory import TranslationMemory
+
+    assert not inspect.iscoroutinefunction(api.status)  # FastAPI runs plain handlers in its threadpool
+    assert TestClient(app).get("/api/status").status_code == 200
+
+    tm = TranslationMemory(tmp_path / "tm.sqlite3", 10)
+    tm.put_many([("k1", "en", "pt", "1", "hi", "oi")])
+    assert tm.stats()["entries"] == 1
+    tm.put_many([("k2", "en", "pt", "1", "bye", "tchau")])
+    assert tm.stats()["entries"] == 1  # no COUNT(*) until the TTL expires
+    monkeypatch.setattr(tm, "COUNT_TTL_S", 0.0)
+    assert tm.stats()["entries"] == 2
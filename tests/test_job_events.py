@@ -0,0 +1,59 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import pipeline
+from app.services.asr import Segment
+from app.services.job_store import JOB_STORE
+
+
+def _read_sse(client, job_id, last_event_id=None):
+    headers = {"Last-Event-ID": str(last_event_id)} if last_event_id is not None else {}
+    events = []
+    with client.stream("GET", f"/api/job/{job_id}/events", headers=headers) as r:
+        assert r.headers["content-type"].startswith("text/event-stream")
+        for block in r.read().decode().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+            if "event" in fields:
+                events.append((int(fields["id"]) if "id" in fields else None, fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_sse_streams_phases_progress_and_final_download(fake_pipeline, monkeypatch):
+    monkeypatch.setattr(pipeline.settings, "pipeline_pcm_pipe", True)
+    monkeypatch.setattr(pipeline.settings, "job_events_progress_interval", 0.0)
+    fake_pipeline.audio_s = 3.0
+    fake_pipeline.segments = [Segment(0.0, 1.0, "a"), Segment(1.0, 3.0, "b")]
+    media = fake_pipeline.media("events.wav", b"sse media")
+    pipeline._register_job("sse1", media, "en", ["pt"], True)
+    pipeline.run_job("sse1", JOB_STORE.claim_job("sse1", "test"))
+
+    client = TestClient(app)
+    events = _read_sse(client, "sse1")
+    names = [name for _, name, _ in events]
+    assert names[-1] == "done" and events[-1][2]["download_url"] == "/api/job/sse1/download"
+    assert "pipeline_complete" in names
+    assert [d["phase"] for _, n, d in events if n == "phase_start"][:2] == ["extract_audio", "asr"]
+    asr = [d for _, n, d in events if n == "segment_progress" and d["stage"] == "asr"]
+    assert asr[-1]["done"] == 2 and asr[-1]["position_s"] == 3.0 and asr[-1]["media_s"] == 3.0
+    translate = [d for _, n, d in events if n == "segment_progress" and d["stage"] == "translate"]
+    assert translate[-1] == {"ts": translate[-1]["ts"], "stage": "translate", "done": 2, "total": 2}
+
+    # Reconnecting with Last-Event-ID only replays what came after it
+    ids = [seq for seq, _, _ in events if seq is not None]
+    resumed = _read_sse(client, "sse1", last_event_id=ids[-2])
+    assert [seq for seq, _, _ in resumed] == [ids[-1], None]
+
+    assert client.get("/api/job/missing/events").status_code == 404
+
+
+def test_web_upload_returns_immediately_with_progress_page(monkeypatch):
+    def fake(input_media, src_lang, dst_langs, audio_only, job_id, quality="auto"):
+        JOB_STORE.update(job_id, state="completed", output=str(input_media), outputs={dst_langs[0]: str(input_media)})
+        return {dst_langs[0]: input_media}
+
+    monkeypatch.setattr(pipeline, "_run_media_pipeline", fake)
+    r = TestClient(app).post("/upload", files={"file": ("clip.wav", b"data", "audio/wav")}, data={"dst_lang": "pt"})
+    assert r.status_code == 200
+    assert "new EventSource(\"/api/job/" in r.text
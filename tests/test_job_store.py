@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from app.services.job_store import JobStore
+
+
+def _store(tmp_path: Path) -> JobStore:
+    return JobStore(tmp_path / "jobs.sqlite3")
+
+
+def test_claim_is_exclusive_and_fifo(tmp_path: Path):
+    store = _store(tmp_path)
+    store.create_job("a", {"input": "a.wav"}, {"phases": []})
+    store.create_job("b", {"input": "b.wav"}, {"phases": []})
+
+    assert store.claim_next("w1") == ("a", {"input": "a.wav"})
+    assert store.claim_job("a", "w2") is None
+    assert store.claim_next("w2")[0] == "b"
+    assert store.claim_next("w3") is None
+    assert store.get("a")["worker"] == "w1"
+    assert store.count_by_state() == {"running": 2}
+
+
+def test_state_survives_reopen(tmp_path: Path):
+    store = _store(tmp_path)
+    store.create_job("j", {"input": "x"}, {"phases": []})
+    store.append_phase("j", {"phase": "asr", "seconds": 1.0})
+    store.update("j", state="completed", output="out.wav")
+    store.incr_metric("tts_fail")
+    store.incr_metric("tts_fail")
+
+    reopened = _store(tmp_path)
+    info = reopened.get("j")
+    assert info["state"] == "completed"
+    assert info["phases"] == [{"phase": "asr", "seconds": 1.0}]
+    assert reopened.metrics()["tts_fail"] == 2
+    assert reopened.recent(5)[0]["job_id"] == "j"
+
+
+def test_worker_drains_queue(tmp_path: Path, monkeypatch):
+    from app import worker
+    from app.services import pipeline
+
+    store = _store(tmp_path)
+    monkeypatch.setattr(worker, "JOB_STORE", store)
+    monkeypatch.setattr(pipeline, "run_job", lambda job_id, params: store.update(job_id, state="completed"))
+    store.create_job("q1", {"input": "x"}, {"phases": []})
+
+    assert worker.run_worker(poll_interval=0.01, max_jobs=1) == 1
+    assert store.get("q1")["state"] == "completed"
+
+
+def test_default_db_is_not_under_the_served_outputs_dir(monkeypatch):
+    from app.config import Settings
+
+    for name in ("DATA_DIR", "JOBS_DB_PATH", "OUTPUTS_DIR"):
+        monkeypatch.delenv(name, raising=False)
+    defaults = Settings(_env_file=None)
+    assert defaults.outputs_dir.resolve() not in defaults.jobs_db_path.resolve().parents
+
+
+def test_worker_and_inline_recovery_prune_old_events(tmp_path: Path, monkeypatch):
+    import asyncio
+
+    from app import worker
+    from app.services import pipeline
+
+    store = _store(tmp_path)
+    monkeypatch.setattr(worker, "JOB_STORE", store)
+    monkeypatch.setattr(pipeline, "JOB_STORE", store)
+    monkeypatch.setattr(pipeline, "run_job", lambda job_id, params: store.update(job_id, state="completed"))
+    monkeypatch.setattr(pipeline.settings, "job_events_retention_s", -1.0)  # everything is already expired
+
+    store.add_event("old", "phase_start", {})
+    store.create_job("q1", {"input": "x"}, {"phases": []})
+    worker.run_worker(poll_interval=0.01, max_jobs=1)
+    assert store.events_since("old") == []
+
+    store.add_event("old", "phase_start", {})
+    monkeypatch.setattr(pipeline.settings, "job_stale_after_s", 0.0)  # one tick per second
+
+    async def one_tick():
+        task = asyncio.create_task(pipeline.recovery_loop())
+        await asyncio.sleep(1.5)
+        task.cancel()
+
+    asyncio.run(one_tick())
+    assert store.events_since("old") == []
@@ -0,0 +1,107 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import pipeline
+from app.services.job_store import JOB_STORE
+
+
+def _fake_pipeline(input_media, src_lang, dst_langs, audio_only, job_id, quality="auto", input_digest=None):
+    outputs = {}
+    for lang in dst_langs:
+        outputs[lang] = input_media.with_suffix(f".{lang}.dubbed.wav")
+        outputs[lang].write_bytes(f"RIFF{lang}".encode())
+    JOB_STORE.update(
+        job_id, state="completed", output=str(outputs[dst_langs[0]]), outputs={k: str(v) for k, v in outputs.items()}
+    )
+    return outputs
+
+
+def _wait_for_state(client, job_id, states, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        info = client.get(f"/api/job/{job_id}").json()
+        if info["state"] in states:
+            return info
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not reach {states}")
+
+
+def test_submit_returns_202_and_download(monkeypatch):
+    monkeypatch.setattr(pipeline, "_run_media_pipeline", _fake_pipeline)
+    client = TestClient(app)
+    r = client.post("/api/jobs", files={"file": ("clip.wav", b"data", "audio/wav")}, data={"dst_lang": "pt"})
+    assert r.status_code == 202
+    body = r.json()
+    assert body["state"] == "queued"
+    assert r.headers["Location"] == f"/api/job/{body['job_id']}"
+
+    info = _wait_for_state(client, body["job_id"], {"completed"})
+    assert info["dst"] == "pt"
+
+    d = client.get(body["download_url"])
+    assert d.status_code == 200
+    assert d.content == b"RIFFpt"
+
+
+def test_multi_language_job_downloads_each_language(monkeypatch):
+    monkeypatch.setattr(pipeline, "_run_media_pipeline", _fake_pipeline)
+    client = TestClient(app)
+    r = client.post("/api/jobs", files={"file": ("clip.wav", b"data", "audio/wav")}, data={"dst_lang": "pt, es,pt"})
+    job_id = r.json()["job_id"]
+
+    info = _wait_for_state(client, job_id, {"completed"})
+    assert info["dst_langs"] == ["pt", "es"]
+    assert client.get(f"/api/job/{job_id}/download", params={"lang": "es"}).content == b"RIFFes"
+    assert client.get(f"/api/job/{job_id}/download", params={"lang": "fr"}).status_code == 404
+
+
+def test_failed_job_reports_state_and_blocks_download(monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("asr exploded")
+
+    monkeypatch.setattr(pipeline, "_run_media_pipeline", boom)
+    client = TestClient(app)
+    r = client.post("/api/jobs", files={"file": ("clip.wav", b"data", "audio/wav")})
+    job_id = r.json()["job_id"]
+
+    info = _wait_for_state(client, job_id, {"failed"})
+    assert "asr exploded" in info["error"]
+    assert client.get(f"/api/job/{job_id}/download").status_code == 409
+
+
+def test_cached_result_completes_at_submit_without_queueing(monkeypatch):
+    from app.services.disk_cache import hash_file
+    from app.services.result_cache import RESULT_CACHE, result_cache_key
+
+    scheduled = []
+    monkeypatch.setattr(pipeline, "_schedule", scheduled.append)  # all executor slots "busy"
+    monkeypatch.setattr(pipeline, "has_ffmpeg", lambda: False)
+    upload = b"repeat upload"
+    digest = hash_file(_write(pipeline.settings.uploads_dir / "digest-probe.wav", upload))
+    cached = _write(pipeline.settings.uploads_dir / "cached.wav", b"RIFFcached")
+    RESULT_CACHE.put_file(result_cache_key(digest, "en", "pt", True), cached, suffix=".wav")
+
+    client = TestClient(app)
+    r = client.post("/api/jobs", files={"file": ("again.wav", upload, "audio/wav")}, data={"src_lang": "en", "dst_lang": "pt"})
+    assert r.status_code == 202 and r.json()["state"] == "completed"
+    assert scheduled == []
+    info = JOB_STORE.get(r.json()["job_id"])
+    assert info["state"] == "completed" and info["cache_hit"] is True
+    assert client.get(r.json()["download_url"]).content == b"RIFFcached"
+
+    # A miss is queued as before
+    r = client.post("/api/jobs", files={"file": ("new.wav", b"new upload", "audio/wav")}, data={"src_lang": "en", "dst_lang": "pt"})
+    assert r.json()["state"] == "queued" and scheduled == [r.json()["job_id"]]
+
+
+def _write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_unknown_job_download_404():
+    client = TestClient(app)
+    assert client.get("/api/job/nope/download").status_code == 404
@@ -0,0 +1,69 @@
+import numpy as np
+import soundfile as sf
+
+from app.services import asr, pipeline
+from app.services.asr import Segment, speech_prefix
+from app.services.job_store import JOB_STORE
+
+
+def test_speech_prefix_skips_leading_silence(monkeypatch):
+    monkeypatch.setattr(asr.settings, "asr_vad", "energy")
+    t = np.arange(16000 * 4) / 16000
+    speech = (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    audio = np.concatenate([np.zeros(16000 * 10, dtype=np.float32), speech])
+    prefix = speech_prefix(audio, 2.0)
+    assert len(prefix) == 2 * 16000
+    assert np.abs(prefix).max() > 0.1  # speech, not the 10 s of silence
+
+
+def test_speech_prefix_skips_quiet_intro_even_with_asr_vad_off(monkeypatch):
+    monkeypatch.setattr(asr.settings, "asr_vad", "off")
+    rng = np.random.default_rng(0)
+    intro = (1e-4 * rng.standard_normal(16000 * 15)).astype(np.float32)  # room tone, about -80 dBFS
+    t = np.arange(16000 * 4) / 16000
+    speech = (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    prefix = speech_prefix(np.concatenate([intro, speech]), 2.0)
+    assert len(prefix) == 2 * 16000
+    assert np.sqrt(np.mean(prefix ** 2)) > 0.1  # the tone, not the first 2 s of room tone
+
+
+def test_speech_prefix_stops_scanning_once_enough_speech_is_found(monkeypatch, tmp_path):
+    monkeypatch.setattr(asr.settings, "asr_vad", "energy")
+    scanned = []
+    regions = asr.speech_regions
+    monkeypatch.setattr(asr, "speech_regions", lambda window, mode=None: scanned.append(len(window)) or regions(window, mode))
+    t = np.arange(16000 * 5) / 16000
+    speech = (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    audio = np.concatenate([np.zeros(16000 * 40, dtype=np.float32), speech, np.zeros(16000 * 600, dtype=np.float32)])
+
+    prefix = speech_prefix(audio, 2.0)
+    assert len(prefix) == 2 * 16000 and np.abs(prefix).max() > 0.1
+    assert sum(scanned) <= 60 * 16000  # two 30 s windows of a 645 s track
+
+    # Files are read window by window and give the same prefix
+    path = tmp_path / "long.wav"
+    sf.write(str(path), audio, 16000)
+    scanned.clear()
+    assert np.allclose(speech_prefix(path, 2.0), prefix, atol=1e-4)
+    assert sum(scanned) <= 60 * 16000
+
+
+def test_auto_source_language_is_detected_once_and_propagated(fake_pipeline, monkeypatch):
+    langid = []
+
+    def identify(source, seconds=None, tier=None):
+        langid.append(source)
+        return "es", 0.93
+
+    monkeypatch.setattr(pipeline, "identify_language", identify)
+    fake_pipeline.segments = [Segment(0.0, 1.0, "hola")]
+    media = fake_pipeline.media("auto.wav", b"auto language media")
+
+    pipeline._register_job("langid1", media, "auto", ["pt", "en"], True)
+    pipeline.run_job("langid1", JOB_STORE.claim_job("langid1", "test"))
+
+    info = JOB_STORE.get("langid1")
+    assert info["detected_language"] == "es" and info["language_probability"] == 0.93
+    assert len(langid) == 1 and fake_pipeline.calls["asr"] == ["es"]
+    assert {src for src, _ in fake_pipeline.calls["translate"]} == {"es"}
+    assert [p["phase"] for p in info["phases"]][:2] == ["extract_audio", "langid"]
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import numpy as np
+
+from app.services import pipeline
+from app.services.job_store import JOB_STORE
+
+
+def test_fan_out_runs_asr_once_and_reports_per_language_phases(fake_pipeline):
+    fake_pipeline.translate = lambda text, src, dst: f"{dst}:{text}"
+    media = fake_pipeline.media("talk.wav", b"fan-out media")
+
+    pipeline._register_job("fan1", media, "en", ["pt", "es", "de"], True)
+    output = pipeline.run_job("fan1", JOB_STORE.claim_job("fan1", "test"))
+
+    info = JOB_STORE.get("fan1")
+    assert info["state"] == "completed"
+    calls = fake_pipeline.calls
+    assert calls["extract"] == 1 and len(calls["asr"]) == 1
+    assert sorted(calls["tts"]) == ["de", "es", "pt"]
+    assert set(info["outputs"]) == {"pt", "es", "de"}
+    assert output == Path(info["outputs"]["pt"]) and output.name == "talk.pt.dubbed.wav"
+    per_lang = {(p["phase"], p["lang"]) for p in info["phases"] if "lang" in p}
+    assert ("translate", "es") in per_lang and ("tts_clone", "de") in per_lang and ("mux", "pt") in per_lang
+
+
+def test_pcm_pipe_shares_one_buffer_and_skips_wav_without_checkpoints(fake_pipeline, monkeypatch):
+    fake_pipeline.pcm = pcm = np.full(16000, 0.25, dtype=np.float32)
+    monkeypatch.setattr(pipeline.settings, "pipeline_pcm_pipe", True)
+    monkeypatch.setattr(pipeline.settings, "job_checkpoints_enabled", False)
+    media = fake_pipeline.media("pipe.wav", b"pipe media")
+
+    pipeline._register_job("pipe1", media, "en", ["pt"], True)
+    pipeline.run_job("pipe1", JOB_STORE.claim_job("pipe1", "test"))
+
+    seen = fake_pipeline.calls["asr_sources"] + fake_pipeline.calls["tts_references"]
+    assert len(seen) == 2 and all(s is pcm for s in seen)
+    assert not media.with_suffix(".16k.wav").exists()
+    assert not (pipeline.settings.data_dir / "jobs" / "pipe1").exists()
+
+
+def test_pcm_s16le_decoding():
+    from app.services.media import pcm_s16le_to_float32
+
+    raw = np.array([0, 16384, -32768, 32767], dtype="<i2").tobytes()
+    audio = pcm_s16le_to_float32(raw)
+    assert audio.dtype == np.float32
+    assert audio.tolist() == [0.0, 0.5, -1.0, 32767 / 32768]
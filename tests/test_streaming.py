@@ -0,0 +1,63 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.services.streaming import StreamingStages
+
+
+def test_stages_overlap_and_preserve_order():
+    def source():
+        for i in range(6):
+            time.sleep(0.02)
+            yield i
+
+    def slow_double(x):
+        time.sleep(0.02)
+        return x * 2
+
+    runner = StreamingStages("src", source, [("double", slow_double), ("inc", lambda x: x + 1)], maxsize=2)
+    t0 = time.perf_counter()
+    out = list(runner.run())
+    elapsed = time.perf_counter() - t0
+
+    assert out == [1, 3, 5, 7, 9, 11]
+    # Sequential would be ~0.24s; overlapped stages approach the slowest one (~0.12s)
+    assert elapsed < 0.22
+    assert runner.busy["src"] > 0 and runner.busy["double"] > 0
+
+
+def test_stage_error_propagates_and_stops_source():
+    produced = []
+
+    def source():
+        for i in range(1000):
+            produced.append(i)
+            yield i
+
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError("bad segment")
+        return x
+
+    before = threading.active_count()
+    with pytest.raises(ValueError, match="bad segment"):
+        list(StreamingStages("src", source, [("check", fail_on_three)], maxsize=2).run())
+    # Bounded queues keep the source from racing through the whole input
+    assert len(produced) < 1000
+    assert threading.active_count() <= before
+
+
+def test_streamed_translate_samples_carry_their_language(fake_pipeline, monkeypatch):
+    from app.services import pipeline
+    from app.services.job_store import JOB_STORE
+
+    monkeypatch.setattr(pipeline, "translate_text", lambda text, src, dst, stats=None: f"{dst}:{text}")
+    monkeypatch.setattr(pipeline, "needs_segment_level_clone", lambda: True)
+    JOB_STORE.create_job("stream-lang", {"input": "x"}, {"phases": []})
+
+    pipeline._streaming_phases("stream-lang", np.zeros(16000, dtype=np.float32), "en", "es")
+
+    samples = [e["data"] for e in JOB_STORE.events_since("stream-lang") if e["event"] == "translate_sample"]
+    assert samples and all(sample["lang"] == "es" for sample in samples)
@@ -0,0 +1,104 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import asr
+from app.services.asr import Segment
+
+
+def test_repeated_transcription_is_served_from_cache(monkeypatch):
+    calls = []
+
+    def fake_transcribe(audio, language=None, stats=None, tier=None):
+        calls.append(language)
+        stats.update({"duration_s": 2.0, "speech_s": 1.5})
+        yield Segment(0.1234, 1.0, "olá mundo")
+        yield Segment(1.0, 1.9, "tchau")
+
+    monkeypatch.setattr(asr, "_transcribe_iter", fake_transcribe)
+    pcm = np.random.default_rng(7).standard_normal(32000).astype(np.float32)
+
+    first = asr.transcribe(pcm, language="pt")
+    stats = {}
+    second = asr.transcribe(pcm.copy(), language="pt", stats=stats)
+    assert calls == ["pt"]
+    assert [(round(s.start, 3), s.end, s.text) for s in second] == [(0.123, 1.0, "olá mundo"), (1.0, 1.9, "tchau")]
+    assert [s.text for s in first] == [s.text for s in second]
+    assert stats == {"duration_s": 2.0, "speech_s": 1.5}
+
+    # Another language (or different audio) is a different key
+    asr.transcribe(pcm, language="es")
+    asr.transcribe(pcm[:16000], language="pt")
+    assert calls == ["pt", "es", "pt"]
+
+    cache = TestClient(app).get("/api/status").json()["transcript_cache"]
+    assert cache["hits"] >= 1 and cache["misses"] >= 3
+    assert 0 < cache["hit_rate"] < 1 and cache["entries"] >= 3
+
+
+def test_interrupted_transcription_is_not_cached(monkeypatch):
+    def failing(audio, language=None, stats=None, tier=None):
+        yield Segment(0.0, 1.0, "partial")
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(asr, "_transcribe_iter", failing)
+    pcm = np.full(16000, 0.01, dtype=np.float32)
+    for _ in range(2):
+        try:
+            asr.transcribe(pcm, language="en")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("partial transcript was served from cache")
+
+
+def test_result_key_tracks_batched_decoding_settings(monkeypatch):
+    from app.services.result_cache import result_cache_key
+
+    def key():
+        return result_cache_key("digest", "en", "pt", False)
+
+    monkeypatch.setattr(asr.settings, "asr_batching", False)
+    sequential = key()
+    monkeypatch.setattr(asr.settings, "asr_beam_size", 1)
+    assert key() == sequential  # beam size only matters to batched decoding
+    monkeypatch.setattr(asr.settings, "asr_batching", True)
+    batched = key()
+    assert batched != sequential
+    monkeypatch.setattr(asr.settings, "asr_beam_size", 5)
+    assert key() != batched
+
+
+def test_transcript_key_tracks_chunking_settings(monkeypatch):
+    from app.services.transcript_cache import transcript_cache_key
+
+    base = transcript_cache_key("pcm", "en")
+    monkeypatch.setattr(asr.settings, "asr_chunk_target_s", asr.settings.asr_chunk_target_s + 30)
+    retargeted = transcript_cache_key("pcm", "en")
+    assert retargeted != base
+    monkeypatch.setattr(asr.settings, "asr_chunk_min_duration_s", asr.settings.asr_chunk_min_duration_s + 60)
+    assert transcript_cache_key("pcm", "en") != retargeted
+
+
+def test_result_key_tracks_every_asr_and_langid_setting(monkeypatch):
+    from app.services.result_cache import result_cache_key
+
+    changes = {
+        "asr_vad": "energy",
+        "asr_vad_min_silence_ms": 250,
+        "asr_vad_energy_threshold_db": -30.0,
+        "asr_chunk_min_duration_s": 60.0,
+        "asr_chunk_target_s": 45.0,
+        "asr_langid_enabled": False,
+        "asr_langid_seconds": 5.0,
+    }
+    for name, value in changes.items():
+        with monkeypatch.context() as m:
+            fixed = result_cache_key("digest", "en", "pt", False)
+            auto = result_cache_key("digest", "auto", "pt", False)
+            m.setattr(asr.settings, name, value)
+            assert result_cache_key("digest", "auto", "pt", False) != auto, name
+            if not name.startswith("asr_langid"):
+                assert result_cache_key("digest", "en", "pt", False) != fixed, name
+            else:
+                assert result_cache_key("digest", "en", "pt", False) == fixed  # no detection for a fixed source
@@ -0,0 +1,193 @@
+import argostranslate.translate
+
+from app.services import translate
+
+
+class _Tokenizer:
+    def encode(self, sentence):
+        return sentence.split()
+
+    def decode(self, tokens):
+        return " " + " ".join(tokens)
+
+
+class _Pkg:
+    tokenizer = _Tokenizer()
+    target_prefix = ""
+
+
+class _Translator:
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, tokenized, **kwargs):
+        self.calls.append((len(tokenized), kwargs["max_batch_size"]))
+        return [type("Result", (), {"hypotheses": [[t.upper() for t in tokens]]})() for tokens in tokenized]
+
+
+def _package_translation(translator):
+    pt = object.__new__(argostranslate.translate.PackageTranslation)
+    pt.pkg, pt.translator, pt.sentencizer = _Pkg(), translator, None
+    return type("Cached", (), {"underlying": pt})()
+
+
+def test_segments_are_translated_in_one_batched_call(monkeypatch):
+    translator = _Translator()
+    monkeypatch.setattr(translate, "ensure_translation_package", lambda src, dst: True)
+    monkeypatch.setattr(translate, "get_translation", lambda src, dst: _package_translation(translator))
+    monkeypatch.setattr(translate.settings, "translation_batch_size", 16)
+    monkeypatch.setattr(translate.settings, "translation_memory_enabled", False)
+
+    out = translate.translate_batch(["hello there", "", "good morning"], "en", "pt")
+
+    assert out == ["HELLO THERE", "", "GOOD MORNING"]
+    assert translator.calls == [(2, 16)]  # blank segments never reach the model
+    assert translate.translate_batch(["same"], "pt", "pt") == ["same"]
+
+
+def test_batch_failure_falls_back_per_segment(monkeypatch):
+    def boom(src, dst):
+        raise RuntimeError("model missing")
+
+    monkeypatch.setattr(translate, "ensure_translation_package", lambda src, dst: True)
+    monkeypatch.setattr(translate, "get_translation", boom)
+    monkeypatch.setattr(translate, "_translate_one", lambda text, src, dst: f"{dst}:{text}")
+    monkeypatch.setattr(translate.settings, "translation_memory_enabled", False)
+    assert translate.translate_batch(["a", "b"], "en", "pt") == ["pt:a", "pt:b"]
+
+
+def test_installed_index_is_scanned_once_and_refreshed_on_install(monkeypatch):
+    scans = []
+    installed = [type("Pkg", (), {"from_code": "en", "to_code": "pt"})()]
+
+    def get_installed_packages():
+        scans.append(1)
+        return list(installed)
+
+    def install_from_path(path):
+        installed.append(type("Pkg", (), {"from_code": "en", "to_code": "es"})())
+
+    monkeypatch.setattr(translate.argostranslate.package, "get_installed_packages", get_installed_packages)
+    monkeypatch.setattr(translate.argostranslate.package, "install_from_path", install_from_path)
+    monkeypatch.setattr(translate, "_OFFLINE_ONLY", True)
+    translate.invalidate_translation_cache()
+    try:
+        assert all(translate.ensure_translation_package("en", "pt") for _ in range(50))
+        assert len(scans) == 1
+
+        resolved = []
+        monkeypatch.setattr(argostranslate.translate, "get_translation_from_codes", lambda s, d: resolved.append((s, d)) or object())
+        assert translate.get_translation("en", "pt") is translate.get_translation("en", "pt")
+        assert resolved == [("en", "pt")]
+
+        translate.install_package("en_es.argosmodel")
+        assert translate.ensure_translation_package("en", "es")
+        assert len(scans) == 2
+        translate.get_translation("en", "pt")
+        assert resolved == [("en", "pt")] * 2  # loaded translations were dropped with the index
+    finally:
+        translate.invalidate_translation_cache()
+
+
+def test_repeated_segments_are_served_from_translation_memory(monkeypatch):
+    from app.services.translation_memory import TRANSLATION_MEMORY
+
+    translated = []
+
+    def neural(texts, src, dst):
+        translated.extend(texts)
+        return [f"<{dst}>{t.strip()}" for t in texts]
+
+    monkeypatch.setattr(translate, "ensure_translation_package", lambda src, dst: True)
+    monkeypatch.setattr(translate, "_package_version", lambda src, dst: "1.0")
+    monkeypatch.setattr(translate, "_translate_many", neural)
+    TRANSLATION_MEMORY.clear()
+
+    stats = {}
+    assert translate.translate_batch(["Welcome back!", "Thanks for watching"], "en", "pt", stats=stats) == [
+        "<pt>Welcome back!",
+        "<pt>Thanks for watching",
+    ]
+    assert stats == {"tm_hits": 0, "tm_misses": 2}
+
+    # Whitespace variants hit; the LRU is bypassed to prove the SQLite tier persists entries
+    TRANSLATION_MEMORY._lru.clear()
+    stats = {}
+    out = translate.translate_batch(["Welcome   back!", "Subscribe"], "en", "pt", stats=stats)
+    assert out == ["<pt>Welcome back!", "<pt>Subscribe"]
+    assert stats == {"tm_hits": 1, "tm_misses": 1}
+    assert translated == ["Welcome back!", "Thanks for watching", "Subscribe"]
+
+    # Another package version (or pair) is a different key
+    monkeypatch.setattr(translate, "_package_version", lambda src, dst: "1.1")
+    translate.translate_batch(["Subscribe"], "en", "pt")
+    assert translated[-1] == "Subscribe" and len(translated) == 4
+
+    # The translate phase records per-job hits/misses
+    from app.services import pipeline
+    from app.services.asr import Segment
+    from app.services.job_store import JOB_STORE
+
+    JOB_STORE.create_job("tm1", {"input": "x"}, {"phases": []})
+    pipeline._translate_phase("tm1", [Segment(0, 1, "Subscribe"), Segment(1, 2, "Bye")], "en", "pt")
+    info = JOB_STORE.get("tm1")
+    assert (info["tm_hits"], info["tm_misses"]) == (1, 1)
+    assert info["phases"][-1]["tm_hits"] == 1
+
+
+def test_fallback_dictionary_is_a_single_pass_longest_match():
+    out = translate._fallback_translate("Hello, See you later my friend. Good morning!", "en", "pt")
+    assert out == "olá, até mais tarde meu amigo. bom dia!"
+    # Replacements are never re-translated ("bom" must not be looked up again)
+    assert translate._fallback_translate("good", "en", "pt") == "bom"
+    assert translate._fallback_translate("hello", "en", "xx") == "hello"
+    assert translate._fallback_matcher("en", "pt") is translate._fallback_matcher("en", "pt")
+
+
+def test_marian_backend_translates_through_ctranslate2(monkeypatch, tmp_path):
+    import ctranslate2
+    import sentencepiece
+    from types import SimpleNamespace
+
+    calls = []
+
+    class FakeTranslator:
+        def __init__(self, model_dir, **kwargs):
+            calls.append(("load", kwargs))
+
+        def translate_batch(self, batch, **kwargs):
+            calls.append(("batch", batch, kwargs))
+            return [SimpleNamespace(hypotheses=[[t.upper() for t in tokens[1:-1]]]) for tokens in batch]
+
+    class FakeSentencePiece:
+        def __init__(self, model_file):
+            pass
+
+        def encode(self, text, out_type=str):
+            return text.split()
+
+        def decode(self, pieces):
+            return " ".join(pieces)
+
+    monkeypatch.setattr(ctranslate2, "Translator", FakeTranslator)
+    monkeypatch.setattr(sentencepiece, "SentencePieceProcessor", FakeSentencePiece)
+    monkeypatch.setattr(translate.settings, "translation_backend", "marian")
+    monkeypatch.setattr(translate.settings, "translation_memory_enabled", False)
+    monkeypatch.setattr(translate.settings, "marian_models_dir", tmp_path)
+    monkeypatch.setattr(translate.settings, "marian_beam_size", 3)
+    monkeypatch.setattr(translate.settings, "marian_source_prefixes", "en-pt=>>por<<")
+    monkeypatch.setattr(translate, "_MARIAN", {})
+    (tmp_path / "opus-mt-en-pt").mkdir()
+    (tmp_path / "opus-mt-en-pt" / "model.bin").write_bytes(b"x")
+
+    out = translate.translate_batch(["hello world. good bye", " ", "hi"], "en", "pt")
+    assert out == ["HELLO WORLD. GOOD BYE", " ", "HI"]
+    assert calls[0] == ("load", {"device": "cpu", "compute_type": "int8", "inter_threads": 1, "intra_threads": 0})
+    _, batch, kwargs = calls[1]
+    assert batch == [[">>por<<", "hello", "world.", "</s>"], [">>por<<", "good", "bye", "</s>"], [">>por<<", "hi", "</s>"]]
+    assert kwargs["beam_size"] == 3
+    assert translate.translate_text("good bye", "en", "pt") == "GOOD BYE"
+    assert translate.loaded_marian_models() == ["en-pt"]
+
+    # No converted model for the pair: dictionary fallback, no Argos lookup
+    assert translate.translate_text("hello", "en", "es") == "hello"
@@ -0,0 +1,216 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+
+from app.services import tts
+
+
+class FakeEngine:
+    def __init__(self, log):
+        self.log = log
+        self.props = {}
+        self.pending = []
+
+    def getProperty(self, name):
+        self.log.append(("get", name))
+        return [
+            SimpleNamespace(id="english-us", name="English (America)"),
+            SimpleNamespace(id="brazil", name="Portuguese (Brazil)"),
+        ]
+
+    def setProperty(self, name, value):
+        self.log.append(("set", name, value))
+        self.props[name] = value
+
+    def save_to_file(self, text, path):
+        self.pending.append((text, path))
+
+    def runAndWait(self):
+        for text, path in self.pending:
+            if text == "boom":
+                raise RuntimeError("driver died")
+            sf.write(path, np.full(len(text) * 100, 0.5, dtype=np.float32), 22050)
+        self.pending = []
+
+
+def test_engine_and_voices_are_reused_across_segments(monkeypatch):
+    log = []
+    inits = []
+
+    def init():
+        inits.append(1)
+        return FakeEngine(log)
+
+    monkeypatch.setitem(sys.modules, "pyttsx3", SimpleNamespace(init=init))
+    monkeypatch.setattr(tts, "TTS_ENGINE", tts.TTSEngineService())
+
+    for text in ["olá mundo", "tudo bem", "até logo"]:
+        audio = tts.synthesize_segment(text, language="pt", sr=16000)
+        assert audio.dtype == np.float32 and len(audio) == int(len(text) * 100 * 16000 / 22050)
+    tts.synthesize_segment("hello", language="en")
+    tts.synthesize_segment("oi", language="pt")
+
+    assert len(inits) == 1
+    assert log.count(("get", "voices")) == 1
+    # voice/rate/volume are pushed only when the language changes
+    assert [entry[2] for entry in log if entry[:2] == ("set", "voice")] == ["brazil", "english-us", "brazil"]
+    assert tts.TTS_ENGINE.stats()["voices"] == {"pt": "brazil", "en": "english-us"}
+
+    # A driver failure falls back to the tone and re-creates the engine for the next segment
+    fallback = tts.synthesize_segment("boom", language="pt")
+    assert len(fallback) == int(16000 * 0.3)
+    tts.synthesize_segment("de novo", language="pt")
+    assert len(inits) == 2
+
+    tts.TTS_ENGINE.refresh()
+    assert tts.get_best_voice_for_language("en").id == "english-us"
+    assert log.count(("get", "voices")) == 2
+
+
+def test_job_segments_are_rendered_in_batched_engine_runs(monkeypatch):
+    runs = []
+
+    class CountingEngine(FakeEngine):
+        def runAndWait(self):
+            runs.append([text for text, _ in self.pending])
+            super().runAndWait()
+
+    monkeypatch.setitem(sys.modules, "pyttsx3", SimpleNamespace(init=lambda: CountingEngine([])))
+    monkeypatch.setattr(tts, "TTS_ENGINE", tts.TTSEngineService())
+    monkeypatch.setattr(tts.settings, "tts_batch_size", 3)
+
+    segments = [(0.0, 1.0, "um"), (1.0, 1.5, ""), (1.5, 3.0, "dois"), (3.0, 4.0, "tres"), (4.0, 5.0, "quatro")]
+    audio = tts.synthesize_segments(segments, target_language="pt", sr=16000)
+    assert len(audio) == 5 * 16000
+    assert runs == [["um", "dois", "tres"], ["quatro"]]
+    assert np.all(audio[16000:24000] == 0)  # empty text keeps its silent slot
+
+    # A failing batch is re-rendered segment by segment; only the bad one becomes the tone
+    runs.clear()
+    out = tts.synthesize_batch(["ok", "boom", "fim"], language="pt", sr=16000)
+    assert runs[0] == ["ok", "boom", "fim"] and runs[1:] == [["ok"], ["boom"], ["fim"]]
+    assert len(out[0]) == int(200 * 16000 / 22050) and len(out[1]) == int(16000 * 0.3)
+
+
+def test_pooled_rendering_recycles_crashed_and_hung_workers(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    pools, recycled = [], []
+
+    def pool():
+        if not pools:
+            pools.append(ThreadPoolExecutor(max_workers=2))
+        return pools[-1]
+
+    def recycle(stale=None):
+        if pools and stale in (None, pools[-1]):
+            recycled.append(1)
+            pools.pop().shutdown(wait=False)
+
+    def render(texts, language, sr):
+        if "crash" in texts:
+            raise BrokenProcessPool("worker died")
+        if "hang" in texts:
+            time.sleep(0.5)
+        return [np.full(len(t), 1.0, dtype=np.float32) for t in texts]
+
+    monkeypatch.setattr(tts, "_tts_pool", pool)
+    monkeypatch.setattr(tts, "_recycle_tts_pool", recycle)
+    monkeypatch.setattr(tts, "_render_local", render)
+    monkeypatch.setattr(tts.settings, "tts_processes", 2)
+    monkeypatch.setattr(tts.settings, "tts_batch_size", 2)
+    monkeypatch.setattr(tts.settings, "tts_worker_timeout_s", 0.2)
+
+    out = tts.synthesize_batch(["a", "bb", "crash", "ccc", "hang", "dd"], language="pt", sr=16000)
+    assert [len(a) for a in out] == [1, 2, int(16000 * 0.3), 3, int(16000 * 0.3), 2]
+    assert len(recycled) >= 3  # crash, hang, hang again on its single-segment retry
+
+
+def test_repeated_phrases_are_served_from_the_disk_cache(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    rendered = []
+
+    class RecordingEngine(FakeEngine):
+        def save_to_file(self, text, path):
+            rendered.append(text)
+            super().save_to_file(text, path)
+
+    monkeypatch.setitem(sys.modules, "pyttsx3", SimpleNamespace(init=lambda: RecordingEngine([])))
+    monkeypatch.setattr(tts, "TTS_ENGINE", tts.TTSEngineService())
+
+    first = tts.synthesize_batch(["Bem-vindo ao canal!", "Inscreva-se", "Bem-vindo  ao canal!"], language="pt")
+    assert rendered == ["Bem-vindo ao canal!", "Inscreva-se"]
+    assert first[2] is first[0]
+
+    # Later jobs (and the streaming path) read FLAC instead of running the engine
+    again = tts.synthesize_segment("Bem-vindo ao canal!", language="pt")
+    assert rendered == ["Bem-vindo ao canal!", "Inscreva-se"]
+    assert again.dtype == np.float32 and np.allclose(again, first[0], atol=1e-4)
+
+    # Voice parameters are part of the key
+    monkeypatch.setitem(tts.VOICE_CONFIG["pt"], "rate", 200)
+    tts.synthesize_segment("Bem-vindo ao canal!", language="pt")
+    assert rendered[-1] == "Bem-vindo ao canal!" and len(rendered) == 3
+
+    cache = TestClient(app).get("/api/status").json()["tts_cache"]
+    assert cache["hits"] >= 1 and cache["entries"] >= 3
+
+
+def test_concurrent_jobs_share_the_pool_without_false_hang_recycles(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    shared = ThreadPoolExecutor(max_workers=2)
+    recycled = []
+
+    def render(texts, language, sr):
+        time.sleep(0.3 * len(texts))
+        return [np.full(len(t), 1.0, dtype=np.float32) for t in texts]
+
+    monkeypatch.setattr(tts, "_tts_pool", lambda: shared)
+    monkeypatch.setattr(tts, "_recycle_tts_pool", lambda pool=None: recycled.append(pool))
+    monkeypatch.setattr(tts, "_render_local", render)
+    monkeypatch.setattr(tts.settings, "tts_processes", 2)
+    monkeypatch.setattr(tts.settings, "tts_worker_timeout_s", 0.8)
+
+    # Three jobs (or fan-out languages) submit 2 batches of 0.6 s each to 2 workers at once
+    texts = ["a", "bb", "ccc", "dddd"]
+    with ThreadPoolExecutor(max_workers=3) as callers:
+        outputs = list(callers.map(lambda _: tts.synthesize_batch(texts, language="pt", sr=16000), range(3)))
+    shared.shutdown()
+    assert recycled == []
+    assert all([len(a) for a in out] == [1, 2, 3, 4] for out in outputs)
+
+
+def test_recycle_kills_the_workers_that_announced_themselves(monkeypatch):
+    import queue
+
+    class Pool:  # no private executor state to lean on
+        def shutdown(self, wait=True, cancel_futures=False):
+            self.shut = (wait, cancel_futures)
+
+    class Pids(queue.SimpleQueue):
+        def empty(self):
+            return self.qsize() == 0
+
+    pool, pids, killed = Pool(), Pids(), []
+    tts._announce_tts_worker(pids)  # what each worker runs at startup
+    assert pids.get() == tts.os.getpid()
+    pids.put(101)
+    pids.put(102)
+    monkeypatch.setattr(tts, "_TTS_POOL", pool)
+    monkeypatch.setattr(tts, "_TTS_WORKER_PIDS", pids)
+    monkeypatch.setattr(tts.os, "kill", lambda pid, sig: killed.append(pid))
+
+    tts._recycle_tts_pool(object())  # another generation: left alone
+    assert killed == [] and tts._TTS_POOL is pool
+    tts._recycle_tts_pool(pool)
+    assert killed == [101, 102] and pool.shut == (False, True)
+    assert tts._TTS_POOL is None and tts._TTS_WORKER_PIDS is None
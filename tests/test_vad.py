@@ -0,0 +1,66 @@
+import numpy as np
+
+from app.services import asr
+from app.services.asr import detect_speech
+
+
+class _FakeModel:
+    def __init__(self):
+        self.seen = None
+
+    def transcribe(self, audio, language=None, **kwargs):
+        self.seen = audio
+        seg = type("S", (), {"start": 0.5, "end": 1.5, "text": " hello "})
+        return iter([seg]), None
+
+
+def _tone_with_gaps(sr=16000):
+    t = np.arange(sr) / sr
+    tone = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    silence = np.zeros(3 * sr, dtype=np.float32)
+    return np.concatenate([silence, tone, silence, tone, silence])  # speech at 3-4 s and 7-8 s
+
+
+def test_detect_speech_finds_tone_regions():
+    regions = detect_speech(_tone_with_gaps(), 16000, pad_s=0.0)
+    assert len(regions) == 2
+    (a1, b1), (a2, b2) = regions
+    assert abs(a1 / 16000 - 3.0) < 0.05 and abs(b1 / 16000 - 4.0) < 0.05
+    assert abs(a2 / 16000 - 7.0) < 0.05 and abs(b2 / 16000 - 8.0) < 0.05
+
+
+def test_energy_vad_skips_silence_and_maps_timestamps(monkeypatch):
+    monkeypatch.setattr(asr.settings, "asr_vad", "energy")
+    model = _FakeModel()
+    audio = _tone_with_gaps()
+    stats = {}
+    segments = list(asr._decode(model, audio, "en", stats))
+    # Only ~2 s of speech (+ padding) reaches the model instead of 11 s
+    assert len(model.seen) < 3 * 16000
+    assert stats["duration_s"] == len(audio) / 16000
+    assert stats["duration_s"] - stats["speech_s"] > 8.0
+    # 0.5 s into the compacted audio is 0.5 s after the (padded) first speech region starts
+    assert abs(segments[0].start - (3.0 - 0.2 + 0.5)) < 0.05
+    # 1.5 s into the compacted audio falls inside the second region
+    assert segments[0].end > 6.5
+    assert segments[0].text == "hello"
+
+
+def test_vad_is_opt_in(monkeypatch):
+    from app.config import Settings
+
+    monkeypatch.delenv("ASR_VAD", raising=False)
+    assert Settings(_env_file=None).asr_vad == "off"
+
+    class _Info:
+        duration = 11.0
+
+    class _Model:
+        def transcribe(self, audio, language=None, **kwargs):
+            self.kwargs = kwargs
+            return iter([]), _Info()
+
+    monkeypatch.setattr(asr.settings, "asr_vad", "off")
+    model = _Model()
+    list(asr._decode(model, _tone_with_gaps(), "en", None))
+    assert "vad_filter" not in model.kwargs